@@ -1,18 +1,36 @@
 from flask import (
     Flask, render_template, request, jsonify,
-    session, redirect, flash, send_file, abort
+    session, redirect, flash, send_file, abort,
+    Response, stream_with_context
 )
+import json
 import os
+import shutil
 import subprocess
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 from flask import Blueprint
 
-from src.pipeline.pipeline import run_pipeline_from_audio
-from auth.auth_service import register_user, validate_user, user_exists
-from services.email_service import send_summary_email
-from utils.pdf_generator import generate_summary_pdf
-from utils.text_cleaner import clean_markdown_text
+# Pipeline, models and PDF rendering are imported inside the routes /
+# jobs that use them: login and static pages never load torch, whisper,
+# pyannote, groq, sounddevice or reportlab.
+from auth.auth_service import migrate_csv_users, register_user, validate_user, user_exists
+from services.job_queue import (
+    submit_job, get_job, latest_job_for, read_output, QueueFullError
+)
+from services.upload_sessions import (
+    start_session, append_chunk, finish_session, UploadSessionError
+)
+from src.pipeline.artifacts import (
+    create_job_dir, store_content_addressed, active_job_dir, cleanup_artifacts
+)
+from src.pipeline.metrics import span, render_prometheus
+from services.meeting_store import (
+    save_meeting, list_meetings, get_meeting, iter_segments, search_meetings
+)
+from services.email_service import send_summary_email, get_delivery
+from utils.markdown_doc import parse_summary, ensure_title, to_email_text, to_json
 
 # -------------------------------------------------
 # ENV + APP SETUP
@@ -23,17 +41,6 @@ app = Flask(__name__)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-secret-key")
 
 BASE_DIR = Path(__file__).resolve().parent
-AUDIO_DIR = BASE_DIR / "data" / "audio"
-WEBM_PATH = AUDIO_DIR / "meeting.webm"
-WAV_PATH  = AUDIO_DIR / "meeting.wav"
-
-# -------------------------------------------------
-# GLOBAL PROCESS STATUS (MVP SAFE)
-# -------------------------------------------------
-PROCESS_STATUS = {
-    "state": "idle",        # idle | processing | completed
-    "message": "Idle"
-}
 
 # -------------------------------------------------
 # UTILS
@@ -48,6 +55,103 @@ def normalize_speakers(text: str) -> str:
         text = text.replace(k, v)
     return text
 
+
+def process_upload(on_stage, on_output, webm_path: Path, job_dir: Path, owner: str) -> dict:
+    """
+    Background job: webm -> wav -> pipeline.
+    Runs on the job queue worker pool, never inside a request.
+    All artifacts stay inside the job's own directory.
+    """
+    with active_job_dir(job_dir):
+        return _process_upload(on_stage, on_output, webm_path, job_dir, owner)
+
+
+def _process_upload(on_stage, on_output, webm_path: Path, job_dir: Path, owner: str) -> dict:
+    on_stage("converting", "Converting audio")
+
+    # Same content hash as the upload it was decoded from
+    wav_path = job_dir / f"{webm_path.stem}.wav"
+
+    # Convert to WAV
+    timings = {}
+    with span("conversion", timings):
+        subprocess.run(
+            [
+                "ffmpeg", "-y",
+                "-i", str(webm_path),
+                "-vn",
+                "-ac", "1",
+                "-ar", "16000",
+                str(wav_path)
+            ],
+            capture_output=True
+        )
+
+    if not wav_path.exists():
+        raise RuntimeError("WAV conversion failed")
+
+    return _run_pipeline_job(on_stage, on_output, wav_path, job_dir, owner, timings)
+
+
+def process_decoded_upload(on_stage, on_output, wav_path: Path, job_dir: Path, owner: str) -> dict:
+    """
+    Background job for chunked uploads: audio is already decoded to WAV.
+    """
+    with active_job_dir(job_dir):
+        return _run_pipeline_job(on_stage, on_output, wav_path, job_dir, owner)
+
+
+def _run_pipeline_job(on_stage, on_output, wav_path: Path, job_dir: Path, owner: str, timings=None) -> dict:
+    from src.pipeline.pipeline import run_pipeline_from_audio
+
+    # Run pipeline
+    timings = {} if timings is None else timings
+    segments = []
+    transcript, summary = run_pipeline_from_audio(
+        str(wav_path),
+        timings=timings,
+        on_stage=on_stage,
+        output_dir=str(job_dir),
+        # summary tokens go to the job output -> /jobs/<id>/summary/stream
+        on_summary_delta=on_output,
+        segments=segments
+    )
+
+    transcript = normalize_speakers(transcript)
+    for seg in segments:
+        seg["speaker"] = normalize_speakers(seg["speaker"])
+
+    summary = ensure_title(summary.strip())
+    # parsed once; email, PDF and the API render from this
+    summary_doc = to_json(parse_summary(summary))
+
+    # Meeting history outlives the job and its artifact directory
+    meeting_id = save_meeting(
+        owner, transcript, summary, segments,
+        duration=timings.get("audio_duration"),
+        summary_doc=summary_doc
+    )
+
+    return {
+        "meeting_id": meeting_id,
+        "transcript": transcript,
+        "summary": summary,
+        "summary_doc": summary_doc,
+        "timings": timings
+    }
+
+
+def _job_view(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "state": job["state"],
+        "stage": job["stage"],
+        "message": job["message"],
+        "stages": job["stages"],
+        "timings": job["result"]["timings"] if job["result"] else None,
+        "error": job["error"]
+    }
+
 # -------------------------------------------------
 # MAIN ROUTES
 # -------------------------------------------------
@@ -60,7 +164,11 @@ def index():
 
 @app.route("/status", methods=["GET"])
 def status():
-    return jsonify(PROCESS_STATUS)
+    # Latest job of the current user (kept for older clients)
+    job = latest_job_for(session.get("user"))
+    if job is None:
+        return jsonify({"state": "idle", "message": "Idle"})
+    return jsonify(_job_view(job))
 
 
 @app.route("/upload", methods=["POST"])
@@ -68,54 +176,223 @@ def upload_audio():
     if "user" not in session:
         return jsonify({"error": "Unauthorized"}), 401
 
-    os.makedirs(AUDIO_DIR, exist_ok=True)
-
-    PROCESS_STATUS["state"] = "processing"
-    PROCESS_STATUS["message"] = "Processing audio… please wait"
-
     audio = request.files.get("audio")
     if not audio:
         return jsonify({"error": "No audio file"}), 400
 
-    audio.save(WEBM_PATH)
+    cleanup_artifacts()
 
-    # Convert to WAV
-    subprocess.run(
-        [
-            "ffmpeg", "-y",
-            "-i", str(WEBM_PATH),
-            "-vn",
-            "-ac", "1",
-            "-ar", "16000",
-            str(WAV_PATH)
-        ],
-        capture_output=True
-    )
+    job_dir = create_job_dir()
+    upload_path = job_dir / "upload.part"
+    audio.save(upload_path)
+    webm_path = store_content_addressed(upload_path, ".webm")
 
-    if not WAV_PATH.exists():
-        PROCESS_STATUS["state"] = "idle"
-        PROCESS_STATUS["message"] = "Audio conversion failed"
-        return jsonify({"error": "WAV conversion failed"}), 500
+    try:
+        job_id = submit_job(
+            session["user"], process_upload, webm_path, job_dir, session["user"]
+        )
+    except QueueFullError as exc:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return jsonify({"error": str(exc)}), 503
 
-    # Run pipeline
-    transcript, summary = run_pipeline_from_audio(str(WAV_PATH))
+    return jsonify({"job_id": job_id}), 202
 
-    transcript = normalize_speakers(transcript)
 
-    summary = summary.strip()
-    if not summary.startswith("##"):
-        summary = f"## **Meeting Summary**\n\n{summary}"
+# -------------------------------------------------
+# CHUNKED UPLOAD (streaming decode while recording)
+# -------------------------------------------------
+@app.route("/upload/stream", methods=["POST"])
+def upload_stream_start():
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    cleanup_artifacts()
+
+    upload_id = start_session(session["user"], create_job_dir())
+    return jsonify({"upload_id": upload_id}), 201
+
+
+@app.route("/upload/stream/<upload_id>/chunk", methods=["POST"])
+def upload_stream_chunk(upload_id):
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    seq = request.args.get("seq", type=int)
+    chunk = request.get_data()
+    if seq is None or not chunk:
+        return jsonify({"error": "Missing chunk"}), 400
+
+    try:
+        decoded = append_chunk(upload_id, session["user"], seq, chunk)
+    except KeyError:
+        abort(404, "Upload not found")
+    except UploadSessionError as exc:
+        return jsonify({"error": str(exc)}), 409
+    except RuntimeError as exc:
+        return jsonify({"error": str(exc)}), 500
+
+    return jsonify({"received": seq, "decoded_seconds": round(decoded, 2)})
+
+
+@app.route("/upload/stream/<upload_id>/finish", methods=["POST"])
+def upload_stream_finish(upload_id):
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        wav_path, job_dir = finish_session(upload_id, session["user"])
+    except KeyError:
+        abort(404, "Upload not found")
+    except UploadSessionError as exc:
+        return jsonify({"error": str(exc)}), 409
+    except RuntimeError as exc:
+        return jsonify({"error": str(exc)}), 500
+
+    wav_path = store_content_addressed(wav_path, ".wav")
+
+    try:
+        job_id = submit_job(
+            session["user"], process_decoded_upload, wav_path, job_dir, session["user"]
+        )
+    except QueueFullError as exc:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return jsonify({"error": str(exc)}), 503
+
+    return jsonify({"job_id": job_id}), 202
+
+
+def _get_user_job(job_id: str):
+    job = get_job(job_id)
+    if job is None or job["owner"] != session.get("user"):
+        abort(404, "Job not found")
+    return job
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return jsonify(_job_view(_get_user_job(job_id)))
+
+
+@app.route("/jobs/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    job = _get_user_job(job_id)
+
+    if job["state"] == "failed":
+        return jsonify({"error": job["error"]}), 500
+    if job["state"] != "completed":
+        return jsonify({"error": "Job not finished", "state": job["state"]}), 409
+
+    result = job["result"]
 
     # 🔑 STORE FOR PDF + EMAIL
-    session["meeting_summary"] = summary
+    session["meeting_summary"] = result["summary"]
+    session["meeting_id"] = result["meeting_id"]
 
-    PROCESS_STATUS["state"] = "completed"
-    PROCESS_STATUS["message"] = "Processing completed"
+    return jsonify(result)
 
-    return jsonify({
-        "transcript": transcript,
-        "summary": summary
-    })
+
+def _sse(data, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@app.route("/jobs/<job_id>/summary/stream", methods=["GET"])
+def job_summary_stream(job_id):
+    """
+    Server-Sent Events: summary deltas while the LLM writes them,
+    then a "done" event with the final summary.
+    """
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    _get_user_job(job_id)
+
+    def events():
+        since = 0
+        last_sent = time.time()
+        while True:
+            snapshot = read_output(job_id, since)
+            if snapshot is None:
+                yield _sse({"error": "Job expired"}, "error")
+                return
+
+            pieces, since, state = snapshot
+            if pieces:
+                yield _sse({"delta": "".join(pieces)})
+                last_sent = time.time()
+
+            if state == "completed":
+                yield _sse({"summary": get_job(job_id)["result"]["summary"]}, "done")
+                return
+            if state == "failed":
+                yield _sse({"error": get_job(job_id)["error"]}, "error")
+                return
+
+            if time.time() - last_sent > 15:
+                yield ": keep-alive\n\n"
+                last_sent = time.time()
+            time.sleep(0.1)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# -------------------------------------------------
+# MEETING HISTORY
+# -------------------------------------------------
+def _page_args():
+    return (
+        request.args.get("page", 1, type=int),
+        request.args.get("per_page", 20, type=int)
+    )
+
+
+@app.route("/meetings", methods=["GET"])
+def meetings():
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    page, per_page = _page_args()
+    return jsonify(list_meetings(session["user"], page, per_page))
+
+
+@app.route("/meetings/search", methods=["GET"])
+def meetings_search():
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Missing query"}), 400
+
+    page, per_page = _page_args()
+    return jsonify(search_meetings(session["user"], query, page, per_page))
+
+
+@app.route("/meetings/<int:meeting_id>", methods=["GET"])
+def meeting_detail(meeting_id):
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    meeting = get_meeting(session["user"], meeting_id)
+    if meeting is None:
+        abort(404, "Meeting not found")
+    if meeting["summary_doc"] is None:
+        meeting["summary_doc"] = to_json(parse_summary(meeting["summary"]))
+
+    # PDF + email act on the meeting being viewed
+    session["meeting_summary"] = meeting["summary"]
+    session["meeting_id"] = meeting_id
+
+    return jsonify(meeting)
 
 # -------------------------------------------------
 # AUTH ROUTES
@@ -129,10 +406,9 @@ def signup():
         email = request.form["email"]
         password = request.form["password"]
 
-        if user_exists(email):
+        if user_exists(email) or not register_user(email, password):
             return render_template("signup.html", error="User already exists")
 
-        register_user(email, password)
         flash("Signup successful! Please login.", "success")
         return redirect("/login")
 
@@ -150,8 +426,6 @@ def login():
 
         if validate_user(email, password):
             session["user"] = email
-            PROCESS_STATUS["state"] = "idle"
-            PROCESS_STATUS["message"] = "Idle"
             return redirect("/")
 
         return render_template("login.html", error="Invalid credentials")
@@ -162,8 +436,6 @@ def login():
 @app.route("/logout")
 def logout():
     session.clear()
-    PROCESS_STATUS["state"] = "idle"
-    PROCESS_STATUS["message"] = "Idle"
     return redirect("/login")
 
 # -------------------------------------------------
@@ -175,17 +447,38 @@ def send_email():
         return jsonify({"error": "Unauthorized"}), 401
 
     data = request.json or {}
-    receiver = data.get("email")
+    receivers = data.get("email") or []
+    if isinstance(receivers, str):
+        # "a@x.com, b@x.com" sends to the whole team
+        receivers = [r.strip() for r in receivers.split(",")]
+    receivers = [r for r in receivers if r]
 
     raw_summary = session.get("meeting_summary")
-    if not receiver or not raw_summary:
+    if not receivers or not raw_summary:
         return jsonify({"error": "Invalid data"}), 400
 
     # ✅ CLEAN FOR EMAIL
-    clean_summary = clean_markdown_text(raw_summary)
+    clean_summary = to_email_text(parse_summary(raw_summary))
+
+    # Delivered (and retried) in the background
+    delivery_id = send_summary_email(receivers, clean_summary, owner=session["user"])
+    return jsonify({"status": "queued", "delivery_id": delivery_id}), 202
+
+
+@app.route("/send-email/<delivery_id>", methods=["GET"])
+def email_status(delivery_id):
+    if "user" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
 
-    send_summary_email(receiver, clean_summary)
-    return jsonify({"status": "sent"})
+    delivery = get_delivery(delivery_id)
+    if delivery is None or delivery["owner"] != session["user"]:
+        abort(404, "Delivery not found")
+
+    return jsonify({
+        "delivery_id": delivery_id,
+        "state": delivery["state"],
+        "error": delivery["error"]
+    })
 
 
 # -------------------------------------------------
@@ -200,18 +493,68 @@ def download_summary():
     if not summary:
         abort(400, "Summary not available")
 
-    pdf_buffer = generate_summary_pdf(summary)
+    from utils.pdf_generator import generate_summary_pdf, generate_report_pdf
+
+    # report=full adds the speaker transcript, streamed page by page
+    meeting_id = session.get("meeting_id")
+    full_report = request.form.get("report") == "full" and meeting_id is not None
+
+    with span("pdf"):
+        if full_report:
+            pdf_buffer = generate_report_pdf(
+                summary,
+                iter_segments(session["user"], meeting_id),
+                report_id=f"meeting-{meeting_id}"
+            )
+        else:
+            pdf_buffer = generate_summary_pdf(summary)
 
     return send_file(
         pdf_buffer,
         as_attachment=True,
-        download_name="meeting_summary.pdf",
+        download_name="meeting_report.pdf" if full_report else "meeting_summary.pdf",
         mimetype="application/pdf"
     )
 
 # 🔑 REGISTER BLUEPRINT
 app.register_blueprint(download_bp)
 
+
+# -------------------------------------------------
+# METRICS
+# -------------------------------------------------
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    # Prometheus scrape target: stage latencies, audio duration, RTF,
+    # model load times, queue depth
+    return Response(
+        render_prometheus(),
+        mimetype="text/plain; version=0.0.4"
+    )
+
+
+# -------------------------------------------------
+# STARTUP
+# -------------------------------------------------
+def warm_up_models():
+    """
+    Loads (or connects to) the models before the first request.
+    Call from gunicorn's post_worker_init hook, e.g.
+        def post_worker_init(worker): __import__("appF").warm_up_models()
+    """
+    from src.pipeline.model_server import warm_up
+
+    warm_up()
+
+
+if os.getenv("PRELOAD_MODELS", "0") == "1":
+    warm_up_models()
+
+# One-time legacy CSV import; a no-op once recorded in the user database,
+# and safe when several workers start together
+if os.getenv("MIGRATE_USERS_ON_START", "1") == "1":
+    migrate_csv_users()
+
 # -------------------------------------------------
 # MAIN
 # -------------------------------------------------
@@ -1,28 +1,223 @@
+import argparse
 import csv
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
+# =========================
+# CONFIG
+# =========================
+
+USER_DB = Path(os.getenv("USER_DB_PATH", "data/db/users.sqlite3"))
+
+# Legacy plaintext store, imported (hashed) into USER_DB once by
+# migrate_csv_users() (app startup or python -m auth.auth_service)
 USER_FILE = Path("data/db/users.csv")
-USER_FILE.parent.mkdir(exist_ok=True)
 
-def user_exists(email):
-    if not USER_FILE.exists():
+_CSV_MIGRATION = "users_csv"
+
+# PBKDF2-SHA256 work factor; stored per hash, so raising it only
+# affects new signups and re-hashes old users on their next login
+PASSWORD_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "600000"))
+
+_HASH_SCHEME = "pbkdf2_sha256"
+
+# email -> stored hash (only users that exist; signups come from any process)
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+# One connection per thread; schema once per database
+_LOCAL = threading.local()
+_INIT_LOCK = threading.Lock()
+_READY = set()
+
+
+def _hash_password(password: str) -> str:
+    iterations = PASSWORD_ITERATIONS
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{_HASH_SCHEME}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def _check_password(password: str, stored: str) -> bool:
+    try:
+        scheme, iterations, salt, expected = stored.split("$")
+    except ValueError:
+        return False
+    if scheme != _HASH_SCHEME:
         return False
-    with open(USER_FILE, newline="") as f:
-        return any(row["email"] == email for row in csv.DictReader(f))
+
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), bytes.fromhex(salt), int(iterations)
+    )
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def _needs_rehash(stored: str) -> bool:
+    return stored.split("$")[1] != str(PASSWORD_ITERATIONS)
+
+
+def _connection() -> sqlite3.Connection:
+    connections = getattr(_LOCAL, "connections", None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+
+    conn = connections.get(USER_DB)
+    if conn is None:
+        USER_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(USER_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[USER_DB] = conn
+
+    with _INIT_LOCK:
+        if USER_DB not in _READY:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " email TEXT PRIMARY KEY,"
+                " password_hash TEXT NOT NULL,"
+                " created_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS migrations ("
+                " name TEXT PRIMARY KEY,"
+                " applied_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            _READY.add(USER_DB)
+
+    return conn
+
+
+def _stored_hash(email: str) -> str | None:
+    with _CACHE_LOCK:
+        if email in _CACHE:
+            return _CACHE[email]
+
+    row = _connection().execute(
+        "SELECT password_hash FROM users WHERE email = ?", (email,)
+    ).fetchone()
+    if row is None:
+        return None
+
+    with _CACHE_LOCK:
+        _CACHE[email] = row[0]
+    return row[0]
+
+
+def user_exists(email):
+    return _stored_hash(email) is not None
+
 
 def register_user(email, password):
-    file_exists = USER_FILE.exists()
-    with open(USER_FILE, "a", newline="") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["email", "password"])
-        writer.writerow([email, password])
+    """
+    Returns:
+        False if the email is already registered
+    """
+    stored = _hash_password(password)
+    try:
+        with _connection() as conn:
+            conn.execute(
+                "INSERT INTO users (email, password_hash, created_at) VALUES (?, ?, ?)",
+                (email, stored, time.time())
+            )
+    except sqlite3.IntegrityError:
+        return False
+
+    with _CACHE_LOCK:
+        _CACHE[email] = stored
+    return True
+
 
 def validate_user(email, password):
-    if not USER_FILE.exists():
+    stored = _stored_hash(email)
+    if stored is None or not _check_password(password, stored):
         return False
-    with open(USER_FILE, newline="") as f:
-        return any(
-            row["email"] == email and row["password"] == password
-            for row in csv.DictReader(f)
+
+    if _needs_rehash(stored):
+        stored = _hash_password(password)
+        with _connection() as conn:
+            conn.execute(
+                "UPDATE users SET password_hash = ? WHERE email = ?", (stored, email)
+            )
+        with _CACHE_LOCK:
+            _CACHE[email] = stored
+
+    return True
+
+
+# =========================
+# LEGACY CSV IMPORT
+# =========================
+
+def _migrated(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM migrations WHERE name = ?", (_CSV_MIGRATION,)
+    ).fetchone() is not None
+
+
+def migrate_csv_users(csv_path: Path | None = None) -> int:
+    """
+    One-time import of the legacy plaintext CSV into USER_DB, hashed.
+
+    Safe to run from every worker at startup: the import is recorded in
+    the migrations table inside the same transaction, so it happens
+    once per database. The CSV itself is left alone (delete it once
+    migrated; see --remove).
+
+    Returns:
+        number of users imported (0 if already migrated or no CSV)
+    """
+    csv_path = Path(csv_path or USER_FILE)
+    conn = _connection()
+    if _migrated(conn):
+        return 0
+
+    try:
+        with open(csv_path, newline="") as f:
+            rows = [(row["email"], row["password"]) for row in csv.DictReader(f) if row.get("email")]
+    except FileNotFoundError:
+        return 0
+
+    # hash before taking the write lock; it is the slow part
+    hashed = [(email, _hash_password(password), time.time()) for email, password in rows]
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if _migrated(conn):
+            conn.rollback()
+            return 0
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (email, password_hash, created_at) VALUES (?, ?, ?)",
+            hashed
+        )
+        conn.execute(
+            "INSERT INTO migrations (name, applied_at) VALUES (?, ?)",
+            (_CSV_MIGRATION, time.time())
         )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    print(f"Migrated {len(rows)} users from {csv_path} to {USER_DB}")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the legacy users CSV into the user database")
+    parser.add_argument("--csv", type=Path, default=USER_FILE)
+    parser.add_argument("--remove", action="store_true", help="delete the CSV once migrated")
+    args = parser.parse_args()
+
+    migrate_csv_users(args.csv)
+    if args.remove:
+        with _connection() as conn:
+            if _migrated(conn):
+                args.csv.unlink(missing_ok=True)
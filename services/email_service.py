@@ -1,20 +1,293 @@
+import heapq
+import itertools
+import os
+import queue
 import smtplib
+import threading
+import time
+import uuid
 from email.message import EmailMessage
-import os
 
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
+from src.pipeline.metrics import span
+
+# =========================
+# CONFIG
+# =========================
+
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+# "0" for local stand-ins (e.g. python -m aiosmtpd -n -l 127.0.0.1:8025)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 SENDER_PASSWORD = os.getenv("SENDER_PASSWORD")
 
-def send_summary_email(receiver_email, summary_text):
+# Recipients per SMTP transaction
+BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "50"))
+MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+# Idle pooled connections are closed after this
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "60"))
+DELIVERY_RETENTION_SECONDS = 3600
+
+# Delivery status by id (guarded by _LOCK)
+_DELIVERIES = {}
+_LOCK = threading.Lock()
+
+_QUEUE = queue.Queue()
+_WORKER = None
+_SEQ = itertools.count()
+
+
+def _build_message(recipients: list[str], summary_text: str) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = "Meeting Summary"
     msg["From"] = SENDER_EMAIL
-    msg["To"] = receiver_email
+    # Several recipients go in the envelope only, so none sees the others
+    msg["To"] = recipients[0] if len(recipients) == 1 else "undisclosed-recipients:;"
     msg.set_content(summary_text)
+    return msg
+
+
+def _set_state(delivery_id: str, state: str, error: str | None = None):
+    with _LOCK:
+        delivery = _DELIVERIES.get(delivery_id)
+        if delivery is not None:
+            delivery.update(state=state, error=error, updated_at=time.time())
+
+
+def _finish_batch(batch: dict, error: str | None = None, refused=()):
+    """
+    Records one finished batch; the delivery is final once all its
+    batches are.
+    """
+    with _LOCK:
+        delivery = _DELIVERIES.get(batch["id"])
+        if delivery is None:
+            return
+
+        delivery["pending_batches"] -= 1
+        if error is not None:
+            delivery["failed"].extend(batch["recipients"])
+            delivery["errors"].append(error)
+        delivery["failed"].extend(refused)
+
+        if delivery["pending_batches"] > 0:
+            delivery["updated_at"] = time.time()
+            return
+
+        failed = delivery["failed"]
+        if not failed:
+            state, message = "sent", None
+        elif len(failed) == len(delivery["recipients"]):
+            state, message = "failed", "; ".join(delivery["errors"]) or f"Refused: {', '.join(failed)}"
+        else:
+            state, message = "partial", f"Not delivered to: {', '.join(failed)}"
+        delivery.update(state=state, error=message, updated_at=time.time())
+
+
+def _prune_deliveries():
+    cutoff = time.time() - DELIVERY_RETENTION_SECONDS
+    for delivery_id in [
+        delivery_id for delivery_id, delivery in _DELIVERIES.items()
+        if delivery["state"] in ("sent", "partial", "failed") and delivery["updated_at"] < cutoff
+    ]:
+        del _DELIVERIES[delivery_id]
+
+
+# =========================
+# SMTP CONNECTION
+# =========================
+
+class _Connection:
+    """
+    One reused SMTP session (owned by the delivery thread).
+    """
+
+    def __init__(self):
+        self.smtp = None
+        self.last_used = 0.0
+
+    def _open(self):
+        smtp = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30)
+        if SMTP_STARTTLS:
+            smtp.starttls()
+        if SENDER_PASSWORD:
+            smtp.login(SENDER_EMAIL, SENDER_PASSWORD)
+        self.smtp = smtp
+
+    def close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.smtp = None
+
+    def close_if_idle(self):
+        if self.smtp is not None and time.time() - self.last_used > SMTP_IDLE_SECONDS:
+            self.close()
+
+    def send(self, msg: EmailMessage, recipients: list[str]) -> dict:
+        """
+        Returns:
+            {recipient: (code, reason)} for recipients the server refused
+        """
+        if self.smtp is None:
+            self._open()
+        try:
+            refused = self.smtp.send_message(msg, to_addrs=recipients)
+        except smtplib.SMTPServerDisconnected:
+            # server dropped the idle session; one fresh attempt
+            self.smtp = None
+            self._open()
+            refused = self.smtp.send_message(msg, to_addrs=recipients)
+        self.last_used = time.time()
+        return refused
+
+
+# =========================
+# DELIVERY THREAD
+# =========================
+
+def _batches(item: dict) -> list[dict]:
+    """
+    One delivery -> one message per BATCH_SIZE recipients. Deliveries
+    are never merged with each other, even when their text matches.
+    """
+    recipients = list(dict.fromkeys(item["recipients"]))
+    return [
+        {
+            "id": item["id"],
+            "recipients": recipients[i:i + BATCH_SIZE],
+            "text": item["text"],
+            "attempts": 0
+        }
+        for i in range(0, len(recipients), BATCH_SIZE)
+    ]
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if not isinstance(exc, (smtplib.SMTPException, OSError)):
+        return True     # e.g. a malformed address; retrying won't help
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def _deliver(connection: _Connection, batch: dict, retries: list):
+    try:
+        with span("email"):
+            refused = connection.send(
+                _build_message(batch["recipients"], batch["text"]), batch["recipients"]
+            )
+    except Exception as exc:
+        connection.close()
+        batch["attempts"] += 1
+        error = f"{type(exc).__name__}: {exc}"
+
+        if _is_permanent(exc) or batch["attempts"] >= MAX_ATTEMPTS:
+            print(f"Email to {batch['recipients']} failed: {error}")
+            _finish_batch(batch, error=error)
+            return
+
+        delay = RETRY_BASE_SECONDS * 2 ** (batch["attempts"] - 1)
+        heapq.heappush(retries, (time.time() + delay, next(_SEQ), batch))
+        _set_state(batch["id"], "retrying", error)
+        return
+
+    _finish_batch(batch, refused=list(refused or ()))
+
+
+def _run_worker():
+    connection = _Connection()
+    retries = []        # heap of (due time, seq, batch)
+
+    while True:
+        timeout = SMTP_IDLE_SECONDS
+        if retries:
+            timeout = max(0.0, retries[0][0] - time.time())
+
+        items = []
+        try:
+            items.append(_QUEUE.get(timeout=timeout))
+            while True:
+                items.append(_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+
+        batches = []
+        for item in items:
+            item_batches = _batches(item)
+            with _LOCK:
+                delivery = _DELIVERIES.get(item["id"])
+                if delivery is not None:
+                    delivery["pending_batches"] = len(item_batches)
+            batches.extend(item_batches)
+        while retries and retries[0][0] <= time.time():
+            batches.append(heapq.heappop(retries)[2])
+
+        if not batches:
+            connection.close_if_idle()
+            continue
+
+        for batch in batches:
+            _deliver(connection, batch, retries)
+
+
+def _ensure_worker():
+    global _WORKER
+    with _LOCK:
+        if _WORKER is None or not _WORKER.is_alive():
+            _WORKER = threading.Thread(target=_run_worker, name="email-delivery", daemon=True)
+            _WORKER.start()
+
+
+# =========================
+# PUBLIC API
+# =========================
+
+def send_summary_email(receiver_email, summary_text, owner: str | None = None) -> str:
+    """
+    Queues the summary for delivery and returns immediately.
+
+    receiver_email: one address or a list of addresses
+
+    Returns:
+        delivery id, see get_delivery
+    """
+    recipients = [receiver_email] if isinstance(receiver_email, str) else list(receiver_email)
+    recipients = list(dict.fromkeys(recipients))
+    if not recipients:
+        raise ValueError("No recipients")
+
+    delivery_id = uuid.uuid4().hex
+    now = time.time()
+    with _LOCK:
+        _prune_deliveries()
+        _DELIVERIES[delivery_id] = {
+            "id": delivery_id,
+            "owner": owner,
+            "recipients": recipients,
+            "state": "queued",       # queued | retrying | sent | partial | failed
+            "error": None,
+            "pending_batches": 0,    # set when the worker splits it
+            "failed": [],
+            "errors": [],
+            "created_at": now,
+            "updated_at": now
+        }
+
+    _ensure_worker()
+    _QUEUE.put({"id": delivery_id, "recipients": recipients, "text": summary_text})
+    return delivery_id
+
 
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SENDER_EMAIL, SENDER_PASSWORD)
-        server.send_message(msg)
+def get_delivery(delivery_id: str) -> dict | None:
+    with _LOCK:
+        delivery = _DELIVERIES.get(delivery_id)
+        if delivery is None:
+            return None
+        return {
+            key: value for key, value in delivery.items()
+            if key not in ("pending_batches", "failed", "errors")
+        }
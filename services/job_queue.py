@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.pipeline.metrics import inc, register_gauge
+
+# =========================
+# CONFIG
+# =========================
+
+MAX_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+MAX_PENDING_JOBS = int(os.getenv("JOB_MAX_PENDING", "16"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+
+# Job registry (guarded by _LOCK)
+_JOBS = {}
+_LOCK = threading.Lock()
+
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS,
+    thread_name_prefix="job-worker"
+)
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def _prune_finished_jobs():
+    cutoff = time.time() - JOB_RETENTION_SECONDS
+    for job_id in [
+        job_id for job_id, job in _JOBS.items()
+        if job["state"] in ("completed", "failed")
+        and job["finished_at"] < cutoff
+    ]:
+        del _JOBS[job_id]
+
+
+def _pending_count() -> int:
+    return sum(
+        1 for job in _JOBS.values()
+        if job["state"] in ("queued", "processing")
+    )
+
+
+def submit_job(owner: str, fn, *args, **kwargs) -> str:
+    """
+    Enqueues fn(on_stage, on_output, *args, **kwargs) on the worker pool.
+
+    on_stage(stage, message=None) lets the job report progress.
+    on_output(text) appends to the job's streamed output.
+    The return value of fn becomes the job result.
+
+    Returns:
+        job id (str)
+    """
+    with _LOCK:
+        _prune_finished_jobs()
+
+        if _pending_count() >= MAX_PENDING_JOBS:
+            raise QueueFullError("Too many jobs in queue, try again later")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        _JOBS[job_id] = {
+            "id": job_id,
+            "owner": owner,
+            "state": "queued",          # queued | processing | completed | failed
+            "stage": "queued",
+            "message": "Waiting in queue",
+            "stages": [{"stage": "queued", "at": now}],
+            "created_at": now,
+            "finished_at": None,
+            "output": [],
+            "result": None,
+            "error": None
+        }
+
+    _EXECUTOR.submit(_run_job, job_id, fn, args, kwargs)
+    return job_id
+
+
+def update_stage(job_id: str, stage: str, message: str | None = None):
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if job is None:
+            return
+        job["stage"] = stage
+        job["message"] = message or stage.replace("_", " ").capitalize()
+        job["stages"].append({"stage": stage, "at": time.time()})
+
+
+def _run_job(job_id: str, fn, args, kwargs):
+    with _LOCK:
+        _JOBS[job_id]["state"] = "processing"
+
+    def on_stage(stage, message=None):
+        update_stage(job_id, stage, message)
+
+    def on_output(text):
+        with _LOCK:
+            _JOBS[job_id]["output"].append(text)
+
+    try:
+        result = fn(on_stage, on_output, *args, **kwargs)
+    except Exception as exc:
+        print(f"Job {job_id} failed: {exc}")
+        with _LOCK:
+            job = _JOBS[job_id]
+            job["state"] = "failed"
+            job["error"] = str(exc)
+            job["finished_at"] = time.time()
+        update_stage(job_id, "failed", "Processing failed")
+        inc("jobs_total", state="failed")
+        return
+
+    with _LOCK:
+        job = _JOBS[job_id]
+        job["state"] = "completed"
+        job["result"] = result
+        job["finished_at"] = time.time()
+    update_stage(job_id, "completed", "Processing completed")
+    inc("jobs_total", state="completed")
+
+
+def get_job(job_id: str) -> dict | None:
+    """
+    Returns a snapshot of the job (or None if unknown / expired).
+    """
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if job is None:
+            return None
+        snapshot = dict(job)
+        snapshot["stages"] = list(job["stages"])
+        snapshot["output"] = list(job["output"])
+        return snapshot
+
+
+def read_output(job_id: str, since: int = 0):
+    """
+    Streamed output pieces after index since.
+
+    Returns:
+        (pieces, next_index, state) or None if the job is unknown
+    """
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if job is None:
+            return None
+        pieces = job["output"][since:]
+        return pieces, since + len(pieces), job["state"]
+
+
+def latest_job_for(owner: str) -> dict | None:
+    with _LOCK:
+        jobs = [job for job in _JOBS.values() if job["owner"] == owner]
+        if not jobs:
+            return None
+        latest = max(jobs, key=lambda job: job["created_at"])
+    return get_job(latest["id"])
+
+
+def queue_depth() -> int:
+    with _LOCK:
+        return _pending_count()
+
+
+register_gauge("job_queue_depth", queue_depth)
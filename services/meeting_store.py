@@ -0,0 +1,230 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# =========================
+# CONFIG
+# =========================
+
+MEETING_DB = Path(os.getenv("MEETING_DB_PATH", "data/db/meetings.sqlite3"))
+
+MAX_PAGE_SIZE = 100
+
+# One connection per thread; schema created once per database
+_LOCAL = threading.local()
+_INIT_LOCK = threading.Lock()
+_READY = set()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    title TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    duration REAL,
+    summary TEXT NOT NULL,
+    summary_doc TEXT,
+    transcript TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meetings_by_owner ON meetings (owner, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    speaker TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_by_meeting ON segments (meeting_id, start);
+
+-- one row per segment plus one per summary (segment_id NULL)
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5 (
+    text,
+    meeting_id UNINDEXED,
+    segment_id UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+def _connection() -> sqlite3.Connection:
+    connections = getattr(_LOCAL, "connections", None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+
+    conn = connections.get(MEETING_DB)
+    if conn is None:
+        MEETING_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(MEETING_DB, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        connections[MEETING_DB] = conn
+
+    with _INIT_LOCK:
+        if MEETING_DB not in _READY:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(meetings)")}
+            if "summary_doc" not in columns:
+                conn.execute("ALTER TABLE meetings ADD COLUMN summary_doc TEXT")
+            _READY.add(MEETING_DB)
+
+    return conn
+
+
+def _page(page: int, per_page: int) -> tuple[int, int]:
+    per_page = min(max(per_page, 1), MAX_PAGE_SIZE)
+    return per_page, (max(page, 1) - 1) * per_page
+
+
+def _match_query(query: str) -> str:
+    # Every word must match; quoting keeps FTS syntax out of user input
+    words = query.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def save_meeting(
+    owner: str,
+    transcript: str,
+    summary: str,
+    segments: list[dict],
+    duration: float | None = None,
+    title: str | None = None,
+    summary_doc: dict | None = None
+) -> int:
+    """
+    Stores one processed meeting and indexes its segments and summary.
+
+    summary_doc: parsed summary (utils.markdown_doc), kept as JSON
+
+    Returns:
+        meeting id
+    """
+    created_at = time.time()
+    title = title or time.strftime("Meeting %Y-%m-%d %H:%M", time.localtime(created_at))
+
+    with _connection() as conn:
+        meeting_id = conn.execute(
+            "INSERT INTO meetings (owner, title, created_at, duration, summary, summary_doc, transcript)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                owner, title, created_at, duration, summary,
+                json.dumps(summary_doc) if summary_doc is not None else None,
+                transcript
+            )
+        ).lastrowid
+
+        for seg in segments:
+            segment_id = conn.execute(
+                "INSERT INTO segments (meeting_id, start, end, speaker, text) VALUES (?, ?, ?, ?, ?)",
+                (meeting_id, seg["start"], seg["end"], seg["speaker"], seg["text"])
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO search_index (text, meeting_id, segment_id) VALUES (?, ?, ?)",
+                (seg["text"], meeting_id, segment_id)
+            )
+
+        conn.execute(
+            "INSERT INTO search_index (text, meeting_id, segment_id) VALUES (?, ?, NULL)",
+            (summary, meeting_id)
+        )
+
+    return meeting_id
+
+
+def list_meetings(owner: str, page: int = 1, per_page: int = 20) -> dict:
+    """
+    Newest first, without transcripts.
+    """
+    limit, offset = _page(page, per_page)
+    conn = _connection()
+
+    rows = conn.execute(
+        "SELECT id, title, created_at, duration FROM meetings"
+        " WHERE owner = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+        (owner, limit, offset)
+    ).fetchall()
+    total = conn.execute(
+        "SELECT COUNT(*) FROM meetings WHERE owner = ?", (owner,)
+    ).fetchone()[0]
+
+    return {
+        "meetings": [dict(row) for row in rows],
+        "page": max(page, 1),
+        "per_page": limit,
+        "total": total
+    }
+
+
+def get_meeting(owner: str, meeting_id: int) -> dict | None:
+    conn = _connection()
+    row = conn.execute(
+        "SELECT * FROM meetings WHERE id = ? AND owner = ?", (meeting_id, owner)
+    ).fetchone()
+    if row is None:
+        return None
+
+    meeting = dict(row)
+    if meeting["summary_doc"] is not None:
+        meeting["summary_doc"] = json.loads(meeting["summary_doc"])
+    meeting["segments"] = [
+        dict(seg) for seg in conn.execute(
+            "SELECT start, end, speaker, text FROM segments WHERE meeting_id = ? ORDER BY start",
+            (meeting_id,)
+        )
+    ]
+    return meeting
+
+
+def iter_segments(owner: str, meeting_id: int):
+    """
+    Yields the meeting's segments in order without loading them all.
+    """
+    cursor = _connection().execute(
+        "SELECT s.start, s.end, s.speaker, s.text FROM segments s"
+        " JOIN meetings m ON m.id = s.meeting_id"
+        " WHERE s.meeting_id = ? AND m.owner = ? ORDER BY s.start",
+        (meeting_id, owner)
+    )
+    for row in cursor:
+        yield dict(row)
+
+
+def search_meetings(owner: str, query: str, page: int = 1, per_page: int = 20) -> dict:
+    """
+    Full-text search over the owner's transcripts and summaries,
+    best matches first.
+
+    Returns:
+        {"results": [{"meeting_id", "title", "created_at", "kind",
+                      "start", "end", "speaker", "snippet"}], "page", "per_page"}
+    """
+    limit, offset = _page(page, per_page)
+    match = _match_query(query)
+    if not match:
+        return {"results": [], "page": max(page, 1), "per_page": limit}
+
+    rows = _connection().execute(
+        "SELECT m.id AS meeting_id, m.title, m.created_at,"
+        " s.start, s.end, s.speaker,"
+        " snippet(search_index, 0, '[', ']', '…', 12) AS snippet"
+        " FROM search_index"
+        " JOIN meetings m ON m.id = search_index.meeting_id"
+        " LEFT JOIN segments s ON s.id = search_index.segment_id"
+        " WHERE search_index MATCH ? AND m.owner = ?"
+        " ORDER BY search_index.rank LIMIT ? OFFSET ?",
+        (match, owner, limit, offset)
+    ).fetchall()
+
+    results = []
+    for row in rows:
+        result = dict(row)
+        result["kind"] = "summary" if row["start"] is None else "segment"
+        results.append(result)
+
+    return {"results": results, "page": max(page, 1), "per_page": limit}
@@ -0,0 +1,137 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+
+# =========================
+# CONFIG
+# =========================
+
+# Abandoned recordings (tab closed mid-meeting) are dropped after this
+SESSION_IDLE_SECONDS = int(os.getenv("UPLOAD_SESSION_IDLE_SECONDS", "900"))
+
+# Upload sessions (guarded by _LOCK)
+_SESSIONS = {}
+_LOCK = threading.Lock()
+
+
+class UploadSessionError(RuntimeError):
+    pass
+
+
+def _expire_idle_sessions() -> list:
+    """
+    Closes and unregisters idle sessions (caller holds _LOCK).
+    A session whose lock is held is being fed or finished and is
+    skipped.
+
+    Returns:
+        the expired sessions; release _LOCK, then _discard() them
+    """
+    cutoff = time.time() - SESSION_IDLE_SECONDS
+    expired = []
+    for upload_id, upload in list(_SESSIONS.items()):
+        if upload["last_seen"] >= cutoff:
+            continue
+        if not upload["lock"].acquire(blocking=False):
+            continue
+        try:
+            upload["closed"] = True
+            del _SESSIONS[upload_id]
+        finally:
+            upload["lock"].release()
+        expired.append(upload)
+    return expired
+
+
+def _discard(upload: dict):
+    # closed, so no feed / finish touches the decoder any more
+    upload["decoder"].abort()
+    shutil.rmtree(upload["job_dir"], ignore_errors=True)
+
+
+def start_session(owner: str, job_dir) -> str:
+    """
+    Starts a streaming decode for one recording.
+
+    Returns:
+        upload id (str)
+    """
+    from src.audio.stream_decoder import StreamingDecoder
+
+    with _LOCK:
+        expired = _expire_idle_sessions()
+
+        upload_id = uuid.uuid4().hex
+        _SESSIONS[upload_id] = {
+            "owner": owner,
+            "job_dir": job_dir,
+            "decoder": StreamingDecoder(job_dir / "stream.wav"),
+            "next_seq": 0,
+            "lock": threading.Lock(),
+            "closed": False,
+            "last_seen": time.time()
+        }
+
+    for upload in expired:
+        _discard(upload)
+
+    return upload_id
+
+
+def _get_session(upload_id: str, owner: str) -> dict:
+    with _LOCK:
+        upload = _SESSIONS.get(upload_id)
+    if upload is None or upload["owner"] != owner:
+        raise KeyError(upload_id)
+    return upload
+
+
+def append_chunk(upload_id: str, owner: str, seq: int, chunk: bytes) -> float:
+    """
+    Feeds chunk number seq. Chunks must arrive in order.
+
+    Returns:
+        seconds of audio decoded so far
+    """
+    upload = _get_session(upload_id, owner)
+
+    with upload["lock"]:
+        # it may have expired or finished since _get_session
+        if upload["closed"]:
+            raise UploadSessionError("Upload session is closed")
+        if seq != upload["next_seq"]:
+            raise UploadSessionError(
+                f"Expected chunk {upload['next_seq']}, got {seq}"
+            )
+        upload["decoder"].feed(chunk)
+        upload["next_seq"] += 1
+        upload["last_seen"] = time.time()
+
+    return upload["decoder"].decoded_seconds
+
+
+def finish_session(upload_id: str, owner: str):
+    """
+    Ends the recording and waits for the decoder to drain.
+
+    Returns:
+        (wav_path, job_dir)
+    """
+    upload = _get_session(upload_id, owner)
+
+    with upload["lock"]:
+        if upload["closed"]:
+            raise UploadSessionError("Upload session is closed")
+        upload["closed"] = True
+        with _LOCK:
+            _SESSIONS.pop(upload_id, None)
+
+        try:
+            wav_path = upload["decoder"].finish()
+        except RuntimeError:
+            shutil.rmtree(upload["job_dir"], ignore_errors=True)
+            raise
+
+    return wav_path, upload["job_dir"]
@@ -0,0 +1,177 @@
+# audio/audio_io.py
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+# Whisper / pyannote native input rate
+TARGET_SAMPLE_RATE = 16000
+
+
+def to_mono_float32(block: np.ndarray) -> np.ndarray:
+    """
+    (frames,) or (frames, channels) -> (frames,) float32
+    """
+    block = np.asarray(block)
+    if block.ndim == 2:
+        block = block.mean(axis=1)
+    if block.dtype == np.int16:
+        return block.astype(np.float32) / 32768.0
+    return block.astype(np.float32, copy=False)
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Linear-interpolation resampler (good enough for speech models).
+    """
+    if orig_sr == target_sr or len(audio) == 0:
+        return audio
+
+    duration = len(audio) / orig_sr
+    target_len = int(round(duration * target_sr))
+    positions = np.arange(target_len, dtype=np.float64) * (orig_sr / target_sr)
+
+    return np.interp(
+        positions, np.arange(len(audio)), audio
+    ).astype(np.float32)
+
+
+# Above this length decoded audio is memory-mapped instead of held in RAM
+MMAP_MIN_SECONDS = 600
+
+_PCM16_WAV_FORMAT = 1
+
+
+def _wav_layout(path: str):
+    """
+    Parses RIFF chunks of a WAV file.
+
+    Returns:
+        (format_tag, channels, sample_rate, bits, data_offset, data_bytes)
+        or None if the file is not a plain WAV
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id = chunk[:4]
+            size = int.from_bytes(chunk[4:], "little")
+
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                fmt = (
+                    int.from_bytes(body[0:2], "little"),
+                    int.from_bytes(body[2:4], "little"),
+                    int.from_bytes(body[4:8], "little"),
+                    int.from_bytes(body[14:16], "little"),
+                )
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                data_offset = f.tell()
+                # streaming writers may leave the size unset
+                available = os.path.getsize(path) - data_offset
+                data_bytes = min(size, available) if size else available
+                return (*fmt, data_offset, data_bytes)
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+
+
+def audio_duration(path: str) -> float | None:
+    """
+    Duration in seconds read from the WAV header (None for other formats).
+    """
+    layout = _wav_layout(str(path))
+    if not layout:
+        return None
+    _, channels, sample_rate, bits, _, data_bytes = layout
+    frame_bytes = channels * bits // 8
+    if not frame_bytes or not sample_rate:
+        return None
+    return data_bytes / frame_bytes / sample_rate
+
+
+def _decode_with_ffmpeg(path: str, out):
+    """
+    Decodes to raw 16 kHz mono float32 written to the open file out.
+    """
+    completed = subprocess.run(
+        [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-i", str(path),
+            "-vn",
+            "-ac", "1",
+            "-ar", str(TARGET_SAMPLE_RATE),
+            "-f", "f32le",
+            "pipe:1"
+        ],
+        stdout=out,
+        stderr=subprocess.PIPE
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Audio decoding failed: {completed.stderr.decode(errors='replace')}"
+        )
+
+
+def load_audio(
+    path: str,
+    mmap_min_seconds: float = MMAP_MIN_SECONDS,
+    tmp_dir: str | None = None
+) -> np.ndarray:
+    """
+    Decodes audio once into a 16 kHz mono float32 buffer.
+
+    16 kHz mono PCM16 WAVs (what the upload path produces) are read
+    directly without spawning ffmpeg; anything else goes through ffmpeg.
+    Long recordings are converted into an anonymous temporary file
+    (in tmp_dir, default the system temp dir) and memory-mapped
+    copy-on-write, so the buffer is paged in on demand instead of held
+    in RAM. The file has no name on disk and disappears with the array;
+    nothing is written next to the input.
+
+    Returns:
+        np.ndarray (float32, 16 kHz, mono)
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    mmap_min_samples = int(mmap_min_seconds * TARGET_SAMPLE_RATE)
+    layout = _wav_layout(str(path))
+
+    if layout and layout[:4] == (_PCM16_WAV_FORMAT, 1, TARGET_SAMPLE_RATE, 16):
+        data_offset, data_bytes = layout[4:]
+        if data_bytes < 2:
+            return np.zeros(0, dtype=np.float32)
+        pcm = np.memmap(path, dtype="<i2", mode="r", offset=data_offset, shape=(data_bytes // 2,))
+
+        if len(pcm) < mmap_min_samples:
+            return pcm.astype(np.float32) / 32768.0
+
+        with tempfile.TemporaryFile(dir=tmp_dir) as raw:
+            block = TARGET_SAMPLE_RATE * 60
+            for i in range(0, len(pcm), block):
+                raw.write((pcm[i:i + block].astype(np.float32) / 32768.0).tobytes())
+            raw.flush()
+            # the mapping keeps the (already unlinked) file alive
+            return np.memmap(raw, dtype=np.float32, mode="c")
+
+    with tempfile.TemporaryFile(dir=tmp_dir) as raw:
+        _decode_with_ffmpeg(str(path), raw)
+        size = raw.seek(0, os.SEEK_END)
+
+        if size // 4 < mmap_min_samples:
+            raw.seek(0)
+            return np.frombuffer(raw.read(size - size % 4), dtype=np.float32).copy()
+        return np.memmap(raw, dtype=np.float32, mode="c", shape=(size // 4,))
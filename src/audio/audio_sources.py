@@ -0,0 +1,347 @@
+# audio/audio_sources.py
+
+"""
+Where record_audio gets its audio from.
+
+    source = get_source()               # CAPTURE_SOURCE or platform default
+    sample_rate = source.prepare()
+    with source.stream(callback, blocksize, on_end):
+        ...
+
+callback has the sounddevice signature callback(indata, frames,
+time_info, status) with indata shaped (frames, 1) float32, so every
+source feeds CaptureSession.callback directly. on_end() is called when a
+finite source (a replayed file, a dead parec) runs out.
+
+Sources:
+    wasapi          Windows WASAPI loopback (sounddevice)
+    pulse[:sink]    PulseAudio / PipeWire monitor of a sink (parec)
+    alsa[:device]   ALSA capture device, e.g. snd-aloop "Loopback" (sounddevice)
+    file:<path>     replays a recording at CAPTURE_REPLAY_SPEED x real time
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+
+# wasapi | pulse[:sink] | alsa[:device] | file:<path>; empty = by platform
+CAPTURE_SOURCE = os.getenv("CAPTURE_SOURCE", "")
+CAPTURE_REPLAY_SPEED = float(os.getenv("CAPTURE_REPLAY_SPEED", "1.0"))
+PULSE_SAMPLE_RATE = 48000
+
+
+class AudioSource:
+    """
+    Base class. prepare() resolves the device and returns its sample
+    rate; stream() delivers mono float32 blocks until the context exits.
+    """
+
+    name = "source"
+
+    def prepare(self) -> int:
+        raise NotImplementedError
+
+    def stream(self, callback, blocksize: int, on_end=None):
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return self.name
+
+
+# =========================
+# SOUNDDEVICE BACKENDS
+# =========================
+
+def _hostapi_index(sd, name: str) -> int:
+    for i, api in enumerate(sd.query_hostapis()):
+        if name in api["name"]:
+            return i
+    raise RuntimeError(f"Host API not available: {name}")
+
+
+def get_wasapi_loopback_device():
+    import sounddevice as sd
+
+    devices = sd.query_devices()
+    wasapi_index = _hostapi_index(sd, "Windows WASAPI")
+
+    for i, dev in enumerate(devices):
+        if dev["hostapi"] == wasapi_index and dev["max_input_channels"] > 0:
+            return i
+
+    raise RuntimeError("No WASAPI loopback device found")
+
+
+class _SoundDeviceSource(AudioSource):
+
+    def __init__(self):
+        self.device = None
+        self.device_name = None
+        self.sample_rate = None
+
+    def _find_device(self, sd) -> int:
+        raise NotImplementedError
+
+    def _extra_settings(self, sd):
+        return None
+
+    def prepare(self) -> int:
+        import sounddevice as sd
+
+        self.device = self._find_device(sd)
+        info = sd.query_devices(self.device)
+        self.device_name = info["name"]
+        self.sample_rate = int(info["default_samplerate"])
+        return self.sample_rate
+
+    @contextmanager
+    def stream(self, callback, blocksize: int, on_end=None):
+        import sounddevice as sd
+
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            device=self.device,
+            channels=1,
+            dtype="float32",
+            callback=callback,
+            blocksize=blocksize,
+            extra_settings=self._extra_settings(sd)
+        ):
+            yield
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.device_name})"
+
+
+class WasapiLoopbackSource(_SoundDeviceSource):
+    name = "wasapi"
+
+    def _find_device(self, sd) -> int:
+        return get_wasapi_loopback_device()
+
+    def _extra_settings(self, sd):
+        return sd.WasapiSettings(exclusive=False)
+
+
+class AlsaSource(_SoundDeviceSource):
+    """
+    device: substring of an ALSA device name (e.g. "Loopback", "hw:2,1");
+            None = the ALSA default input
+    """
+
+    name = "alsa"
+
+    def __init__(self, device: str | None = None):
+        super().__init__()
+        self.query = device
+
+    def _find_device(self, sd) -> int:
+        alsa_index = _hostapi_index(sd, "ALSA")
+
+        if self.query is None:
+            default = sd.query_hostapis(alsa_index)["default_input_device"]
+            if default >= 0:
+                return default
+
+        for i, dev in enumerate(sd.query_devices()):
+            if (
+                dev["hostapi"] == alsa_index
+                and dev["max_input_channels"] > 0
+                and (self.query is None or self.query in dev["name"])
+            ):
+                return i
+
+        raise RuntimeError(f"No ALSA capture device found: {self.query or 'default'}")
+
+
+# =========================
+# PULSEAUDIO / PIPEWIRE
+# =========================
+
+class PulseMonitorSource(AudioSource):
+    """
+    Records what a sink plays through its ".monitor" source with parec
+    (shipped with PulseAudio and with pipewire-pulse). PortAudio does
+    not list monitor sources, so this bypasses sounddevice entirely.
+
+    sink: sink name; None = the default sink
+    """
+
+    name = "pulse"
+
+    def __init__(self, sink: str | None = None, sample_rate: int = PULSE_SAMPLE_RATE):
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.monitor = None
+
+    def prepare(self) -> int:
+        if shutil.which("parec") is None:
+            raise RuntimeError("parec not found (install pulseaudio-utils)")
+
+        sink = self.sink
+        if sink is None:
+            completed = subprocess.run(
+                ["pactl", "get-default-sink"], capture_output=True, text=True
+            )
+            if completed.returncode != 0 or not completed.stdout.strip():
+                raise RuntimeError(f"No default sink: {completed.stderr.strip()}")
+            sink = completed.stdout.strip()
+
+        self.monitor = f"{sink}.monitor"
+        return self.sample_rate
+
+    @contextmanager
+    def stream(self, callback, blocksize: int, on_end=None):
+        process = subprocess.Popen(
+            [
+                "parec", f"--device={self.monitor}",
+                "--raw", "--format=float32le",
+                f"--rate={self.sample_rate}", "--channels=1",
+                f"--latency-msec={max(1, blocksize * 1000 // self.sample_rate)}"
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+        def reader():
+            # One reused buffer: the callback copies it out immediately
+            raw = bytearray(blocksize * 4)
+            view = memoryview(raw)
+            block = np.frombuffer(raw, dtype="<f4").reshape(-1, 1)
+
+            while True:
+                filled = 0
+                while filled < len(raw):
+                    n = process.stdout.readinto(view[filled:])
+                    if not n:
+                        break
+                    filled += n
+                frames = filled // 4
+                if frames:
+                    callback(block[:frames], frames, None, None)
+                if filled < len(raw):
+                    break
+
+            if on_end is not None:
+                on_end()
+
+        thread = threading.Thread(target=reader, name="parec-reader", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            process.terminate()
+            process.wait()
+            thread.join()
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.monitor})"
+
+
+# =========================
+# FILE REPLAY
+# =========================
+
+class FileReplaySource(AudioSource):
+    """
+    Replays a recording as if it were being captured, for headless hosts
+    and load tests.
+
+    Blocks are always cut at the same offsets, so a replay is
+    deterministic. They are paced against a monotonic clock at
+    speed x real time (speed=10 -> ten seconds of audio per second).
+    The audio is decoded to 16 kHz mono with audio_io.load_audio.
+    """
+
+    name = "file"
+
+    def __init__(self, path: str, speed: float = CAPTURE_REPLAY_SPEED):
+        if speed <= 0:
+            raise ValueError("speed must be > 0")
+        self.path = str(path)
+        self.speed = speed
+        self.audio = None
+        self.sample_rate = None
+
+    def prepare(self) -> int:
+        from src.audio.audio_io import TARGET_SAMPLE_RATE, load_audio
+
+        self.audio = load_audio(self.path)
+        self.sample_rate = TARGET_SAMPLE_RATE
+        return self.sample_rate
+
+    @contextmanager
+    def stream(self, callback, blocksize: int, on_end=None):
+        stop = threading.Event()
+        audio = self.audio.reshape(-1, 1)
+        rate = self.sample_rate * self.speed
+
+        def player():
+            start = time.monotonic()
+            for offset in range(0, len(audio), blocksize):
+                block = audio[offset:offset + blocksize]
+                # block is due once the audio before it has "played"
+                due = start + (offset + len(block)) / rate
+                if stop.wait(max(0.0, due - time.monotonic())):
+                    return
+                callback(block, len(block), None, None)
+
+            if on_end is not None:
+                on_end()
+
+        thread = threading.Thread(target=player, name="file-replay", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.path} at {self.speed:g}x)"
+
+
+# =========================
+# SELECTION
+# =========================
+
+def get_source(spec: str | None = None) -> AudioSource:
+    """
+    Builds a source from a spec like "pulse", "alsa:Loopback" or
+    "file:meeting.wav". Without a spec: CAPTURE_SOURCE, else WASAPI on
+    Windows, PulseAudio / PipeWire if parec is installed, else ALSA.
+    """
+    spec = spec or CAPTURE_SOURCE
+    if not spec:
+        if sys.platform == "win32":
+            spec = "wasapi"
+        elif shutil.which("parec"):
+            spec = "pulse"
+        else:
+            spec = "alsa"
+
+    kind, _, arg = spec.partition(":")
+    arg = arg or None
+
+    if kind == "wasapi":
+        return WasapiLoopbackSource()
+    if kind == "pulse":
+        return PulseMonitorSource(arg)
+    if kind == "alsa":
+        return AlsaSource(arg)
+    if kind == "file":
+        if arg is None:
+            raise ValueError("file source needs a path: file:<path>")
+        return FileReplaySource(arg)
+
+    raise ValueError(f"Unknown capture source: {spec}")
@@ -0,0 +1,128 @@
+# audio/stream_decoder.py
+
+import subprocess
+import threading
+import wave
+from pathlib import Path
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE
+
+
+_READ_SIZE = 64 * 1024
+_STDERR_TAIL = 4096
+
+
+class StreamingDecoder:
+    """
+    One long-running ffmpeg process per recording.
+
+    Compressed container chunks (e.g. MediaRecorder webm timeslices) are
+    written to ffmpeg's stdin as they arrive; 16 kHz mono s16le PCM comes
+    out of stdout and is appended to a WAV file straight away, so the
+    audio is ready as soon as the last chunk is in.
+    """
+
+    def __init__(self, wav_path: str, sample_rate: int = TARGET_SAMPLE_RATE, on_pcm=None):
+        self.wav_path = Path(wav_path)
+        self.sample_rate = sample_rate
+        self.frames = 0
+        self._on_pcm = on_pcm
+        self._stderr_tail = b""
+
+        self.wav_path.parent.mkdir(parents=True, exist_ok=True)
+        self._wav = wave.open(str(self.wav_path), "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-vn",
+                "-ac", "1",
+                "-ar", str(sample_rate),
+                "-f", "s16le",
+                "pipe:1"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        self._reader = threading.Thread(target=self._read_pcm, daemon=True)
+        self._reader.start()
+        self._stderr_reader = threading.Thread(target=self._read_stderr, daemon=True)
+        self._stderr_reader.start()
+
+    def _read_pcm(self):
+        remainder = b""
+        while data := self._process.stdout.read1(_READ_SIZE):
+            data = remainder + data
+            usable = len(data) - len(data) % 2
+            data, remainder = data[:usable], data[usable:]
+
+            self._wav.writeframes(data)
+            self.frames += usable // 2
+            if self._on_pcm is not None:
+                self._on_pcm(data, self.sample_rate)
+
+    def _read_stderr(self):
+        while data := self._process.stderr.read1(_READ_SIZE):
+            self._stderr_tail = (self._stderr_tail + data)[-_STDERR_TAIL:]
+
+    @property
+    def decoded_seconds(self) -> float:
+        return self.frames / self.sample_rate
+
+    def feed(self, chunk: bytes):
+        """
+        Pushes the next container chunk into the decoder.
+        """
+        try:
+            self._process.stdin.write(chunk)
+            self._process.stdin.flush()
+        except BrokenPipeError:
+            raise RuntimeError(
+                "Audio decoder exited: " + self._stderr_tail.decode(errors="replace")
+            )
+
+    def finish(self, timeout: float = 120) -> Path:
+        """
+        Closes the input, waits for ffmpeg to drain and finalizes the WAV.
+        On failure (including a timeout) ffmpeg is killed, the partial
+        WAV is removed and RuntimeError is raised.
+
+        Returns:
+            path of the decoded WAV
+        """
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        try:
+            self._process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.abort()
+            self.wav_path.unlink(missing_ok=True)
+            raise RuntimeError(f"WAV conversion timed out after {timeout:g}s")
+
+        self._reader.join()
+        self._stderr_reader.join()
+        self._wav.close()
+
+        if self._process.returncode != 0 or self.frames == 0:
+            self.wav_path.unlink(missing_ok=True)
+            raise RuntimeError(
+                "WAV conversion failed: " + self._stderr_tail.decode(errors="replace")
+            )
+
+        return self.wav_path
+
+    def abort(self):
+        self._process.kill()
+        self._process.wait()
+        self._reader.join()
+        self._stderr_reader.join()
+        self._wav.close()
@@ -1,70 +1,282 @@
 # audio/system_audio_capture.py
 
-import sounddevice as sd
-import soundfile as sf
-import queue
-import time
+# sounddevice / soundfile are imported on use: importing sounddevice
+# fails on hosts without PortAudio, which must still be able to import
+# the pipeline (see audio_sources).
 import os
+import threading
 
+import numpy as np
 
-audio_queue = queue.Queue()
+from src.audio.audio_sources import AudioSource, get_source
+from src.pipeline.metrics import inc
 
 
-def callback(indata, frames, time_info, status):
-    if status:
-        print(status)
-    audio_queue.put(indata.copy())
+# =========================
+# CONFIG
+# =========================
 
+# Ring capacity: how long the disk may stall before blocks are dropped
+CAPTURE_BUFFER_SECONDS = float(os.getenv("CAPTURE_BUFFER_SECONDS", "30"))
+# The writer waits for this much audio before flushing a slice
+CAPTURE_FLUSH_SECONDS = float(os.getenv("CAPTURE_FLUSH_SECONDS", "0.5"))
 
-def get_wasapi_loopback_device():
-    devices = sd.query_devices()
-    hostapis = sd.query_hostapis()
+CAPTURE_BLOCKSIZE = 1024
 
-    wasapi_index = next(
-        i for i, api in enumerate(hostapis)
-        if "Windows WASAPI" in api["name"]
-    )
 
-    for i, dev in enumerate(devices):
-        if dev["hostapi"] == wasapi_index and dev["max_input_channels"] > 0:
-            return i
+class _StreamResampler:
+    """
+    Linear-interpolation resampler that keeps its phase across chunks,
+    so resampling slice by slice matches resampling the whole recording.
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int):
+        self.step = orig_sr / target_sr
+        self.pos = 0.0          # next output position, in input frames
+        self.tail = np.zeros(0, dtype=np.float32)
 
-    raise RuntimeError("No WASAPI loopback device found")
+    def __call__(self, chunk: np.ndarray) -> np.ndarray:
+        audio = np.concatenate([self.tail, chunk]) if len(self.tail) else chunk
+        last = len(audio) - 1
+        if last < self.pos:
+            self.tail = audio[-1:].copy()
+            return np.zeros(0, dtype=np.float32)
 
+        count = int((last - self.pos) // self.step) + 1
+        positions = self.pos + np.arange(count) * self.step
+        out = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
 
-def record_audio(output_path: str, duration: int = 30):
+        # the last input frame becomes index 0 of the next chunk
+        self.pos += count * self.step - last
+        self.tail = audio[-1:].copy()
+        return out
+
+
+class CaptureSession:
     """
-    Records system audio using WASAPI loopback
+    One recording: a preallocated ring buffer filled by the audio
+    callback and drained by a writer thread.
+
+    The callback only copies into the ring, it never allocates or
+    blocks on I/O. The writer flushes contiguous slices of at least
+    CAPTURE_FLUSH_SECONDS. If the writer falls a whole buffer behind,
+    incoming blocks are dropped and counted, so memory never grows.
+
+    write:       callable(frames) persisting a (frames, channels) float32
+                 array, e.g. soundfile.SoundFile.write
+    on_block:    optional callback(block, sample_rate) per flushed slice
+    resample_to: write (and pass on) audio at this rate instead of the
+                 device rate; mono only
     """
 
+    def __init__(
+        self,
+        sample_rate: int,
+        write,
+        channels: int = 1,
+        duration: float | None = None,
+        on_block=None,
+        resample_to: int | None = None,
+        buffer_seconds: float = CAPTURE_BUFFER_SECONDS,
+        flush_seconds: float = CAPTURE_FLUSH_SECONDS
+    ):
+        if resample_to and channels != 1:
+            raise ValueError("resample_to needs mono capture")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.output_rate = resample_to or sample_rate
+        self._write = write
+        self._on_block = on_block
+        self._resampler = (
+            _StreamResampler(sample_rate, resample_to)
+            if resample_to and resample_to != sample_rate else None
+        )
+
+        self._capacity = max(int(buffer_seconds * sample_rate), CAPTURE_BLOCKSIZE * 2)
+        self._flush_frames = min(max(int(flush_seconds * sample_rate), 1), self._capacity)
+        self._ring = np.zeros((self._capacity, channels), dtype=np.float32)
+
+        # Frame counters; only ever increase (position = counter % capacity)
+        self._written = 0       # by the callback
+        self._flushed = 0       # by the writer
+        self._target = int(duration * sample_rate) if duration is not None else None
+
+        self._cond = threading.Condition()
+        self._closed = False
+        self.finished = threading.Event()
+        self.error = None
+
+        self.overruns = 0           # callback blocks dropped (ring full)
+        self.dropped_frames = 0
+        self.input_overflows = 0    # reported by the audio device
+
+        self._writer = threading.Thread(target=self._run_writer, name="capture-writer", daemon=True)
+        self._writer.start()
+
+    # --- audio thread ---
+
+    def callback(self, indata, frames, time_info, status):
+        if status:
+            if getattr(status, "input_overflow", False):
+                self.input_overflows += 1
+            else:
+                print(status)
+
+        if self.finished.is_set():
+            return
+
+        if self._target is not None:
+            frames = min(frames, self._target - self._written)
+
+        with self._cond:
+            free = self._capacity - (self._written - self._flushed)
+
+        if frames > free:
+            self.overruns += 1
+            self.dropped_frames += frames
+            return
+
+        start = self._written % self._capacity
+        first = min(frames, self._capacity - start)
+        np.copyto(self._ring[start:start + first], indata[:first])
+        if first < frames:
+            np.copyto(self._ring[:frames - first], indata[first:frames])
+
+        with self._cond:
+            self._written += frames
+            if self._written - self._flushed >= self._flush_frames:
+                self._cond.notify()
+
+        if self._target is not None and self._written >= self._target:
+            self.finished.set()
+
+    # --- writer thread ---
+
+    def _emit(self, block: np.ndarray):
+        if self._resampler is not None:
+            block = self._resampler(block[:, 0])[:, None]
+        if not len(block):
+            return
+        self._write(block)
+        if self._on_block is not None:
+            # the ring slice is reused once flushed
+            self._on_block(block[:, 0].copy() if self.channels == 1 else block.copy(), self.output_rate)
+
+    def _run_writer(self):
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._closed or self._written - self._flushed >= self._flush_frames
+                    )
+                    pending = self._written - self._flushed
+                    if not pending and self._closed:
+                        return
+
+                # contiguous up to the end of the ring; the rest next round
+                start = self._flushed % self._capacity
+                count = min(pending, self._capacity - start)
+                self._emit(self._ring[start:start + count])
+
+                with self._cond:
+                    self._flushed += count
+        except Exception as exc:
+            self.error = exc
+            self.finished.set()
+
+    # --- control ---
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until duration frames were captured (or the writer failed).
+        """
+        return self.finished.wait(timeout)
+
+    def close(self):
+        """
+        Flushes what is left in the ring and stops the writer.
+        """
+        self.finished.set()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+
+        if self.dropped_frames:
+            inc("capture_dropped_frames_total", self.dropped_frames)
+        if self.error is not None:
+            raise self.error
+
+    def stats(self) -> dict:
+        return {
+            "frames": self._written,
+            "seconds": round(self._written / self.sample_rate, 2),
+            "overruns": self.overruns,
+            "dropped_frames": self.dropped_frames,
+            "input_overflows": self.input_overflows,
+        }
+
+
+def record_audio(
+    output_path: str,
+    duration: int = 30,
+    on_block=None,
+    resample_to: int | None = None,
+    source: AudioSource | None = None
+) -> dict:
+    """
+    Records system audio from source (default: get_source(), i.e.
+    CAPTURE_SOURCE or the platform's loopback / monitor device)
+
+    on_block:    optional callback(block, sample_rate) called with every
+                 slice as it is written (used for live streaming)
+    resample_to: e.g. TARGET_SAMPLE_RATE to write 16 kHz audio directly
+    source:      an audio_sources.AudioSource, e.g. FileReplaySource to
+                 replay a recording on a host without sound hardware
+
+    Returns:
+        capture stats (frames, overruns, dropped_frames, ...)
+    """
+
+    import soundfile as sf
+
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    device_index = get_wasapi_loopback_device()
-    device_info = sd.query_devices(device_index)
-    sample_rate = int(device_info["default_samplerate"])
+    source = source or get_source()
+    sample_rate = source.prepare()
 
-    print("Using device:", device_info["name"])
+    print("Using source:", source.describe())
     print("Sample rate:", sample_rate)
     print("Recording system audio...")
 
     with sf.SoundFile(
         output_path,
         mode="w",
-        samplerate=sample_rate,
+        samplerate=resample_to or sample_rate,
         channels=1,
         subtype="PCM_16"
     ) as file:
+        session = CaptureSession(
+            sample_rate,
+            file.write,
+            duration=duration,
+            on_block=on_block,
+            resample_to=resample_to
+        )
+        try:
+            # a replayed file may end before duration
+            with source.stream(session.callback, CAPTURE_BLOCKSIZE, on_end=session.finished.set):
+                session.wait()
+        finally:
+            session.close()
 
-        with sd.InputStream(
-            samplerate=sample_rate,
-            device=device_index,
-            channels=1,
-            callback=callback,
-            blocksize=1024,
-            extra_settings=sd.WasapiSettings(exclusive=False)
-        ):
-            start = time.time()
-            while time.time() - start < duration:
-                file.write(audio_queue.get())
-
+    stats = session.stats()
+    if stats["overruns"] or stats["input_overflows"]:
+        print(
+            f"Capture overruns: {stats['overruns']} "
+            f"({stats['dropped_frames']} frames dropped), "
+            f"device overflows: {stats['input_overflows']}"
+        )
     print(f"Saved audio → {output_path}")
+    return stats
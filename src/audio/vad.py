@@ -0,0 +1,206 @@
+# audio/vad.py
+
+import bisect
+
+import numpy as np
+
+
+FRAME_MS = 30
+
+# RMS below this is treated as silence (float audio in [-1, 1])
+SILENCE_RMS = 0.01
+
+
+def frame_rms(audio: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """
+    RMS energy per non-overlapping frame.
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+
+def is_silent(audio: np.ndarray, sample_rate: int, threshold: float = SILENCE_RMS) -> bool:
+    rms = frame_rms(audio, sample_rate)
+    return len(rms) == 0 or float(rms.max()) < threshold
+
+
+def find_quiet_point(
+    audio: np.ndarray,
+    sample_rate: int,
+    start: int,
+    end: int,
+    frame_ms: int = FRAME_MS
+) -> int:
+    """
+    Sample index of the quietest frame in audio[start:end].
+    Used to cut audio where nobody is talking.
+    """
+    start = max(0, start)
+    end = min(len(audio), end)
+
+    rms = frame_rms(audio[start:end], sample_rate, frame_ms)
+    if len(rms) == 0:
+        return end
+
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    quietest = int(np.argmin(rms))
+    return start + quietest * frame_len + frame_len // 2
+
+
+# =========================
+# SPEECH REGIONS (pre-pass)
+# =========================
+
+MIN_SPEECH_SECONDS = 0.25     # shorter bursts are noise
+MIN_SILENCE_SECONDS = 1.0     # shorter pauses stay inside a region
+PAD_SECONDS = 0.2             # keep word onsets / tails
+
+# Adaptive threshold: a multiple of the noise floor, clamped
+_NOISE_FLOOR_PERCENTILE = 10
+_NOISE_FLOOR_FACTOR = 3.0
+_MAX_THRESHOLD = 0.05
+
+
+def detect_speech_regions(
+    audio: np.ndarray,
+    sample_rate: int,
+    frame_ms: int = FRAME_MS
+) -> list[tuple[float, float]]:
+    """
+    Energy-based voice activity detection.
+
+    Returns:
+        sorted, non-overlapping [(start_s, end_s), ...] of speech
+    """
+    rms = frame_rms(audio, sample_rate, frame_ms)
+    if len(rms) == 0:
+        return []
+
+    noise_floor = float(np.percentile(rms, _NOISE_FLOOR_PERCENTILE))
+    threshold = min(max(SILENCE_RMS, noise_floor * _NOISE_FLOOR_FACTOR), _MAX_THRESHOLD)
+
+    voiced = np.concatenate([[0], (rms >= threshold).astype(np.int8), [0]])
+    edges = np.flatnonzero(np.diff(voiced))
+    frame_s = frame_ms / 1000
+
+    runs = []
+    for start, end in zip(edges[::2] * frame_s, edges[1::2] * frame_s):
+        if runs and start - runs[-1][1] < MIN_SILENCE_SECONDS:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+
+    duration = len(audio) / sample_rate
+    regions = []
+    for start, end in runs:
+        if end - start < MIN_SPEECH_SECONDS:
+            continue
+        start = max(0.0, start - PAD_SECONDS)
+        end = min(duration, end + PAD_SECONDS)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+
+    return [(round(s, 3), round(e, 3)) for s, e in regions]
+
+
+def compact_speech(
+    audio: np.ndarray,
+    sample_rate: int,
+    regions: list[tuple[float, float]]
+) -> np.ndarray:
+    """
+    Concatenates only the speech regions.
+    """
+    return np.concatenate([
+        audio[int(start * sample_rate):int(end * sample_rate)]
+        for start, end in regions
+    ]).astype(np.float32, copy=False)
+
+
+def _compact_starts(regions: list[tuple[float, float]]) -> list[float]:
+    starts = []
+    position = 0.0
+    for start, end in regions:
+        starts.append(position)
+        position += end - start
+    return starts
+
+
+def _region_index(t: float, compact_starts: list[float], is_end: bool) -> int:
+    # an end time exactly on a junction belongs to the region before it
+    find = bisect.bisect_left if is_end else bisect.bisect_right
+    return max(0, find(compact_starts, t) - 1)
+
+
+def remap_time(
+    t: float,
+    regions: list[tuple[float, float]],
+    compact_starts: list[float],
+    is_end: bool = False
+) -> float:
+    """
+    Compacted-timeline seconds -> original-timeline seconds.
+    """
+    i = _region_index(t, compact_starts, is_end)
+    start, end = regions[i]
+    return round(min(end, start + (t - compact_starts[i])), 2)
+
+
+def remap_segments(segments: list[dict], regions: list[tuple[float, float]]) -> list[dict]:
+    """
+    Maps Whisper segments (and their words) back to the original timeline.
+    No regions means nothing was removed: timestamps are kept.
+    """
+    if not regions:
+        return [dict(seg) for seg in segments]
+    compact_starts = _compact_starts(regions)
+
+    def remap(item: dict) -> dict:
+        return dict(
+            item,
+            start=remap_time(item["start"], regions, compact_starts),
+            end=remap_time(item["end"], regions, compact_starts, is_end=True)
+        )
+
+    remapped = []
+    for seg in segments:
+        seg = remap(seg)
+        if seg.get("words"):
+            seg["words"] = [remap(word) for word in seg["words"]]
+        remapped.append(seg)
+    return remapped
+
+
+def remap_turns(turns: list[dict], regions: list[tuple[float, float]]) -> list[dict]:
+    """
+    Maps diarization turns back to the original timeline, splitting any
+    turn that crosses a removed silence so it doesn't claim the gap.
+    """
+    if not regions:
+        return [dict(turn) for turn in turns]
+    compact_starts = _compact_starts(regions)
+    remapped = []
+    for turn in turns:
+        first = _region_index(turn["start"], compact_starts, is_end=False)
+        last = _region_index(turn["end"], compact_starts, is_end=True)
+
+        for i in range(first, last + 1):
+            remapped.append({
+                **turn,
+                "start": (
+                    remap_time(turn["start"], regions, compact_starts)
+                    if i == first else regions[i][0]
+                ),
+                "end": (
+                    remap_time(turn["end"], regions, compact_starts, is_end=True)
+                    if i == last else regions[i][1]
+                )
+            })
+    return remapped
@@ -0,0 +1,180 @@
+# cache/result_cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.pipeline.artifacts import content_hash
+
+# =========================
+# CONFIG
+# =========================
+
+CACHE_DIR = Path(os.getenv("RESULT_CACHE_DIR", "data/cache"))
+CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(1024 ** 3)))
+CACHE_ENABLED = os.getenv("RESULT_CACHE", "1") != "0"
+
+# An eviction pass deletes the oldest entries until the cache is at
+# this fraction of the limit, leaving headroom for the next puts
+_EVICT_TARGET = 0.9
+# Puts only add to a running size estimate; the directory is scanned
+# when the estimate passes the limit, and every _RESCAN_PUTS puts to
+# account for entries written by other processes
+_RESCAN_PUTS = 256
+
+# (path, size, mtime) -> sha256, so STT and diarization hash a file once
+_HASH_CACHE = OrderedDict()
+_HASH_CACHE_SIZE = 256
+_LOCK = threading.Lock()
+
+_EVICT_LOCK = threading.Lock()
+_cache_bytes = None         # running estimate; None = not scanned yet
+_puts_since_scan = 0
+
+
+def audio_hash(path: str) -> str:
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    with _LOCK:
+        if key in _HASH_CACHE:
+            _HASH_CACHE.move_to_end(key)
+            return _HASH_CACHE[key]
+
+    digest = content_hash(path)
+    with _LOCK:
+        _HASH_CACHE[key] = digest
+        while len(_HASH_CACHE) > _HASH_CACHE_SIZE:
+            _HASH_CACHE.popitem(last=False)
+    return digest
+
+
+def array_hash(audio) -> str:
+    """
+    SHA-256 of an in-memory (or memory-mapped) sample buffer.
+    """
+    digest = hashlib.sha256()
+    view = memoryview(audio).cast("B")
+    step = 1 << 24
+    for i in range(0, len(view), step):
+        digest.update(view[i:i + step])
+    return digest.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_key(content: str, **params) -> str:
+    """
+    Cache key = content hash + every parameter that changes the result.
+    """
+    payload = json.dumps({"content": content, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(namespace: str, key: str) -> Path:
+    return CACHE_DIR / namespace / f"{key}.json"
+
+
+def cache_get(namespace: str, key: str):
+    """
+    Returns the cached value, or None on a miss.
+    """
+    if not CACHE_ENABLED:
+        return None
+
+    path = _entry_path(namespace, key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            value = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    # LRU: recency is the file's mtime
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+    return value
+
+
+def cache_put(namespace: str, key: str, value):
+    """
+    Stores value (JSON-serializable). A failed write is logged and
+    dropped: the cache must never fail the request.
+    """
+    global _cache_bytes, _puts_since_scan
+
+    if not CACHE_ENABLED:
+        return
+
+    path = _entry_path(namespace, key)
+    tmp_path = None
+    try:
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Atomic replace: safe with several worker processes
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as exc:
+        print(f"Result cache write failed ({namespace}/{key[:12]}): {exc}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+        return
+
+    with _LOCK:
+        _puts_since_scan += 1
+        if _cache_bytes is not None:
+            _cache_bytes += len(data)
+        scan = (
+            _cache_bytes is None
+            or _cache_bytes > CACHE_MAX_BYTES
+            or _puts_since_scan >= _RESCAN_PUTS
+        )
+
+    if scan:
+        _evict()
+
+
+def _evict():
+    global _cache_bytes, _puts_since_scan
+
+    # one scan at a time; a put that finds one running skips it
+    if not _EVICT_LOCK.acquire(blocking=False):
+        return
+    try:
+        entries = []
+        total = 0
+        for path in CACHE_DIR.rglob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+            total += stat.st_size
+
+        if total > CACHE_MAX_BYTES:
+            entries.sort()
+            target = CACHE_MAX_BYTES * _EVICT_TARGET
+            for _, path, size in entries:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+        with _LOCK:
+            _cache_bytes = total
+            _puts_since_scan = 0
+    finally:
+        _EVICT_LOCK.release()
@@ -1,8 +1,12 @@
 import os
+import time
 from pathlib import Path
-from pyannote.audio import Pipeline
 from dotenv import load_dotenv
 
+from src.audio.audio_io import TARGET_SAMPLE_RATE
+from src.cache.result_cache import audio_hash, array_hash, make_key, cache_get, cache_put
+from src.pipeline.metrics import observe
+
 load_dotenv()
 
 # Model cache (critical for performance)
@@ -14,27 +18,51 @@ MODEL_NAME = "pyannote/speaker-diarization"
 
 def _load_pipeline():
     if MODEL_NAME not in _PIPELINE_CACHE:
+        # torch + pyannote take seconds to import; only pay it here
+        from pyannote.audio import Pipeline
+
         if not HF_TOKEN:
             raise EnvironmentError(
                 "HF_TOKEN not set. Please add it to your environment variables."
             )
 
         print("Loading PyAnnote diarization pipeline...")
+        start = time.perf_counter()
         _PIPELINE_CACHE[MODEL_NAME] = Pipeline.from_pretrained(
             MODEL_NAME,
             use_auth_token=HF_TOKEN
         )
+        observe("model_load_seconds", time.perf_counter() - start, model=MODEL_NAME)
 
     return _PIPELINE_CACHE[MODEL_NAME]
 
 
+def save_diarization(segments: list[dict], save_txt_path: str):
+    save_txt_path = Path(save_txt_path)
+    save_txt_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(save_txt_path, "w", encoding="utf-8") as f:
+        for seg in segments:
+            f.write(
+                f"{seg['start']}s - {seg['end']}s | Speaker {seg['speaker']}\n"
+            )
+
+
 def diarize_audio(
-    audio_path: str,
-    save_txt_path: str | None = None
+    audio_path: str | None,
+    save_txt_path: str | None = None,
+    use_cache: bool = True,
+    audio=None
 ) -> list[dict]:
     """
     Performs speaker diarization.
 
+    audio: optional pre-decoded 16 kHz mono float32 buffer of audio_path
+           (passed to pyannote in memory instead of re-reading the file);
+           audio_path may then be None
+
+    Results are cached by audio content hash + model name.
+
     Returns:
         List of segments:
         [
@@ -46,34 +74,45 @@ def diarize_audio(
         ]
     """
 
-    audio_path = Path(audio_path)
+    if audio is None:
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    content = audio_hash(audio_path) if audio is None else array_hash(audio)
+    cache_key = make_key(content, model=MODEL_NAME)
+    segments = cache_get("diarization", cache_key) if use_cache else None
+
+    if segments is not None:
+        print("Diarization cache hit")
+    else:
+        pipeline = _load_pipeline()
 
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        print("Running speaker diarization...")
+        if audio is None:
+            diarization = pipeline(str(audio_path))
+        else:
+            import torch
 
-    pipeline = _load_pipeline()
+            diarization = pipeline({
+                "waveform": torch.from_numpy(audio).unsqueeze(0),
+                "sample_rate": TARGET_SAMPLE_RATE
+            })
 
-    print("Running speaker diarization...")
-    diarization = pipeline(str(audio_path))
+        segments = []
 
-    segments = []
+        for turn, _, speaker in diarization.itertracks(yield_label=True):
+            segments.append({
+                "start": round(turn.start, 2),
+                "end": round(turn.end, 2),
+                "speaker": speaker
+            })
 
-    for turn, _, speaker in diarization.itertracks(yield_label=True):
-        segments.append({
-            "start": round(turn.start, 2),
-            "end": round(turn.end, 2),
-            "speaker": speaker
-        })
+        if use_cache:
+            cache_put("diarization", cache_key, segments)
 
     # Optional persistence (pipeline decides)
     if save_txt_path:
-        save_txt_path = Path(save_txt_path)
-        save_txt_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(save_txt_path, "w", encoding="utf-8") as f:
-            for seg in segments:
-                f.write(
-                    f"{seg['start']}s - {seg['end']}s | Speaker {seg['speaker']}\n"
-                )
+        save_diarization(segments, save_txt_path)
 
     return segments
@@ -0,0 +1,143 @@
+# pipeline/artifacts.py
+
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# =========================
+# CONFIG
+# =========================
+
+ARTIFACT_ROOT = Path(os.getenv("ARTIFACT_ROOT", "data/jobs"))
+RETENTION_SECONDS = int(os.getenv("ARTIFACT_RETENTION_SECONDS", str(24 * 3600)))
+MAX_TOTAL_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(5 * 1024 ** 3)))
+
+# Present while a job is still writing into its directory
+_ACTIVE_MARKER = ".active"
+
+_HASH_CHARS = 16
+
+
+def content_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's content (hex).
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_job_dir(root: Path = ARTIFACT_ROOT) -> Path:
+    """
+    Creates a fresh, uniquely named artifact directory for one job.
+    It starts out marked active, so a queued job is never cleaned up.
+    """
+    job_dir = Path(root) / uuid.uuid4().hex
+    job_dir.mkdir(parents=True, exist_ok=False)
+    (job_dir / _ACTIVE_MARKER).touch()
+    return job_dir
+
+
+def store_content_addressed(path: str, suffix: str) -> Path:
+    """
+    Renames a file inside its directory to <content-hash><suffix>.
+
+    Returns:
+        new path
+    """
+    path = Path(path)
+    target = path.with_name(content_hash(path)[:_HASH_CHARS] + suffix)
+    os.replace(path, target)
+    return target
+
+
+def artifact_paths(output_dir: str, audio_path: str) -> dict:
+    """
+    Per-job artifact layout, named after the source audio hash.
+    """
+    output_dir = Path(output_dir)
+    stem = Path(audio_path).stem
+
+    return {
+        "whisper_text": output_dir / f"{stem}.transcript.txt",
+        "whisper_json": output_dir / f"{stem}.whisper.json",
+        "diarization": output_dir / f"{stem}.diarization.txt",
+        "final_transcript": output_dir / f"{stem}.speaker_transcript.txt",
+        "summary": output_dir / f"{stem}.summary.txt",
+    }
+
+
+@contextmanager
+def active_job_dir(job_dir: Path):
+    """
+    Keeps job_dir marked as in use while the job runs, and releases it
+    for cleanup_artifacts() afterwards.
+    """
+    marker = Path(job_dir) / _ACTIVE_MARKER
+    marker.touch()
+    try:
+        yield job_dir
+    finally:
+        marker.unlink(missing_ok=True)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def cleanup_artifacts(
+    root: Path = ARTIFACT_ROOT,
+    retention_seconds: int = RETENTION_SECONDS,
+    max_total_bytes: int = MAX_TOTAL_BYTES
+) -> int:
+    """
+    Retention policy for job directories:
+      1. drop directories older than retention_seconds
+      2. drop the oldest remaining ones until under max_total_bytes
+
+    Active jobs are skipped unless their marker is older than the
+    retention window (left behind by a crashed worker).
+
+    Returns:
+        number of directories removed
+    """
+    root = Path(root)
+    if not root.exists():
+        return 0
+
+    now = time.time()
+    candidates = []
+
+    for job_dir in root.iterdir():
+        if not job_dir.is_dir():
+            continue
+
+        marker = job_dir / _ACTIVE_MARKER
+        if marker.exists() and now - marker.stat().st_mtime < retention_seconds:
+            continue
+
+        candidates.append((job_dir.stat().st_mtime, job_dir, _dir_size(job_dir)))
+
+    candidates.sort()
+    total = sum(size for _, _, size in candidates)
+    removed = 0
+
+    for mtime, job_dir, size in candidates:
+        if now - mtime < retention_seconds and total <= max_total_bytes:
+            break
+
+        shutil.rmtree(job_dir, ignore_errors=True)
+        total -= size
+        removed += 1
+
+    if removed:
+        print(f"Removed {removed} expired job artifact director(ies)")
+
+    return removed
@@ -0,0 +1,260 @@
+# pipeline/batch.py
+
+"""
+Batch processing of recorded meetings.
+
+    python -m src.pipeline.batch recordings/ --workers 4 --output data/batch
+    python -m src.pipeline.batch manifest.txt --workers 2
+
+INPUT is a directory (searched recursively for audio files) or a
+manifest with one audio path per line (relative to the manifest; blank
+lines and "#" comments are skipped).
+
+Each worker process loads the models once and keeps them for all files
+it handles. Every finished file is appended to <output>/checkpoint.jsonl,
+so an interrupted run picks up where it stopped; files that failed are
+retried. Per-file artifacts go to <output>/<name>_<id>/ and the run's
+throughput to <output>/report.json.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".webm", ".ogg", ".flac", ".mp4"}
+
+CHECKPOINT_NAME = "checkpoint.jsonl"
+REPORT_NAME = "report.json"
+
+
+# =========================
+# INPUTS / CHECKPOINT
+# =========================
+
+def find_inputs(source: str) -> list[Path]:
+    source = Path(source)
+    if source.is_dir():
+        return sorted(
+            path.resolve() for path in source.rglob("*")
+            if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+        )
+
+    inputs = []
+    for line in source.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            inputs.append((source.parent / line).resolve())
+    return inputs
+
+
+def output_dir_for(output_root: Path, audio_path: Path) -> Path:
+    # stem for humans, path hash so same-named files don't collide
+    digest = hashlib.sha1(str(audio_path).encode()).hexdigest()[:8]
+    return output_root / f"{audio_path.stem}_{digest}"
+
+
+def load_checkpoint(path: Path) -> dict:
+    """
+    Returns:
+        {audio path: latest record}
+    """
+    records = {}
+    if not path.exists():
+        return records
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue    # torn last line after a crash
+            records[record["path"]] = record
+    return records
+
+
+def _append_checkpoint(f, record: dict):
+    f.write(json.dumps(record) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# =========================
+# WORKERS
+# =========================
+
+def _init_worker(threads: int, preload: bool):
+    from src.stt import whisper_engine
+
+    # Split the cores between workers instead of oversubscribing
+    whisper_engine.CPU_THREADS = threads
+
+    if preload:
+        import torch
+        from src.pipeline.model_server import preload_models
+
+        torch.set_num_threads(threads)
+        preload_models()
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _process_file(audio_path: str, output_dir: str, concurrency: str, vad: bool) -> dict:
+    from src.pipeline.pipeline import run_pipeline_from_audio
+
+    record = {"path": audio_path, "output_dir": output_dir}
+    timings = {}
+    try:
+        run_pipeline_from_audio(
+            audio_path,
+            concurrency=concurrency,
+            timings=timings,
+            output_dir=output_dir,
+            vad=vad
+        )
+    except Exception as exc:
+        record.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+    else:
+        record["status"] = "done"
+
+    record.update(timings=timings, finished_at=time.time())
+    return record
+
+
+# =========================
+# REPORT
+# =========================
+
+def build_report(records: list[dict], wall_seconds: float, workers: int, skipped: int) -> dict:
+    done = [r for r in records if r["status"] == "done"]
+    audio_seconds = sum(r["timings"].get("audio_duration", 0) for r in done)
+    busy_seconds = sum(r["timings"].get("total", 0) for r in done)
+
+    stages = {}
+    for record in done:
+        for stage, seconds in record["timings"].items():
+            if stage not in ("audio_duration", "real_time_factor"):
+                stages[stage] = round(stages.get(stage, 0) + seconds, 3)
+
+    return {
+        "workers": workers,
+        "files_done": len(done),
+        "files_failed": len(records) - len(done),
+        "files_skipped": skipped,
+        "wall_seconds": round(wall_seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        # audio processed per second of wall time (> 1 = faster than real time)
+        "throughput": round(audio_seconds / wall_seconds, 3) if wall_seconds else None,
+        "mean_real_time_factor": round(busy_seconds / audio_seconds, 3) if audio_seconds else None,
+        "stage_seconds": stages,
+        "failed": [
+            {"path": r["path"], "error": r["error"]}
+            for r in records if r["status"] != "done"
+        ]
+    }
+
+
+def run_batch(
+    source: str,
+    output_root: str = "data/batch",
+    workers: int = 2,
+    concurrency: str = "thread",
+    vad: bool = True,
+    preload: bool = True
+) -> dict:
+    from src.pipeline.model_server import MODEL_SERVER_ADDRESS
+
+    output_root = Path(output_root)
+    output_root.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_root / CHECKPOINT_NAME
+
+    inputs = [str(path) for path in find_inputs(source)]
+    finished = load_checkpoint(checkpoint_path)
+    pending = [
+        path for path in inputs
+        if finished.get(path, {}).get("status") != "done"
+    ]
+    skipped = len(inputs) - len(pending)
+    print(f"{len(inputs)} files, {skipped} already done, {len(pending)} to process")
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    records = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        # fork after torch has started threads can deadlock
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        # workers talk to the model server instead when one is configured
+        initargs=(threads, preload and not MODEL_SERVER_ADDRESS)
+    ) as pool, open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        # A failing initializer (missing model, bad device) breaks the
+        # pool; surface that once instead of failing every file
+        try:
+            pool.submit(_worker_ready).result()
+        except BrokenProcessPool as exc:
+            raise RuntimeError(
+                "Batch workers failed to start (see the worker traceback above)"
+            ) from exc
+
+        futures = {}
+        for path in pending:
+            output_dir = str(output_dir_for(output_root, Path(path)))
+            futures[pool.submit(_process_file, path, output_dir, concurrency, vad)] = (path, output_dir)
+
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+            except Exception as exc:
+                # e.g. BrokenProcessPool after a worker was OOM-killed;
+                # recorded as failed so the next run retries the file
+                path, output_dir = futures[future]
+                record = {
+                    "path": path,
+                    "output_dir": output_dir,
+                    "status": "failed",
+                    "error": f"{type(exc).__name__}: {exc}",
+                    "timings": {},
+                    "finished_at": time.time()
+                }
+            _append_checkpoint(checkpoint, record)
+            records.append(record)
+
+            status = record["status"]
+            if status == "done":
+                status += f" (RTF {record['timings'].get('real_time_factor')})"
+            print(f"[{i}/{len(pending)}] {Path(record['path']).name}: {status}")
+
+    report = build_report(records, time.perf_counter() - start, workers, skipped)
+    (output_root / REPORT_NAME).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a directory or manifest of recordings")
+    parser.add_argument("input", help="directory of recordings or manifest file")
+    parser.add_argument("--output", default="data/batch")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", "2")))
+    parser.add_argument("--concurrency", choices=["thread", "process", "none"], default="thread")
+    parser.add_argument("--no-vad", action="store_true")
+    parser.add_argument("--no-preload", action="store_true", help="load models on first use")
+    args = parser.parse_args()
+
+    report = run_batch(
+        args.input,
+        output_root=args.output,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        vad=not args.no_vad,
+        preload=not args.no_preload
+    )
+    print(json.dumps({k: v for k, v in report.items() if k != "failed"}, indent=2))
@@ -0,0 +1,155 @@
+# pipeline/metrics.py
+
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+    with span("pdf"):
+        ...
+    observe("audio_duration_seconds", 93.2)
+    render_prometheus()   # -> body for GET /metrics
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Stage latencies span milliseconds (merge) to tens of minutes (STT)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, math.inf)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5, math.inf)
+DURATION_BUCKETS = (10, 30, 60, 300, 600, 1200, 1800, 3600, 7200, 14400, math.inf)
+
+_HELP = {
+    "pipeline_stage_seconds": "Wall-clock time per pipeline stage",
+    "audio_duration_seconds": "Duration of processed recordings",
+    "pipeline_real_time_factor": "Pipeline wall time divided by audio duration",
+    "model_load_seconds": "Time to load a model into memory",
+    "stage_errors_total": "Stages that raised",
+    "jobs_total": "Finished jobs by outcome",
+    "job_queue_depth": "Jobs queued or running",
+    "live_stt_backpressure_seconds_total": "Time the capture writer waited for live transcription",
+    "capture_dropped_frames_total": "Captured audio frames dropped because the ring buffer was full",
+}
+
+_LOCK = threading.Lock()
+_HISTOGRAMS = {}      # (name, labels) -> {"buckets", "counts", "sum", "count"}
+_COUNTERS = {}        # (name, labels) -> float
+_GAUGES = {}          # name -> callable returning the current value
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def observe(name: str, value: float, buckets=LATENCY_BUCKETS, **labels):
+    key = (name, _labels(labels))
+    with _LOCK:
+        hist = _HISTOGRAMS.get(key)
+        if hist is None:
+            hist = _HISTOGRAMS[key] = {
+                "buckets": buckets,
+                "counts": [0] * len(buckets),
+                "sum": 0.0,
+                "count": 0
+            }
+        for i, bound in enumerate(hist["buckets"]):
+            if value <= bound:
+                hist["counts"][i] += 1
+        hist["sum"] += value
+        hist["count"] += 1
+
+
+def inc(name: str, amount: float = 1, **labels):
+    key = (name, _labels(labels))
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + amount
+
+
+def register_gauge(name: str, fn):
+    """
+    fn() is evaluated at scrape time (e.g. queue depth).
+    """
+    with _LOCK:
+        _GAUGES[name] = fn
+
+
+def record_stage(stage: str, seconds: float, timings: dict | None = None):
+    """
+    Records one stage duration in the stage histogram and, if given,
+    in the job's timings dict (for stages timed in a worker process).
+    """
+    observe("pipeline_stage_seconds", seconds, stage=stage)
+    if timings is not None:
+        timings[stage] = round(seconds, 3)
+    print(f"[{stage}] {seconds:.2f}s")
+
+
+@contextmanager
+def span(stage: str, timings: dict | None = None):
+    """
+    Times the block as one stage, see record_stage.
+    Failed blocks are counted in stage_errors_total instead.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc("stage_errors_total", stage=stage)
+        raise
+    record_stage(stage, time.perf_counter() - start, timings)
+
+
+def _escape_label(value) -> str:
+    # the exposition format escapes backslash, double quote and newline
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in items) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def render_prometheus() -> str:
+    with _LOCK:
+        histograms = {
+            key: dict(hist, counts=list(hist["counts"]))
+            for key, hist in _HISTOGRAMS.items()
+        }
+        counters = dict(_COUNTERS)
+        gauges = dict(_GAUGES)
+
+    lines = []
+    seen = set()
+
+    def header(name: str, kind: str):
+        if name not in seen:
+            seen.add(name)
+            if name in _HELP:
+                lines.append(f"# HELP {name} {_HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), hist in sorted(histograms.items()):
+        header(name, "histogram")
+        for bound, count in zip(hist["buckets"], hist["counts"]):
+            lines.append(
+                f"{name}_bucket{_format_labels(labels, (('le', _format_bound(bound)),))} {count}"
+            )
+        lines.append(f"{name}_sum{_format_labels(labels)} {hist['sum']}")
+        lines.append(f"{name}_count{_format_labels(labels)} {hist['count']}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for name, fn in sorted(gauges.items()):
+        header(name, "gauge")
+        lines.append(f"{name} {fn()}")
+
+    return "\n".join(lines) + "\n"
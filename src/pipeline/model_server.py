@@ -0,0 +1,270 @@
+# pipeline/model_server.py
+
+"""
+One process that holds the Whisper and pyannote models and serves
+inference to any number of web workers over a local socket.
+
+    MODEL_SERVER_ADDRESS=127.0.0.1:6100 MODEL_SERVER_AUTHKEY=<secret> \
+        python -m src.pipeline.model_server
+
+Web workers started with the same MODEL_SERVER_ADDRESS and
+MODEL_SERVER_AUTHKEY send their transcription / diarization calls here
+instead of loading their own copies of the models.
+
+Requests carry pickled payloads, so both sides refuse to run without an
+authkey. Clients send decoded audio only; the server returns results
+and never touches the client's filesystem paths.
+"""
+
+import os
+import threading
+import time
+from multiprocessing.connection import Listener, Client
+
+import numpy as np
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE
+
+
+# =========================
+# CONFIG
+# =========================
+
+# "host:port" or a unix socket path; unset = models live in-process
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS")
+# Shared secret for the connection handshake; required
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY")
+
+_CONNECT_RETRY_SECONDS = 60
+
+_WARMUP_SECONDS = 1
+
+
+def _authkey() -> bytes:
+    if not MODEL_SERVER_AUTHKEY:
+        raise RuntimeError(
+            "MODEL_SERVER_AUTHKEY is not set; the model server exchanges pickled "
+            "payloads and must not run without a shared secret"
+        )
+    return MODEL_SERVER_AUTHKEY.encode()
+
+
+def _parse_address(address: str):
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+# =========================
+# PRELOAD / WARM-UP
+# =========================
+
+def preload_models(stt: bool = True, diarization: bool = True, warmup: bool = True) -> dict:
+    """
+    Loads the models into this process' caches and runs one tiny
+    inference each, so the first real request pays no load cost.
+
+    Returns:
+        seconds spent per model
+    """
+    from src.stt.whisper_engine import STT_BACKEND, _load_model, _transcribe_with
+    from src.diarization.pyannote_diarizer import _load_pipeline
+
+    timings = {}
+    silence = np.zeros(TARGET_SAMPLE_RATE * _WARMUP_SECONDS, dtype=np.float32)
+
+    if stt:
+        start = time.perf_counter()
+        model = _load_model("small", STT_BACKEND)
+        if warmup:
+            _transcribe_with(model, STT_BACKEND, silence)
+        timings["stt"] = round(time.perf_counter() - start, 3)
+
+    if diarization:
+        import torch
+
+        start = time.perf_counter()
+        pipeline = _load_pipeline()
+        if warmup:
+            pipeline({
+                "waveform": torch.from_numpy(silence).unsqueeze(0),
+                "sample_rate": TARGET_SAMPLE_RATE
+            })
+        timings["diarization"] = round(time.perf_counter() - start, 3)
+
+    print(f"Models ready: {timings}")
+    return timings
+
+
+def warm_up():
+    """
+    Startup hook for the web app.
+
+    With a model server configured, waits until it answers; otherwise
+    preloads the models into this process.
+    """
+    if MODEL_SERVER_ADDRESS:
+        get_client().ping()
+        print(f"Model server ready at {MODEL_SERVER_ADDRESS}")
+    else:
+        preload_models()
+
+
+# =========================
+# SERVER
+# =========================
+
+def _handle_connection(conn, handlers: dict, locks: dict):
+    with conn:
+        while True:
+            try:
+                op, kwargs = conn.recv()
+            except EOFError:
+                return
+
+            if op == "ping":
+                conn.send(("ok", None))
+                continue
+
+            try:
+                # one inference per model at a time; STT and diarization overlap
+                with locks[op]:
+                    conn.send(("ok", handlers[op](**kwargs)))
+            except Exception as exc:
+                conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+def _serve_transcribe(audio, model_size: str = "small") -> dict:
+    from src.stt.whisper_engine import transcribe_audio
+
+    return transcribe_audio(None, model_size=model_size, audio=audio)
+
+
+def _serve_diarize(audio) -> list[dict]:
+    from src.diarization.pyannote_diarizer import diarize_audio
+
+    return diarize_audio(None, audio=audio)
+
+
+def serve(address: str = MODEL_SERVER_ADDRESS or "127.0.0.1:6100"):
+    authkey = _authkey()
+
+    preload_models()
+
+    # Only decoded audio crosses the socket; results are saved by the client
+    handlers = {"transcribe": _serve_transcribe, "diarize": _serve_diarize}
+    locks = {op: threading.Lock() for op in handlers}
+
+    with Listener(_parse_address(address), authkey=authkey) as listener:
+        print(f"Model server listening on {address}")
+        while True:
+            conn = listener.accept()
+            threading.Thread(
+                target=_handle_connection,
+                args=(conn, handlers, locks),
+                daemon=True
+            ).start()
+
+
+# =========================
+# CLIENT
+# =========================
+
+class ModelServerClient:
+    """
+    Thread-safe client: one connection per calling thread.
+    """
+
+    def __init__(self, address: str):
+        self.address = _parse_address(address)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            authkey = _authkey()
+            deadline = time.time() + _CONNECT_RETRY_SECONDS
+            while True:
+                try:
+                    conn = Client(self.address, authkey=authkey)
+                    break
+                except (ConnectionRefusedError, FileNotFoundError):
+                    if time.time() > deadline:
+                        raise
+                    time.sleep(1)
+            self._local.conn = conn
+        return conn
+
+    def call(self, op: str, **kwargs):
+        conn = self._connection()
+        try:
+            conn.send((op, kwargs))
+            status, payload = conn.recv()
+        except (EOFError, OSError):
+            self._local.conn = None
+            raise
+
+        if status == "error":
+            raise RuntimeError(f"Model server {op} failed: {payload}")
+        return payload
+
+    def ping(self):
+        self.call("ping")
+
+
+_CLIENT = None
+
+
+def get_client() -> ModelServerClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = ModelServerClient(MODEL_SERVER_ADDRESS)
+    return _CLIENT
+
+
+def _client_audio(audio_path: str, audio):
+    if audio is not None:
+        return audio
+    from src.audio.audio_io import load_audio
+
+    return load_audio(audio_path)
+
+
+def remote_transcribe(
+    audio_path: str,
+    save_text_path: str | None = None,
+    save_json_path: str | None = None,
+    model_size: str = "small",
+    audio=None
+) -> dict:
+    """
+    transcribe_audio on the model server; outputs are saved here.
+    """
+    from src.stt.whisper_engine import _save_result
+
+    result = get_client().call(
+        "transcribe", audio=_client_audio(audio_path, audio), model_size=model_size
+    )
+    _save_result(result, save_text_path, save_json_path)
+    return result
+
+
+def remote_diarize(
+    audio_path: str,
+    save_txt_path: str | None = None,
+    audio=None
+) -> list[dict]:
+    """
+    diarize_audio on the model server; outputs are saved here.
+    """
+    from src.diarization.pyannote_diarizer import save_diarization
+
+    segments = get_client().call("diarize", audio=_client_audio(audio_path, audio))
+    if save_txt_path:
+        save_diarization(segments, save_txt_path)
+    return segments
+
+
+if __name__ == "__main__":
+    serve()
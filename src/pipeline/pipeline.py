@@ -1,9 +1,21 @@
 from src.audio.system_audio_capture import record_audio
-from src.stt.whisper_engine import transcribe_audio
-from src.diarization.pyannote_diarizer import diarize_audio
+from src.stt.whisper_engine import transcribe_audio, _save_result
+from src.stt.streaming import transcribe_live
+from src.diarization.pyannote_diarizer import diarize_audio, save_diarization
 from src.stt.merger import merge_transcript_and_speakers
-from src.summarizer.groq_summarizer import summarize_text
+from src.summarizer.groq_summarizer import summarize_text, stream_summary
+from src.pipeline.artifacts import artifact_paths
+from src.pipeline.model_server import MODEL_SERVER_ADDRESS, remote_transcribe, remote_diarize
+from src.pipeline.metrics import (
+    span, record_stage, observe, DURATION_BUCKETS, RTF_BUCKETS
+)
+from src.audio.audio_io import load_audio, audio_duration, TARGET_SAMPLE_RATE
+from src.audio.vad import detect_speech_regions, compact_speech, remap_segments, remap_turns
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
+import multiprocessing
+import os
+import time
 
 
 DATA_DIR = Path("data")
@@ -12,82 +24,329 @@ AUDIO_PATH = DATA_DIR / "audio" / "sample_audio.wav"
 FINAL_TRANSCRIPT = DATA_DIR / "transcripts" / "final" / "speaker_transcript.txt"
 SUMMARY_PATH = DATA_DIR / "summaries" / "meeting_summary.txt"
 
+# Shared single-run layout (CLI / Streamlit); jobs pass output_dir instead
+_DEFAULT_PATHS = {
+    "whisper_text": DATA_DIR / "transcripts" / "text" / "output.txt",
+    "whisper_json": DATA_DIR / "transcripts" / "json" / "whisper.json",
+    "diarization": DATA_DIR / "diarization" / "diarization.txt",
+    "final_transcript": FINAL_TRANSCRIPT,
+    "summary": SUMMARY_PATH,
+}
 
-def run_pipeline(record_seconds: int = 60):
+# STT and diarization only read the same WAV, so they can overlap.
+#   "thread"  -> both stages in threads of this process (torch releases the GIL)
+#   "process" -> one dedicated worker process per stage
+#   "none"    -> run sequentially
+DEFAULT_CONCURRENCY = os.getenv("PIPELINE_CONCURRENCY", "thread")
 
-    print("Start recording")
-    record_audio(str(AUDIO_PATH), record_seconds)
-    print("end recording")
+# Strip silence before STT / diarization (energy VAD pre-pass)
+DEFAULT_VAD = os.getenv("PIPELINE_VAD", "1") == "1"
 
-    print("Start transcripting")
-    whisper_result = transcribe_audio(
-        audio_path=str(AUDIO_PATH),
-        save_text_path="data/transcripts/text/output.txt",
-        save_json_path="data/transcripts/json/whisper.json"
-    )
-    print("end transcripting")
+# Not worth compacting when almost everything is speech
+_VAD_MAX_SPEECH_RATIO = 0.9
+
+# Executor cache: worker processes keep their models loaded between jobs
+_EXECUTOR_CACHE = {}
+
+
+def _get_executor(mode: str, stage: str):
+    key = (mode, stage)
+    if key not in _EXECUTOR_CACHE:
+        if mode == "thread":
+            _EXECUTOR_CACHE[key] = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"pipeline-{stage}"
+            )
+        elif mode == "process":
+            _EXECUTOR_CACHE[key] = ProcessPoolExecutor(
+                max_workers=1,
+                # fork of a threaded process holding torch state can deadlock
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            raise ValueError(f"Unknown concurrency mode: {mode}")
+    return _EXECUTOR_CACHE[key]
+
+
+def _timed_call(fn, kwargs: dict):
+    """
+    Runs fn(**kwargs) and returns (result, elapsed_seconds).
+    Top-level so it can be shipped to a worker process.
+    """
+    start = time.perf_counter()
+    result = fn(**kwargs)
+    return result, round(time.perf_counter() - start, 3)
+
+
+def _ignore_stage(stage: str, message: str | None = None):
+    pass
+
+
+def _output_paths(audio_path: str, output_dir: str | None) -> dict:
+    if output_dir is None:
+        return dict(_DEFAULT_PATHS)
+    return artifact_paths(output_dir, audio_path)
+
+
+def _speech_only(audio, timings: dict):
+    """
+    VAD pre-pass: returns (speech-only audio, regions) or (audio, None)
+    when there is too little silence to be worth removing.
+    """
+    with span("vad", timings):
+        regions = detect_speech_regions(audio, TARGET_SAMPLE_RATE)
 
-    print("start segmenting")
-    speaker_segments = diarize_audio(
-        audio_path=str(AUDIO_PATH),
-        save_txt_path="data/diarization/diarization.txt"
+    total = len(audio) / TARGET_SAMPLE_RATE
+    speech = sum(end - start for start, end in regions)
+    print(f"VAD: {speech:.1f}s speech of {total:.1f}s audio")
+
+    if not regions or total == 0 or speech / total > _VAD_MAX_SPEECH_RATIO:
+        return audio, None
+
+    return compact_speech(audio, TARGET_SAMPLE_RATE, regions), regions
+
+
+def _transcribe_and_diarize(
+    audio_path: str,
+    paths: dict,
+    concurrency: str,
+    timings: dict,
+    on_stage=_ignore_stage,
+    vad: bool = DEFAULT_VAD
+):
+    stt_kwargs = dict(
+        audio_path=audio_path,
+        save_text_path=str(paths["whisper_text"]),
+        save_json_path=str(paths["whisper_json"])
+    )
+    diarization_kwargs = dict(
+        audio_path=audio_path,
+        save_txt_path=str(paths["diarization"])
     )
-    print("end segmenting")
 
-    print("start merging")
-    final_text = merge_transcript_and_speakers(
-        whisper_result["segments"],   # ✅ KEY FIX
-        speaker_segments,
-        save_path=str(FINAL_TRANSCRIPT)
+    start = time.perf_counter()
+
+    # Shared model server holds the models; otherwise they live in-process
+    stt_fn = remote_transcribe if MODEL_SERVER_ADDRESS else transcribe_audio
+    diarization_fn = remote_diarize if MODEL_SERVER_ADDRESS else diarize_audio
+
+    # Decode once and share the buffer. Worker processes would get a
+    # pickled copy of it, so in "process" mode each stage reads the file
+    # unless VAD shrank the audio.
+    regions = None
+    if concurrency != "process" or vad:
+        with span("decode", timings):
+            audio = load_audio(audio_path)
+        timings["audio_duration"] = round(len(audio) / TARGET_SAMPLE_RATE, 3)
+
+        if vad:
+            audio, regions = _speech_only(audio, timings)
+
+        if concurrency != "process" or regions:
+            stt_kwargs["audio"] = audio
+            diarization_kwargs["audio"] = audio
+
+    if regions:
+        # stage outputs are in compacted time; persisted after remapping
+        stt_kwargs.update(save_text_path=None, save_json_path=None)
+        diarization_kwargs.update(save_txt_path=None)
+
+    if concurrency == "none":
+        on_stage("transcribing")
+        with span("stt", timings):
+            whisper_result = stt_fn(**stt_kwargs)
+
+        on_stage("diarizing")
+        with span("diarization", timings):
+            speaker_segments = diarization_fn(**diarization_kwargs)
+    else:
+        on_stage("transcribing_and_diarizing", "Transcribing & identifying speakers")
+        stt_future = _get_executor(concurrency, "stt").submit(
+            _timed_call, stt_fn, stt_kwargs
+        )
+        diarization_future = _get_executor(concurrency, "diarization").submit(
+            _timed_call, diarization_fn, diarization_kwargs
+        )
+
+        # Merge needs both; wait here. Timed inside the worker, recorded here.
+        whisper_result, stt_seconds = stt_future.result()
+        record_stage("stt", stt_seconds, timings)
+        speaker_segments, diarization_seconds = diarization_future.result()
+        record_stage("diarization", diarization_seconds, timings)
+
+    if regions:
+        whisper_result = dict(
+            whisper_result,
+            segments=remap_segments(whisper_result["segments"], regions)
+        )
+        speaker_segments = remap_turns(speaker_segments, regions)
+
+        _save_result(whisper_result, paths["whisper_text"], paths["whisper_json"])
+        save_diarization(speaker_segments, paths["diarization"])
+
+    record_stage("stt_and_diarization", time.perf_counter() - start, timings)
+
+    return whisper_result, speaker_segments
+
+
+def _summarize_streaming(on_delta, **kwargs) -> str:
+    parts = []
+    for delta in stream_summary(**kwargs):
+        parts.append(delta)
+        on_delta(delta)
+    return "".join(parts).strip()
+
+
+def _merge_and_summarize(
+    whisper_result,
+    speaker_segments,
+    paths: dict,
+    timings: dict,
+    on_stage=_ignore_stage,
+    on_summary_delta=None,
+    segments: list | None = None
+):
+    on_stage("merging")
+    with span("merge", timings):
+        final_text, merged = merge_transcript_and_speakers(
+            whisper_segments=whisper_result["segments"],   # ✅ KEY FIX
+            diarization_segments=speaker_segments,
+            save_path=str(paths["final_transcript"]),
+            return_segments=True
+        )
+    if segments is not None:
+        segments.extend(merged)
+
+    on_stage("summarizing")
+    summary_kwargs = dict(
+        # speaker lines: map-reduce chunks break at turn boundaries
+        transcript_text=final_text,
+        save_path=str(paths["summary"])
     )
-    print("end merging")
+    with span("summarization", timings):
+        if on_summary_delta is None:
+            summary = summarize_text(**summary_kwargs)
+        else:
+            summary = _summarize_streaming(on_summary_delta, **summary_kwargs)
+
+    return final_text, summary
+
+
+def _report_timings(timings: dict, audio_path: str, start: float):
+    """
+    Closes the run: total wall time, audio duration and real-time factor
+    (pipeline seconds per second of audio).
+    """
+    record_stage("total", time.perf_counter() - start, timings)
+
+    if "audio_duration" not in timings:
+        duration = audio_duration(audio_path)
+        if duration is not None:
+            timings["audio_duration"] = round(duration, 3)
+
+    if timings.get("audio_duration"):
+        timings["real_time_factor"] = round(timings["total"] / timings["audio_duration"], 3)
+        observe("audio_duration_seconds", timings["audio_duration"], buckets=DURATION_BUCKETS)
+        observe("pipeline_real_time_factor", timings["real_time_factor"], buckets=RTF_BUCKETS)
 
-    print("start summarization")
-    summary = summarize_text(
-        whisper_result["text"],
-        save_path=str(SUMMARY_PATH)
+    print("Stage timings (s): " + ", ".join(
+        f"{stage}={seconds}" for stage, seconds in timings.items()
+    ))
+
+
+def run_pipeline(
+    record_seconds: int = 60,
+    concurrency: str = DEFAULT_CONCURRENCY,
+    timings: dict | None = None,
+    streaming: bool = False,
+    on_segment=None,
+    source=None
+):
+    """
+    Records system audio, then runs the full pipeline.
+
+    streaming:  transcribe while recording; on_segment(segment) receives
+                partial transcript segments as they are produced
+    source:     audio_sources.AudioSource to record from (default:
+                CAPTURE_SOURCE or the platform's loopback device);
+                FileReplaySource runs the live path from a recording
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    paths = _output_paths(str(AUDIO_PATH), None)
+
+    if streaming:
+        with span("recording_and_stt", timings):
+            whisper_result = transcribe_live(
+                output_path=str(AUDIO_PATH),
+                duration=record_seconds,
+                on_segment=on_segment,
+                source=source,
+                save_text_path=str(paths["whisper_text"]),
+                save_json_path=str(paths["whisper_json"])
+            )
+
+        with span("diarization", timings):
+            speaker_segments = diarize_audio(
+                audio_path=str(AUDIO_PATH),
+                save_txt_path=str(paths["diarization"])
+            )
+    else:
+        with span("recording", timings):
+            record_audio(output_path=str(AUDIO_PATH), duration=record_seconds, source=source)
+
+        whisper_result, speaker_segments = _transcribe_and_diarize(
+            str(AUDIO_PATH), paths, concurrency, timings
+        )
+    final_text, summary = _merge_and_summarize(
+        whisper_result, speaker_segments, paths, timings
     )
-    print("end summarization")
+
+    _report_timings(timings, str(AUDIO_PATH), start)
 
     return final_text, summary
 
 
 
 
-def run_pipeline_from_audio(audio_path: str):
+def run_pipeline_from_audio(
+    audio_path: str,
+    concurrency: str = DEFAULT_CONCURRENCY,
+    timings: dict | None = None,
+    on_stage=_ignore_stage,
+    output_dir: str | None = None,
+    vad: bool = DEFAULT_VAD,
+    on_summary_delta=None,
+    segments: list | None = None
+):
     """
     Pipeline that starts from an existing audio file
     (used by Streamlit / browser capture)
-    """
 
-    print("Start transcripting")
-    whisper_result = transcribe_audio(
-        audio_path=audio_path,
-        save_text_path="data/transcripts/text/output.txt",
-        save_json_path="data/transcripts/json/whisper.json"
-    )
-    print("end transcripting")
+    output_dir:  per-job artifact directory (default: shared data/ paths)
+    concurrency: "thread" | "process" | "none"
+    vad:         drop silence before STT / diarization; timestamps are
+                 mapped back to the original recording
+    on_summary_delta: optional callback(text) receiving the summary as
+                 it streams from the LLM
+    timings:     optional dict, filled with per-stage wall-clock seconds,
+                 audio_duration and real_time_factor
+    segments:    optional list, filled with the speaker-attributed segments
+                 of the final transcript
+    on_stage:    optional progress callback(stage, message=None)
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
 
-    print("start segmenting")
-    speaker_segments = diarize_audio(
-        audio_path=audio_path,
-        save_txt_path="data/diarization/diarization.txt"
+    paths = _output_paths(audio_path, output_dir)
+    whisper_result, speaker_segments = _transcribe_and_diarize(
+        audio_path, paths, concurrency, timings, on_stage, vad
     )
-    print("end segmenting")
-
-    print("start merging")
-    final_text = merge_transcript_and_speakers(
-        whisper_result["segments"],
-        speaker_segments,
-        save_path=str(FINAL_TRANSCRIPT)
+    final_text, summary = _merge_and_summarize(
+        whisper_result, speaker_segments, paths, timings, on_stage,
+        on_summary_delta, segments
     )
-    print("end merging")
 
-    print("start summarization")
-    summary = summarize_text(
-        whisper_result["text"],
-        save_path=str(SUMMARY_PATH)
-    )
-    print("end summarization")
+    _report_timings(timings, audio_path, start)
 
     return final_text, summary
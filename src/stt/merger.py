@@ -1,14 +1,104 @@
 # stt/merger.py
 
+import heapq
 from typing import List, Dict
 from pathlib import Path
 
 
-def _find_speaker(start: float, end: float, diarization_segments: List[Dict]) -> str:
-    for seg in diarization_segments:
-        if max(start, seg["start"]) < min(end, seg["end"]):
-            return seg["speaker"]
-    return "UNKNOWN"
+def _overlap(start: float, end: float, seg: Dict) -> float:
+    return max(0.0, min(end, seg["end"]) - max(start, seg["start"]))
+
+
+def _best_speaker(start: float, end: float, turns: List[Dict]) -> str:
+    """
+    Speaker with the largest total overlap with [start, end].
+    """
+    totals = {}
+    for turn in turns:
+        overlap = _overlap(start, end, turn)
+        if overlap > 0:
+            totals[turn["speaker"]] = totals.get(turn["speaker"], 0.0) + overlap
+
+    if not totals:
+        return "UNKNOWN"
+    return max(totals, key=totals.get)
+
+
+def _split_by_words(w: Dict, turns: List[Dict]) -> List[Dict]:
+    """
+    Splits a segment at speaker changes using Whisper word timestamps.
+    """
+    pieces = []
+    for word in w["words"]:
+        speaker = _best_speaker(word["start"], word["end"], turns)
+        if pieces and pieces[-1]["speaker"] == speaker:
+            pieces[-1]["end"] = word["end"]
+            pieces[-1]["text"] += word["word"]
+        else:
+            pieces.append({
+                "start": word["start"],
+                "end": word["end"],
+                "speaker": speaker,
+                "text": word["word"]
+            })
+
+    for piece in pieces:
+        piece["text"] = piece["text"].strip()
+    return [piece for piece in pieces if piece["text"]]
+
+
+def _assign_speakers(
+    whisper_segments: List[Dict],
+    diarization_segments: List[Dict]
+) -> List[Dict]:
+    """
+    Sweep-line speaker attribution.
+
+    Whisper segments and diarization turns are both visited in start
+    order. A heap keyed by turn end holds the turns that are still open,
+    so each turn is pushed and popped once: O((N + M) log M) instead of
+    scanning every turn for every segment.
+
+    Each segment goes to the speaker with the most overlap. If it spans a
+    speaker change and has word timestamps, it is split per word.
+    """
+    turns = sorted(diarization_segments, key=lambda seg: seg["start"])
+    order = sorted(range(len(whisper_segments)), key=lambda i: whisper_segments[i]["start"])
+
+    assigned = [None] * len(whisper_segments)
+    active = []          # heap of (end, index into turns)
+    next_turn = 0
+
+    for i in order:
+        w = whisper_segments[i]
+        start, end = w["start"], w["end"]
+
+        # open every turn that starts before this segment ends
+        while next_turn < len(turns) and turns[next_turn]["start"] < end:
+            heapq.heappush(active, (turns[next_turn]["end"], next_turn))
+            next_turn += 1
+
+        # close turns that ended before this segment (later ones start later)
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+
+        candidates = [
+            turns[idx] for _, idx in active
+            if _overlap(start, end, turns[idx]) > 0
+        ]
+        speakers = {turn["speaker"] for turn in candidates}
+
+        if len(speakers) > 1 and w.get("words"):
+            assigned[i] = _split_by_words(w, candidates)
+        else:
+            assigned[i] = [{
+                "start": start,
+                "end": end,
+                "speaker": _best_speaker(start, end, candidates),
+                "text": w["text"].strip()
+            }]
+
+    return [piece for pieces in assigned for piece in pieces]
 
 
 def _fill_unknown_speakers(segments: List[Dict]) -> List[Dict]:
@@ -48,13 +138,15 @@ def _format_time(seconds: float) -> str:
 def merge_transcript_and_speakers(
     whisper_segments: List[Dict],
     diarization_segments: List[Dict],
-    save_path: str | None = None
-) -> str:
+    save_path: str | None = None,
+    return_segments: bool = False
+):
     """
     Aligns Whisper transcript segments with diarization output.
 
     Returns:
-        Speaker-attributed transcript (str)
+        Speaker-attributed transcript (str), or (transcript, segments)
+        with return_segments=True, segments = [{"start", "end", "speaker", "text"}]
     """
     # --- HARD VALIDATION ---
     if not whisper_segments:
@@ -68,15 +160,7 @@ def merge_transcript_and_speakers(
         )
 
     # Step 1: assign speaker to each whisper segment
-    merged = []
-    for w in whisper_segments:
-        speaker = _find_speaker(w["start"], w["end"], diarization_segments)
-        merged.append({
-            "start": w["start"],
-            "end": w["end"],
-            "speaker": speaker,
-            "text": w["text"].strip()
-        })
+    merged = _assign_speakers(whisper_segments, diarization_segments)
 
     # Step 2: handle UNKNOWN speakers
     merged = _fill_unknown_speakers(merged)
@@ -101,4 +185,6 @@ def merge_transcript_and_speakers(
         save_path.parent.mkdir(parents=True, exist_ok=True)
         save_path.write_text(final_text, encoding="utf-8")
 
+    if return_segments:
+        return final_text, merged
     return final_text
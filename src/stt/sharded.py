@@ -0,0 +1,179 @@
+# stt/sharded.py
+
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE
+from src.audio.vad import find_quiet_point
+from src.stt import whisper_engine
+
+
+# =========================
+# CONFIG
+# =========================
+
+SHARD_WORKERS = int(os.getenv("STT_SHARD_WORKERS", str(os.cpu_count() or 1)))
+
+MIN_SHARD_SECONDS = 120       # shorter shards waste time on model overhead
+OVERLAP_SECONDS = 1.0         # each shard after the first starts this far before its cut
+CUT_SEARCH_SECONDS = 20.0     # window around the ideal cut to find silence
+
+# Pool cache: workers keep their model loaded between jobs
+_POOL_CACHE = {}
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def _init_worker(model_size: str, backend: str, threads: int):
+    # Split the cores between workers instead of oversubscribing
+    if backend == "openai":
+        import torch
+        torch.set_num_threads(threads)
+    else:
+        whisper_engine.CPU_THREADS = threads
+
+    whisper_engine._load_model(model_size, backend)
+
+
+def _get_pool(max_workers: int, model_size: str, backend: str) -> ProcessPoolExecutor:
+    key = (max_workers, model_size, backend)
+    if key not in _POOL_CACHE:
+        threads = max(1, (os.cpu_count() or 1) // max_workers)
+        _POOL_CACHE[key] = ProcessPoolExecutor(
+            max_workers=max_workers,
+            # fork after torch has started threads can deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, backend, threads)
+        )
+    return _POOL_CACHE[key]
+
+
+def _transcribe_shard(audio: np.ndarray, offset: float, model_size: str, backend: str) -> dict:
+    model = whisper_engine._load_model(model_size, backend)
+    # words are shifted below with their segment
+    result = whisper_engine._transcribe_with(
+        model, backend, audio, word_timestamps=whisper_engine.WORD_TIMESTAMPS
+    )
+
+    for seg in result["segments"]:
+        seg["start"] = round(seg["start"] + offset, 2)
+        seg["end"] = round(seg["end"] + offset, 2)
+        for word in seg.get("words") or []:
+            word["start"] = round(word["start"] + offset, 2)
+            word["end"] = round(word["end"] + offset, 2)
+
+    return result
+
+
+def _max_shards(num_samples: int) -> int:
+    return max(1, int(num_samples / TARGET_SAMPLE_RATE // MIN_SHARD_SECONDS))
+
+
+def plan_shards(audio: np.ndarray, num_shards: int) -> tuple[list[int], list[tuple[int, int]]]:
+    """
+    Picks num_shards - 1 cut points at the quietest frame near each ideal
+    (equal-length) cut. num_shards is capped at one shard per
+    MIN_SHARD_SECONDS of audio, and every cut lies strictly after the
+    previous one.
+
+    Returns:
+        (cuts, shards) where shards[i] = (start_sample, end_sample) and
+        every shard after the first starts OVERLAP_SECONDS before its cut
+    """
+    num_shards = max(1, min(num_shards, _max_shards(len(audio))))
+    search = int(CUT_SEARCH_SECONDS * TARGET_SAMPLE_RATE / 2)
+    overlap = int(OVERLAP_SECONDS * TARGET_SAMPLE_RATE)
+
+    cuts = [0]
+    for k in range(1, num_shards):
+        ideal = len(audio) * k // num_shards
+        cut = find_quiet_point(
+            audio, TARGET_SAMPLE_RATE, max(ideal - search, cuts[-1] + 1), ideal + search
+        )
+        cuts.append(min(max(cut, cuts[-1] + 1), len(audio) - 1))
+    cuts.append(len(audio))
+
+    shards = [
+        (max(0, cuts[i] - overlap) if i else 0, cuts[i + 1])
+        for i in range(num_shards)
+    ]
+    return cuts, shards
+
+
+def _normalized(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _stitch(results: list[dict], cuts: list[int]) -> list[dict]:
+    """
+    Joins shard segments. Segments of a shard whose midpoint falls before
+    its cut belong to the previous shard; an identical line repeated
+    across a cut is kept once.
+    """
+    segments = []
+    for i, result in enumerate(results):
+        cut_time = cuts[i] / TARGET_SAMPLE_RATE
+        for seg in result["segments"]:
+            if i and (seg["start"] + seg["end"]) / 2 < cut_time:
+                continue
+            if segments and _normalized(seg["text"]) == _normalized(segments[-1]["text"]):
+                continue
+            segments.append(seg)
+
+    for i, seg in enumerate(segments):
+        seg["id"] = i
+    return segments
+
+
+def transcribe_sharded(
+    audio: np.ndarray,
+    model_size: str = "small",
+    backend: str = whisper_engine.STT_BACKEND,
+    num_shards: int | None = None,
+    max_workers: int = SHARD_WORKERS
+) -> dict:
+    """
+    Transcribes a long recording on several processes at once.
+
+    The audio is split at silences into num_shards pieces (default: one
+    per worker, each at least MIN_SHARD_SECONDS), transcribed in a
+    process pool whose workers each hold their own cached model, and
+    stitched back with corrected timestamps.
+
+    Returns:
+        Whisper-style result {"text", "segments", "language"}
+    """
+    duration = len(audio) / TARGET_SAMPLE_RATE
+    num_shards = min(num_shards or max_workers, _max_shards(len(audio)))
+
+    if num_shards <= 1:
+        model = whisper_engine._load_model(model_size, backend)
+        return whisper_engine._transcribe_with(model, backend, audio)
+
+    cuts, shards = plan_shards(audio, num_shards)
+    print(f"Transcribing {duration:.0f}s of audio in {num_shards} shards...")
+
+    pool = _get_pool(min(max_workers, num_shards), model_size, backend)
+    futures = [
+        pool.submit(
+            _transcribe_shard,
+            np.ascontiguousarray(audio[start:end]),
+            start / TARGET_SAMPLE_RATE,
+            model_size,
+            backend
+        )
+        for start, end in shards
+    ]
+    results = [future.result() for future in futures]
+
+    segments = _stitch(results, cuts)
+    return {
+        "text": " ".join(seg["text"].strip() for seg in segments),
+        "segments": segments,
+        "language": results[0].get("language")
+    }
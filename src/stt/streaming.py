@@ -0,0 +1,231 @@
+# stt/streaming.py
+
+import os
+import queue
+import threading
+import time
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE, to_mono_float32, resample
+from src.audio.system_audio_capture import CAPTURE_FLUSH_SECONDS, record_audio
+from src.audio.vad import find_quiet_point, is_silent
+from src.stt.whisper_engine import STT_BACKEND, _load_model, _transcribe_with, _save_result
+from src.pipeline.metrics import inc
+
+
+WINDOW_SECONDS = 30.0        # Whisper's native context length
+OVERLAP_SECONDS = 2.0        # re-transcribed context between windows
+CUT_SEARCH_SECONDS = 5.0     # look back this far for a quiet cut point
+
+_PROMPT_CHARS = 200
+
+# Live mode: how far transcription may fall behind capture before the
+# capture writer is made to wait (its ring buffer absorbs the rest)
+LIVE_BACKLOG_SECONDS = float(os.getenv("STT_LIVE_BACKLOG_SECONDS", "60"))
+
+
+def _transcribe_window(model, backend: str, audio: np.ndarray, offset: float, prompt: str) -> list[dict]:
+    result = _transcribe_with(model, backend, audio, initial_prompt=prompt or None)
+
+    segments = []
+    for seg in result["segments"]:
+        text = seg["text"].strip()
+        if not text:
+            continue
+        entry = {
+            "start": round(offset + seg["start"], 2),
+            "end": round(offset + seg["end"], 2),
+            "text": text
+        }
+        if seg.get("words"):
+            entry["words"] = [
+                dict(word, start=round(offset + word["start"], 2), end=round(offset + word["end"], 2))
+                for word in seg["words"]
+            ]
+        segments.append(entry)
+    return segments
+
+
+def stream_transcribe(
+    blocks: Iterable[np.ndarray],
+    sample_rate: int,
+    model_size: str = "small",
+    window_seconds: float = WINDOW_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+    on_segment=None,
+    backend: str = STT_BACKEND
+) -> Iterator[dict]:
+    """
+    Incrementally transcribes a live stream of audio blocks.
+
+    Audio is cut into ~window_seconds windows at the quietest point near
+    the window end, so cuts rarely fall inside a word. Consecutive
+    windows overlap by overlap_seconds; segments already emitted from the
+    overlap are dropped. Silent windows are skipped.
+
+    Yields:
+        {"start": float, "end": float, "text": str}  (absolute seconds)
+    """
+    model = _load_model(model_size, backend)
+
+    window = int(window_seconds * TARGET_SAMPLE_RATE)
+    overlap = int(overlap_seconds * TARGET_SAMPLE_RATE)
+    search = int(CUT_SEARCH_SECONDS * TARGET_SAMPLE_RATE)
+
+    buffer = np.zeros(0, dtype=np.float32)
+    buffer_start = 0.0      # absolute time of buffer[0]
+    committed = 0.0         # everything before this was already emitted
+    prompt = ""
+
+    pending = []            # raw blocks at the capture rate
+    pending_frames = 0
+    needed_frames = int(window_seconds * sample_rate)
+
+    def emit(audio: np.ndarray, offset: float) -> list[dict]:
+        nonlocal prompt
+        if is_silent(audio, TARGET_SAMPLE_RATE):
+            return []
+
+        fresh = [
+            seg for seg in _transcribe_window(model, backend, audio, offset, prompt)
+            if (seg["start"] + seg["end"]) / 2 >= committed
+        ]
+        if fresh:
+            prompt = " ".join(seg["text"] for seg in fresh)[-_PROMPT_CHARS:]
+        return fresh
+
+    def drain_pending():
+        nonlocal buffer, pending, pending_frames
+        if pending:
+            # Resample in bulk: per-block interpolation drifts
+            raw = np.concatenate(pending)
+            buffer = np.concatenate([buffer, resample(raw, sample_rate)])
+            pending = []
+            pending_frames = 0
+
+    for block in blocks:
+        block = to_mono_float32(block)
+        pending.append(block)
+        pending_frames += len(block)
+
+        if pending_frames < needed_frames:
+            continue
+
+        drain_pending()
+
+        while len(buffer) >= window:
+            cut = find_quiet_point(buffer, TARGET_SAMPLE_RATE, window - search, window)
+
+            for seg in emit(buffer[:cut], buffer_start):
+                if on_segment is not None:
+                    on_segment(seg)
+                yield seg
+
+            committed = buffer_start + cut / TARGET_SAMPLE_RATE
+            keep_from = max(0, cut - overlap)
+            buffer_start += keep_from / TARGET_SAMPLE_RATE
+            buffer = buffer[keep_from:]
+
+        needed_frames = int((window - len(buffer)) / TARGET_SAMPLE_RATE * sample_rate)
+
+    # Stream ended: flush the tail
+    drain_pending()
+    if buffer_start + len(buffer) / TARGET_SAMPLE_RATE > committed:
+        for seg in emit(buffer, buffer_start):
+            if on_segment is not None:
+                on_segment(seg)
+            yield seg
+
+
+def transcribe_live(
+    output_path: str,
+    duration: int = 30,
+    model_size: str = "small",
+    on_segment=None,
+    save_text_path: str | None = None,
+    save_json_path: str | None = None,
+    source=None
+) -> dict:
+    """
+    Records system audio and transcribes it while recording.
+
+    source: audio_sources.AudioSource (default: record_audio's choice)
+
+    The WAV is still written to output_path (diarization needs it).
+    When recording stops only the last window is left to transcribe.
+
+    Blocks wait in a queue bounded to LIVE_BACKLOG_SECONDS of audio.
+    When it is full the capture writer blocks, so memory stays constant;
+    if the lag outgrows the capture ring buffer too, capture drops
+    blocks and counts them (see CaptureSession).
+
+    Returns:
+        Whisper-style result {"text": str, "segments": [...]}
+    """
+    block_queue = queue.Queue(maxsize=max(1, int(LIVE_BACKLOG_SECONDS / CAPTURE_FLUSH_SECONDS)))
+    segments = []
+    errors = []
+
+    def worker():
+        first = block_queue.get()
+        if first is None:
+            return
+        first_block, sample_rate = first
+        finished = False
+
+        def blocks():
+            nonlocal finished
+            yield first_block
+            while (item := block_queue.get()) is not None:
+                yield item[0]
+            finished = True
+
+        try:
+            for seg in stream_transcribe(
+                blocks(), sample_rate, model_size, on_segment=on_segment
+            ):
+                segments.append(seg)
+        except Exception as exc:
+            errors.append(exc)
+            # keep draining until the recorder is done
+            while not finished and block_queue.get() is not None:
+                pass
+
+    def enqueue(block, sample_rate):
+        try:
+            block_queue.put_nowait((block, sample_rate))
+        except queue.Full:
+            # transcription is behind: hold the capture writer back
+            start = time.perf_counter()
+            block_queue.put((block, sample_rate))
+            inc("live_stt_backpressure_seconds_total", time.perf_counter() - start)
+
+    thread = threading.Thread(target=worker, name="live-transcriber", daemon=True)
+    thread.start()
+
+    try:
+        record_audio(
+            output_path,
+            duration,
+            on_block=enqueue,
+            resample_to=TARGET_SAMPLE_RATE,
+            source=source
+        )
+    finally:
+        block_queue.put(None)
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    result = {
+        "text": " ".join(seg["text"] for seg in segments),
+        "segments": segments
+    }
+
+    # Optional persistence (pipeline decides)
+    _save_result(result, save_text_path, save_json_path)
+
+    return result
@@ -1,52 +1,121 @@
 # stt/whisper_engine.py
 
-import whisper
 import os
 import json
+import time
 from pathlib import Path
 
+from src.cache.result_cache import audio_hash, array_hash, make_key, cache_get, cache_put
+from src.pipeline.metrics import observe
 
-# Cache model (huge performance win)
-_MODEL_CACHE = {}
 
+# =========================
+# CONFIG
+# =========================
 
-def _load_model(model_size: str):
-    if model_size not in _MODEL_CACHE:
-        print(f"Loading Whisper model [{model_size}]...")
-        _MODEL_CACHE[model_size] = whisper.load_model(model_size)
-    return _MODEL_CACHE[model_size]
+# "openai"  -> openai-whisper (PyTorch)
+# "faster"  -> faster-whisper (CTranslate2, int8 on CPU)
+STT_BACKEND = os.getenv("STT_BACKEND", "openai")
 
+# faster-whisper only
+COMPUTE_TYPE = os.getenv("STT_COMPUTE_TYPE", "int8")
+CPU_THREADS = int(os.getenv("STT_CPU_THREADS", "0"))      # 0 = library default
+BATCH_SIZE = int(os.getenv("STT_BATCH_SIZE", "8"))         # 1 = sequential decoding
 
-def transcribe_audio(
-    audio_path: str,
-    save_text_path: str | None = None,
-    save_json_path: str | None = None,
-    model_size: str = "small"
-) -> str:
-    """
-    Transcribes audio using OpenAI Whisper
+# Per-word timings let the merger split a segment at a speaker change
+WORD_TIMESTAMPS = os.getenv("STT_WORD_TIMESTAMPS", "1") == "1"
 
-    Returns:
-        transcript text (str)
-    """
-
-    audio_path = Path(audio_path)
+# Long recordings: 1 = single call, 0 = auto (one shard per worker), N = N shards
+STT_SHARDS = int(os.getenv("STT_SHARDS", "1"))
 
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
-
-    model = _load_model(model_size)
+# Cache model (huge performance win)
+_MODEL_CACHE = {}
 
-    print("Transcribing audio...")
-    result = model.transcribe(str(audio_path))
 
-    transcript_text = result["text"].strip()
+def _load_model(model_size: str, backend: str = STT_BACKEND):
+    key = (backend, model_size)
+    if key not in _MODEL_CACHE:
+        print(f"Loading Whisper model [{model_size}] ({backend})...")
+        start = time.perf_counter()
+
+        if backend == "openai":
+            import whisper
+            _MODEL_CACHE[key] = whisper.load_model(model_size)
+        elif backend == "faster":
+            try:
+                from faster_whisper import WhisperModel, BatchedInferencePipeline
+            except ImportError:
+                raise ImportError(
+                    "STT_BACKEND=faster requires faster-whisper: pip install faster-whisper"
+                )
+            model = WhisperModel(
+                model_size,
+                device="cpu",
+                compute_type=COMPUTE_TYPE,
+                cpu_threads=CPU_THREADS
+            )
+            _MODEL_CACHE[key] = (
+                BatchedInferencePipeline(model=model) if BATCH_SIZE > 1 else model
+            )
+        else:
+            raise ValueError(f"Unknown STT backend: {backend}")
+
+        observe(
+            "model_load_seconds", time.perf_counter() - start,
+            model=f"whisper-{model_size}", backend=backend
+        )
+
+    return _MODEL_CACHE[key]
+
+
+def _transcribe_with(model, backend: str, audio, **options) -> dict:
+    """
+    Runs a loaded model and returns openai-whisper's result shape:
+    {"text": str, "segments": [{"id", "start", "end", "text", "words", ...}], "language"}
 
-    # Optional persistence (pipeline decides)
+    Word timestamps are requested unless STT_WORD_TIMESTAMPS=0.
+    """
+    options.setdefault("word_timestamps", WORD_TIMESTAMPS)
+
+    if backend == "openai":
+        options.setdefault("fp16", model.device.type != "cpu")
+        return model.transcribe(audio, **options)
+
+    if BATCH_SIZE > 1:
+        options["batch_size"] = BATCH_SIZE
+    segments, info = model.transcribe(audio, **options)
+
+    result_segments = []
+    for i, seg in enumerate(segments):
+        entry = {
+            "id": i,
+            "start": round(seg.start, 2),
+            "end": round(seg.end, 2),
+            "text": seg.text
+        }
+        if seg.words:
+            entry["words"] = [
+                {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                for w in seg.words
+            ]
+        result_segments.append(entry)
+
+    return {
+        "text": "".join(seg["text"] for seg in result_segments),
+        "segments": result_segments,
+        "language": info.language
+    }
+
+
+def _save_result(
+    result: dict,
+    save_text_path: str | None = None,
+    save_json_path: str | None = None
+):
     if save_text_path:
         save_text_path = Path(save_text_path)
         save_text_path.parent.mkdir(parents=True, exist_ok=True)
-        save_text_path.write_text(transcript_text, encoding="utf-8")
+        save_text_path.write_text(result["text"].strip(), encoding="utf-8")
 
     if save_json_path:
         save_json_path = Path(save_json_path)
@@ -54,4 +123,74 @@ def transcribe_audio(
         with open(save_json_path, "w", encoding="utf-8") as f:
             json.dump(result, f, indent=2, ensure_ascii=False)
 
+
+def transcribe_audio(
+    audio_path: str | None,
+    save_text_path: str | None = None,
+    save_json_path: str | None = None,
+    model_size: str = "small",
+    use_cache: bool = True,
+    audio=None,
+    backend: str = STT_BACKEND,
+    shards: int = STT_SHARDS
+) -> str:
+    """
+    Transcribes audio using Whisper
+
+    audio:   optional pre-decoded 16 kHz mono float32 buffer of audio_path
+             (skips Whisper's own ffmpeg decode); audio_path may then
+             be None
+    backend: "openai" or "faster"; both return the same result shape
+    shards:  != 1 splits the audio at silences and transcribes the pieces
+             in a process pool (see src/stt/sharded.py)
+
+    Results are cached by audio content hash + backend + model size.
+
+    Returns:
+        transcript text (str)
+    """
+
+    if audio is None:
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    content = audio_hash(audio_path) if audio is None else array_hash(audio)
+    cache_key = make_key(
+        content,
+        engine=backend,
+        model_size=model_size,
+        compute_type=COMPUTE_TYPE if backend == "faster" else None,
+        shards=shards,
+        word_timestamps=WORD_TIMESTAMPS
+    )
+    cached = cache_get("whisper", cache_key) if use_cache else None
+
+    if cached is not None:
+        print("Transcript cache hit")
+        result = cached
+    elif shards != 1:
+        from src.audio.audio_io import load_audio
+        from src.stt.sharded import transcribe_sharded
+
+        result = transcribe_sharded(
+            load_audio(audio_path) if audio is None else audio,
+            model_size=model_size,
+            backend=backend,
+            num_shards=shards or None
+        )
+    else:
+        model = _load_model(model_size, backend)
+
+        print("Transcribing audio...")
+        result = _transcribe_with(
+            model, backend, str(audio_path) if audio is None else audio
+        )
+
+    if use_cache and cached is None:
+        cache_put("whisper", cache_key, result)
+
+    # Optional persistence (pipeline decides)
+    _save_result(result, save_text_path, save_json_path)
+
     return result
@@ -1,9 +1,13 @@
 # summarizer/groq_summarizer.py
 
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 from dotenv import load_dotenv
-from groq import Groq
+
+from src.cache.result_cache import text_hash, make_key, cache_get, cache_put
 
 load_dotenv()
 
@@ -14,36 +18,95 @@ load_dotenv()
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 _TEMPERATURE = 0.3
 
+# Map-reduce kicks in above this transcript size (estimated tokens)
+MAX_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+# Concurrent chunk requests
+MAX_PARALLEL = int(os.getenv("SUMMARY_PARALLELISM", "4"))
+
+# Rough English average, avoids shipping a tokenizer
+_CHARS_PER_TOKEN = 4
+
+_SYSTEM_PROMPT = "You generate professional meeting summaries."
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
 # Client cache (important)
 _CLIENT = None
 
 
-def _get_client() -> Groq:
+def _get_client():
     global _CLIENT
     if _CLIENT is None:
+        from groq import Groq
+
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise EnvironmentError("GROQ_API_KEY not set in environment variables")
 
-        _CLIENT = Groq(api_key=api_key)
+        # GROQ_BASE_URL points the client at a local stand-in server
+        _CLIENT = Groq(api_key=api_key, base_url=os.getenv("GROQ_BASE_URL"))
     return _CLIENT
 
 
-def summarize_text(
-    transcript_text: str,
-    model: str = DEFAULT_MODEL,
-    save_path: str | None = None
-) -> str:
+def _estimate_tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def _split_transcript(text: str, max_tokens: int) -> list[str]:
     """
-    Generates a professional meeting summary using Groq LLM.
+    Packs the transcript into chunks of at most max_tokens.
+
+    Cuts only between speaker turns (lines of the speaker transcript),
+    falling back to sentence and then word boundaries for oversized turns.
     """
+    units = []
+    for line in text.splitlines() or [text]:
+        line = line.strip()
+        if not line:
+            continue
+        if _estimate_tokens(line) <= max_tokens:
+            units.append(line)
+            continue
+        for sentence in _SENTENCE_END.split(line):
+            if _estimate_tokens(sentence) <= max_tokens:
+                units.append(sentence)
+                continue
+            words = sentence.split()
+            step = max(1, max_tokens * _CHARS_PER_TOKEN // 8)
+            units.extend(" ".join(words[i:i + step]) for i in range(0, len(words), step))
 
-    if not transcript_text.strip():
-        raise ValueError("Transcript text is empty")
+    chunks = []
+    current = []
+    current_tokens = 0
+    for unit in units:
+        tokens = _estimate_tokens(unit)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current = []
+            current_tokens = 0
+        current.append(unit)
+        current_tokens += tokens
 
-    client = _get_client()
+    if current:
+        chunks.append("\n".join(current))
+
+    return chunks
+
+
+def _complete(client, model: str, prompt: str) -> str:
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=_TEMPERATURE
+    )
+    return response.choices[0].message.content.strip()
 
-    prompt = f"""
+
+def _summary_prompt(transcript_text: str) -> str:
+    return f"""
 You are an AI meeting assistant.
 
 Summarize the following meeting transcript clearly and professionally.
@@ -58,21 +121,202 @@ Transcript:
 {transcript_text}
 """
 
-    response = client.chat.completions.create(
+
+def _chunk_prompt(chunk: str, part: int, total: int) -> str:
+    return f"""
+You are an AI meeting assistant.
+
+This is part {part} of {total} of a long meeting transcript.
+Write concise notes for this part only:
+- Key discussion points (bullet points)
+- Decisions or instructions
+- Action items with owners (if any)
+
+Transcript part:
+{chunk}
+"""
+
+
+def _reduce_prompt(notes: str) -> str:
+    return f"""
+You are an AI meeting assistant.
+
+Below are notes taken on consecutive parts of one meeting.
+Merge them into a single summary of the whole meeting, removing repetition.
+
+Provide:
+1. Meeting overview (1–2 lines)
+2. Key discussion points (bullet points)
+3. Decisions or instructions
+4. Action items (if any)
+
+Notes:
+{notes}
+"""
+
+
+def _summarize_chunks(pool, client, model: str, chunks: list[str]) -> list[str]:
+    return list(pool.map(
+        lambda item: _complete(client, model, _chunk_prompt(item[1], item[0], len(chunks))),
+        enumerate(chunks, start=1)
+    ))
+
+
+def _map_notes(client, model: str, transcript_text: str, max_chunk_tokens: int, max_parallel: int) -> str:
+    """
+    Map phase of map-reduce: returns the merged notes of all chunks,
+    condensed until they fit one reduce request.
+    """
+    chunks = _split_transcript(transcript_text, max_chunk_tokens)
+    print(f"Summarizing {len(chunks)} transcript chunks (parallelism={max_parallel})...")
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        # map
+        notes = _summarize_chunks(pool, client, model, chunks)
+
+        # condense level by level until all notes fit one reduce request
+        while len(notes) > 1 and _estimate_tokens("\n\n".join(notes)) > max_chunk_tokens:
+            groups = _split_transcript("\n\n".join(notes), max_chunk_tokens)
+            if len(groups) >= len(notes):
+                break
+            notes = _summarize_chunks(pool, client, model, groups)
+
+    return "\n\n".join(notes)
+
+
+def _stream_complete(client, model: str, prompt: str) -> Iterator[str]:
+    stream = client.chat.completions.create(
         model=model,
         messages=[
-            {"role": "system", "content": "You generate professional meeting summaries."},
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        temperature=_TEMPERATURE
+        temperature=_TEMPERATURE,
+        stream=True
     )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _resolve_mode(transcript_text: str, mode: str, max_chunk_tokens: int) -> str:
+    if mode == "auto":
+        mode = "map_reduce" if _estimate_tokens(transcript_text) > max_chunk_tokens else "single"
+    if mode not in ("single", "map_reduce"):
+        raise ValueError(f"Unknown summarization mode: {mode}")
+    return mode
 
-    summary_text = response.choices[0].message.content.strip()
 
+def _cache_key(transcript_text: str, model: str, mode: str, max_chunk_tokens: int) -> str:
+    return make_key(
+        text_hash(transcript_text),
+        model=model,
+        mode=mode,
+        max_chunk_tokens=max_chunk_tokens if mode == "map_reduce" else None,
+        temperature=_TEMPERATURE,
+        # prompt edits invalidate old summaries
+        prompts=text_hash(_summary_prompt("") + _chunk_prompt("", 0, 0) + _reduce_prompt(""))
+    )
+
+
+def _save_summary(summary_text: str, save_path: str | None):
     # Optional persistence
     if save_path:
         save_path = Path(save_path)
         save_path.parent.mkdir(parents=True, exist_ok=True)
         save_path.write_text(summary_text, encoding="utf-8")
 
+
+def summarize_text(
+    transcript_text: str,
+    model: str = DEFAULT_MODEL,
+    save_path: str | None = None,
+    mode: str = "auto",
+    max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+    max_parallel: int = MAX_PARALLEL,
+    use_cache: bool = True
+) -> str:
+    """
+    Generates a professional meeting summary using Groq LLM.
+
+    mode:
+        "single"     -> whole transcript in one request
+        "map_reduce" -> summarize chunks concurrently, then merge the notes
+        "auto"       -> map_reduce only if the transcript exceeds max_chunk_tokens
+
+    Results are cached by transcript hash + model + prompts + mode.
+    """
+
+    if not transcript_text.strip():
+        raise ValueError("Transcript text is empty")
+
+    mode = _resolve_mode(transcript_text, mode, max_chunk_tokens)
+    cache_key = _cache_key(transcript_text, model, mode, max_chunk_tokens)
+    summary_text = cache_get("summary", cache_key) if use_cache else None
+
+    if summary_text is not None:
+        print("Summary cache hit")
+    else:
+        client = _get_client()
+
+        if mode == "map_reduce":
+            notes = _map_notes(client, model, transcript_text, max_chunk_tokens, max_parallel)
+            summary_text = _complete(client, model, _reduce_prompt(notes))
+        else:
+            summary_text = _complete(client, model, _summary_prompt(transcript_text))
+
+        if use_cache:
+            cache_put("summary", cache_key, summary_text)
+
+    _save_summary(summary_text, save_path)
+
     return summary_text
+
+
+def stream_summary(
+    transcript_text: str,
+    model: str = DEFAULT_MODEL,
+    save_path: str | None = None,
+    mode: str = "auto",
+    max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+    max_parallel: int = MAX_PARALLEL,
+    use_cache: bool = True
+) -> Iterator[str]:
+    """
+    Same as summarize_text(), but yields the summary as token deltas
+    while the model generates it. In map_reduce mode the chunk notes are
+    produced first and the final reduce is streamed.
+
+    A cache hit yields the whole summary at once.
+    """
+
+    if not transcript_text.strip():
+        raise ValueError("Transcript text is empty")
+
+    mode = _resolve_mode(transcript_text, mode, max_chunk_tokens)
+    cache_key = _cache_key(transcript_text, model, mode, max_chunk_tokens)
+    cached = cache_get("summary", cache_key) if use_cache else None
+
+    if cached is not None:
+        print("Summary cache hit")
+        _save_summary(cached, save_path)
+        yield cached
+        return
+
+    client = _get_client()
+
+    if mode == "map_reduce":
+        notes = _map_notes(client, model, transcript_text, max_chunk_tokens, max_parallel)
+        prompt = _reduce_prompt(notes)
+    else:
+        prompt = _summary_prompt(transcript_text)
+
+    parts = []
+    for delta in _stream_complete(client, model, prompt):
+        parts.append(delta)
+        yield delta
+
+    summary_text = "".join(parts).strip()
+    if use_cache:
+        cache_put("summary", cache_key, summary_text)
+    _save_summary(summary_text, save_path)
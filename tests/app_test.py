@@ -0,0 +1,72 @@
+import importlib
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("dotenv")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("MIGRATE_USERS_ON_START", "0")
+    app_module = importlib.import_module("appF")
+    with app_module.app.test_client() as client:
+        with client.session_transaction() as session:
+            session["user"] = "a@example.com"
+        yield client
+
+
+def _read_events(response):
+    """
+    Parses the SSE body chunk by chunk, stopping after "done" / "error".
+    """
+    events, buffer = [], ""
+    for chunk in response.response:
+        buffer += chunk.decode() if isinstance(chunk, bytes) else chunk
+        while "\n\n" in buffer:
+            raw, buffer = buffer.split("\n\n", 1)
+            if raw.startswith(":"):
+                continue        # keep-alive
+            fields = dict(line.split(": ", 1) for line in raw.splitlines())
+            events.append((fields.get("event", "message"), json.loads(fields["data"])))
+            if events[-1][0] in ("done", "error"):
+                return events
+    return events
+
+
+def test_summary_stream_sends_deltas_then_done(client):
+    from services.job_queue import submit_job
+
+    connected = threading.Event()
+    deltas = ["## Meeting ", "Overview\n", "- shipped ", "v2"]
+
+    def job(on_stage, on_output):
+        on_output(deltas[0])
+        # the rest arrives while the client is already reading the stream
+        assert connected.wait(5)
+        for delta in deltas[1:]:
+            on_output(delta)
+        return {"summary": "".join(deltas), "timings": {}}
+
+    job_id = submit_job("a@example.com", job)
+    # the test client returns after the first event
+    response = client.get(f"/jobs/{job_id}/summary/stream")
+    assert response.mimetype == "text/event-stream"
+    connected.set()
+
+    events = _read_events(response)
+    response.close()
+
+    assert events[-1] == ("done", {"summary": "".join(deltas)})
+    streamed = "".join(data["delta"] for event, data in events[:-1])
+    assert streamed == "".join(deltas)
+
+
+def test_summary_stream_requires_owner(client):
+    from services.job_queue import submit_job
+
+    job_id = submit_job("someone@example.com", lambda on_stage, on_output: {"summary": ""})
+
+    assert client.get(f"/jobs/{job_id}/summary/stream").status_code == 404
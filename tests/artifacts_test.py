@@ -0,0 +1,43 @@
+import os
+import time
+
+from src.pipeline.artifacts import (
+    active_job_dir, artifact_paths, cleanup_artifacts, create_job_dir, store_content_addressed
+)
+
+
+def test_uploads_are_named_by_content(tmp_path):
+    names = []
+    for content in (b"meeting one", b"meeting one", b"meeting two"):
+        job_dir = create_job_dir(tmp_path)
+        upload = job_dir / "upload.part"
+        upload.write_bytes(content)
+        names.append(store_content_addressed(upload, ".webm").name)
+
+    assert names[0] == names[1] != names[2]
+    assert names[0].endswith(".webm") and len(names[0]) == 16 + len(".webm")
+
+
+def test_artifact_paths_are_keyed_by_job_dir_and_audio(tmp_path):
+    first = artifact_paths(tmp_path / "job1", "job1/0123abcd.wav")
+    second = artifact_paths(tmp_path / "job2", "job2/0123abcd.wav")
+
+    assert first["summary"] == tmp_path / "job1" / "0123abcd.summary.txt"
+    assert set(first.values()).isdisjoint(second.values())
+    assert len(set(first.values())) == len(first)
+
+
+def test_cleanup_keeps_active_and_recent_job_dirs(tmp_path):
+    old = time.time() - 7200
+    expired = create_job_dir(tmp_path)
+    (expired / ".active").unlink()
+    running = create_job_dir(tmp_path)
+    recent = create_job_dir(tmp_path)
+    with active_job_dir(recent):
+        pass
+    os.utime(expired, (old, old))
+    os.utime(running, (old, old))
+
+    assert cleanup_artifacts(tmp_path, retention_seconds=3600) == 1
+    assert not expired.exists()
+    assert running.exists() and recent.exists()
@@ -0,0 +1,40 @@
+import os
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE, load_audio
+
+
+def _write_wav(path, samples):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(TARGET_SAMPLE_RATE)
+        wav.writeframes(samples.astype("<i2").tobytes())
+
+
+def test_long_audio_is_mapped_without_files_next_to_input(tmp_path):
+    samples = (np.arange(TARGET_SAMPLE_RATE * 3) % 2000 - 1000).astype(np.int16)
+    path = tmp_path / "meeting.wav"
+    _write_wav(path, samples)
+    os.chmod(tmp_path, 0o555)       # read-only input directory
+    try:
+        audio = load_audio(path, mmap_min_seconds=1)
+        assert isinstance(audio, np.memmap)
+        np.testing.assert_allclose(audio, samples / 32768.0, atol=1e-6)
+        assert os.listdir(tmp_path) == ["meeting.wav"]
+    finally:
+        os.chmod(tmp_path, 0o755)
+
+
+def test_short_audio_is_loaded_into_memory(tmp_path):
+    samples = np.full(TARGET_SAMPLE_RATE, 1000, dtype=np.int16)
+    path = tmp_path / "short.wav"
+    _write_wav(path, samples)
+
+    audio = load_audio(path)
+    assert not isinstance(audio, np.memmap)
+    assert audio.dtype == np.float32 and len(audio) == TARGET_SAMPLE_RATE
@@ -0,0 +1,94 @@
+import threading
+
+from auth import auth_service
+
+
+def _use_tmp_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(auth_service, "USER_DB", tmp_path / "users.sqlite3")
+    monkeypatch.setattr(auth_service, "USER_FILE", tmp_path / "users.csv")
+    monkeypatch.setattr(auth_service, "PASSWORD_ITERATIONS", 1000)
+    monkeypatch.setattr(auth_service, "_CACHE", {})
+
+
+def test_register_and_validate(monkeypatch, tmp_path):
+    _use_tmp_store(monkeypatch, tmp_path)
+
+    assert not auth_service.user_exists("a@example.com")
+    assert auth_service.register_user("a@example.com", "secret")
+    assert not auth_service.register_user("a@example.com", "other")
+
+    assert auth_service.user_exists("a@example.com")
+    assert auth_service.validate_user("a@example.com", "secret")
+    assert not auth_service.validate_user("a@example.com", "wrong")
+    assert not auth_service.validate_user("b@example.com", "secret")
+
+
+def test_csv_users_are_migrated_hashed(monkeypatch, tmp_path):
+    _use_tmp_store(monkeypatch, tmp_path)
+    (tmp_path / "users.csv").write_text("email,password\n\nold@example.com,12345\n")
+
+    # nothing is imported implicitly
+    assert not auth_service.user_exists("old@example.com")
+
+    assert auth_service.migrate_csv_users() == 1
+    assert auth_service.validate_user("old@example.com", "12345")
+    assert "12345" not in auth_service._stored_hash("old@example.com")
+
+    # the CSV is left alone; the migration is recorded in the database
+    assert (tmp_path / "users.csv").exists()
+    assert auth_service.migrate_csv_users() == 0
+
+
+def test_csv_migration_runs_once_across_workers(monkeypatch, tmp_path):
+    _use_tmp_store(monkeypatch, tmp_path)
+    (tmp_path / "users.csv").write_text(
+        "email,password\n" + "".join(f"u{i}@example.com,pw{i}\n" for i in range(20))
+    )
+    results, errors = [], []
+
+    def migrate():
+        try:
+            results.append(auth_service.migrate_csv_users())
+        except Exception as exc:
+            errors.append(exc)
+
+    # each thread has its own connection, like separate worker processes
+    threads = [threading.Thread(target=migrate) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert sorted(results) == [0, 0, 0, 20]
+
+
+def test_csv_migration_without_csv(monkeypatch, tmp_path):
+    _use_tmp_store(monkeypatch, tmp_path)
+    assert auth_service.migrate_csv_users() == 0
+
+
+def test_rehash_on_login_after_work_factor_change(monkeypatch, tmp_path):
+    _use_tmp_store(monkeypatch, tmp_path)
+    auth_service.register_user("a@example.com", "secret")
+
+    monkeypatch.setattr(auth_service, "PASSWORD_ITERATIONS", 2000)
+    assert auth_service.validate_user("a@example.com", "secret")
+    assert auth_service._stored_hash("a@example.com").split("$")[1] == "2000"
+
+
+def test_concurrent_signups(monkeypatch, tmp_path):
+    _use_tmp_store(monkeypatch, tmp_path)
+    results = []
+
+    def signup(i):
+        results.append(auth_service.register_user(f"user{i % 10}@example.com", "pw"))
+
+    threads = [threading.Thread(target=signup, args=(i,)) for i in range(40)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count(True) == 10
+    assert all(auth_service.user_exists(f"user{i}@example.com") for i in range(10))
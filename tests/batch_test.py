@@ -0,0 +1,112 @@
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.pipeline import batch
+
+
+def _record(path, status="done", **timings):
+    record = {"path": path, "output_dir": "", "status": status, "timings": timings, "finished_at": 0}
+    if status != "done":
+        record["error"] = "RuntimeError: boom"
+    return record
+
+
+def test_load_checkpoint_keeps_latest_record_and_skips_torn_line(tmp_path):
+    path = tmp_path / batch.CHECKPOINT_NAME
+    path.write_text(
+        json.dumps(_record("/a.wav", "failed")) + "\n"
+        + json.dumps(_record("/a.wav")) + "\n"
+        + json.dumps(_record("/b.wav")) + "\n"
+        + '{"path": "/c.wav", "sta'
+    )
+
+    records = batch.load_checkpoint(path)
+
+    assert set(records) == {"/a.wav", "/b.wav"}
+    assert records["/a.wav"]["status"] == "done"
+    assert batch.load_checkpoint(tmp_path / "missing.jsonl") == {}
+
+
+def test_build_report():
+    records = [
+        _record("/a.wav", audio_duration=60, total=30, stt=20, real_time_factor=0.5),
+        _record("/b.wav", audio_duration=30, total=15, stt=10, real_time_factor=0.5),
+        _record("/c.wav", "failed"),
+    ]
+
+    report = batch.build_report(records, wall_seconds=30, workers=2, skipped=4)
+
+    assert report["files_done"] == 2
+    assert report["files_failed"] == 1
+    assert report["files_skipped"] == 4
+    assert report["audio_seconds"] == 90
+    assert report["throughput"] == 3
+    assert report["mean_real_time_factor"] == 0.5
+    assert report["stage_seconds"] == {"total": 45, "stt": 30}
+    assert report["failed"] == [{"path": "/c.wav", "error": "RuntimeError: boom"}]
+
+
+class _ThreadPool(ThreadPoolExecutor):
+    # in-process stand-in, so the stubbed _process_file is the one called
+    def __init__(self, max_workers, mp_context=None, initializer=None, initargs=()):
+        super().__init__(max_workers)
+
+
+def _stub_processing(monkeypatch, fail=()):
+    pytest.importorskip("numpy")    # run_batch imports the model server config
+    calls = []
+
+    def process_file(audio_path, output_dir, concurrency, vad):
+        calls.append(audio_path)
+        if audio_path.endswith(fail):
+            raise BrokenProcessPool("worker died")
+        record = _record(audio_path, audio_duration=10, total=1, real_time_factor=0.1)
+        record["output_dir"] = output_dir
+        return record
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", _ThreadPool)
+    monkeypatch.setattr(batch, "_process_file", process_file)
+    return calls
+
+
+def test_run_batch_skips_done_and_retries_failed(monkeypatch, tmp_path):
+    recordings = tmp_path / "recordings"
+    recordings.mkdir()
+    for name in ("a", "b", "c"):
+        (recordings / f"{name}.wav").write_bytes(b"")
+    output = tmp_path / "out"
+
+    calls = _stub_processing(monkeypatch, fail=("b.wav",))
+    report = batch.run_batch(str(recordings), str(output), workers=2)
+
+    assert sorted(calls) == sorted(str((recordings / f"{n}.wav").resolve()) for n in "abc")
+    assert report["files_done"] == 2 and report["files_failed"] == 1
+    assert "BrokenProcessPool" in report["failed"][0]["error"]
+    assert json.loads((output / batch.REPORT_NAME).read_text()) == report
+
+    # second run: only the failed file is processed again
+    calls = _stub_processing(monkeypatch)
+    report = batch.run_batch(str(recordings), str(output), workers=2)
+
+    assert calls == [str((recordings / "b.wav").resolve())]
+    assert report["files_skipped"] == 2 and report["files_done"] == 1
+    assert all(r["status"] == "done" for r in batch.load_checkpoint(output / batch.CHECKPOINT_NAME).values())
+
+
+def test_run_batch_fails_fast_when_workers_cannot_start(monkeypatch, tmp_path):
+    pytest.importorskip("numpy")
+    (tmp_path / "a.wav").write_bytes(b"")
+
+    class BrokenPool(_ThreadPool):
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("initializer failed"))
+            return future
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", BrokenPool)
+
+    with pytest.raises(RuntimeError, match="failed to start"):
+        batch.run_batch(str(tmp_path), str(tmp_path / "out"), workers=1)
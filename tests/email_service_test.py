@@ -0,0 +1,96 @@
+import socket
+import time
+
+import pytest
+
+from services import email_service
+
+
+def test_batches_stay_within_one_delivery(monkeypatch):
+    monkeypatch.setattr(email_service, "BATCH_SIZE", 2)
+
+    batches = email_service._batches(
+        {"id": "1", "recipients": ["a@x.com", "b@x.com", "a@x.com", "c@x.com"], "text": "summary"}
+    )
+
+    assert [b["recipients"] for b in batches] == [["a@x.com", "b@x.com"], ["c@x.com"]]
+    assert {b["id"] for b in batches} == {"1"}
+
+
+def test_recipients_are_not_disclosed_to_each_other():
+    assert email_service._build_message(["a@x.com"], "s")["To"] == "a@x.com"
+    assert "a@x.com" not in email_service._build_message(["a@x.com", "b@x.com"], "s")["To"]
+
+
+def test_state_is_tracked_per_delivery(monkeypatch):
+    monkeypatch.setattr(email_service, "_DELIVERIES", {})
+    for delivery_id, recipients in (("1", ["a@x.com", "b@x.com"]), ("2", ["c@x.com"])):
+        email_service._DELIVERIES[delivery_id] = {
+            "recipients": recipients, "state": "queued", "error": None,
+            "pending_batches": 0, "failed": [], "errors": [], "updated_at": 0
+        }
+
+    monkeypatch.setattr(email_service, "BATCH_SIZE", 1)
+    one = email_service._batches({"id": "1", "recipients": ["a@x.com", "b@x.com"], "text": "s"})
+    email_service._DELIVERIES["1"]["pending_batches"] = len(one)
+    email_service._DELIVERIES["2"]["pending_batches"] = 1
+
+    email_service._finish_batch(one[0], error="SMTPDataError: 554")
+    assert email_service.get_delivery("1")["state"] == "queued"
+    email_service._finish_batch(one[1])
+    email_service._finish_batch({"id": "2", "recipients": ["c@x.com"]})
+
+    assert email_service.get_delivery("1")["state"] == "partial"
+    assert "a@x.com" in email_service.get_delivery("1")["error"]
+    assert email_service.get_delivery("2")["state"] == "sent"
+
+
+def _wait_for(delivery_id, states=("sent", "partial", "failed"), timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        delivery = email_service.get_delivery(delivery_id)
+        if delivery["state"] in states:
+            return delivery
+        time.sleep(0.05)
+    raise AssertionError(f"delivery still {delivery['state']}")
+
+
+def test_delivery_through_local_smtp(monkeypatch):
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+
+    class Recorder(Sink):
+        def __init__(self):
+            self.envelopes = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.envelopes.append(envelope)
+            return "250 OK"
+
+    # aiosmtpd connects back to the configured port on start, so no port=0
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    handler = Recorder()
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        monkeypatch.setattr(email_service, "SMTP_SERVER", "127.0.0.1")
+        monkeypatch.setattr(email_service, "SMTP_PORT", port)
+        monkeypatch.setattr(email_service, "SMTP_STARTTLS", False)
+        monkeypatch.setattr(email_service, "SENDER_PASSWORD", None)
+        monkeypatch.setattr(email_service, "SENDER_EMAIL", "bot@example.com")
+
+        first = email_service.send_summary_email(["a@x.com", "b@x.com"], "Summary text", owner="u1")
+        second = email_service.send_summary_email("c@x.com", "Summary text", owner="u2")
+        assert _wait_for(first)["state"] == "sent"
+        assert _wait_for(second)["state"] == "sent"
+
+        # same text, different deliveries: never merged into one message
+        rcpts = sorted(envelope.rcpt_tos for envelope in handler.envelopes)
+        assert rcpts == [["a@x.com", "b@x.com"], ["c@x.com"]]
+        for envelope in handler.envelopes:
+            assert b"c@x.com" not in envelope.content or envelope.rcpt_tos == ["c@x.com"]
+    finally:
+        controller.stop()
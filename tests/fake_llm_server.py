@@ -0,0 +1,125 @@
+"""
+Local stand-in for the Groq chat completions API.
+
+    python -m tests.fake_llm_server --port 8089
+    GROQ_BASE_URL=http://127.0.0.1:8089 GROQ_API_KEY=test python appF.py
+
+Replies are deterministic (derived from the prompt) and can be delayed
+to emulate model latency. Requests with "stream": true get the reply as
+Server-Sent Events chunks, one word at a time.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_summary(prompt: str) -> str:
+    words = prompt.split()
+    return (
+        "## Meeting Overview\n"
+        f"Stand-in summary of a {len(words)}-word prompt.\n\n"
+        "## Key Discussion Points\n"
+        f"* {' '.join(words[-12:])}\n\n"
+        "## Action Items\n"
+        "* None"
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    latency = 0.0
+    token_latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][-1]["content"]
+        time.sleep(self.latency)
+
+        if body.get("stream"):
+            self._stream(body, fake_summary(prompt))
+            return
+
+        payload = json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": fake_summary(prompt)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, body: dict, text: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def chunk(delta: dict, finish_reason):
+            return {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+
+        events = [chunk({"role": "assistant", "content": ""}, None)]
+        events += [chunk({"content": token}, None) for token in re.findall(r"\S+\s*", text)]
+        events.append(chunk({}, "stop"))
+
+        for event in events:
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.token_latency)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_fake_llm_server(port: int = 0, latency: float = 0.0, token_latency: float = 0.0):
+    """
+    Starts the server on a background thread.
+
+    Returns:
+        (server, base_url) - call server.shutdown() when done
+    """
+    handler = type("Handler", (_Handler,), {"latency": latency, "token_latency": token_latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    handler = type("Handler", (_Handler,), {
+        "latency": args.latency,
+        "token_latency": args.token_latency
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"Fake LLM listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,86 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.summarizer import groq_summarizer
+from src.summarizer.groq_summarizer import _estimate_tokens, _split_transcript
+
+TRANSCRIPT = "\n".join(
+    f"[{i // 60:02d}:{i % 60:02d}–{i // 60:02d}:{i % 60 + 1:02d}] SPEAKER_0{i % 3}: "
+    f"Point number {i} about the release plan. We agreed to follow up."
+    for i in range(40)
+)
+
+
+def test_chunks_break_between_speaker_lines():
+    chunks = _split_transcript(TRANSCRIPT, max_tokens=120)
+
+    assert len(chunks) > 1
+    assert "\n".join(chunks).splitlines() == TRANSCRIPT.splitlines()
+    for chunk in chunks:
+        assert _estimate_tokens(chunk) <= 120 + len(chunk.splitlines())
+        assert all("SPEAKER_0" in line for line in chunk.splitlines())
+
+
+def test_oversized_turn_falls_back_to_sentences():
+    turn = "SPEAKER_00: " + " ".join(f"Sentence {i} is here." for i in range(50))
+    chunks = _split_transcript(turn, max_tokens=40)
+
+    assert len(chunks) > 1
+    assert all(chunk.rstrip().endswith(".") for chunk in chunks)
+
+
+def test_map_reduce_against_fake_llm(monkeypatch):
+    pytest.importorskip("groq")
+    from tests.fake_llm_server import start_fake_llm_server
+
+    server, base_url = start_fake_llm_server()
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setenv("GROQ_BASE_URL", base_url)
+    monkeypatch.setattr(groq_summarizer, "_CLIENT", None)
+
+    prompts = []
+    complete = groq_summarizer._complete
+    monkeypatch.setattr(
+        groq_summarizer, "_complete",
+        lambda client, model, prompt: prompts.append(prompt) or complete(client, model, prompt)
+    )
+    try:
+        summary = groq_summarizer.summarize_text(
+            TRANSCRIPT, mode="map_reduce", max_chunk_tokens=300, use_cache=False
+        )
+    finally:
+        server.shutdown()
+
+    chunks = _split_transcript(TRANSCRIPT, 300)
+    assert len(prompts) == len(chunks) + 1
+    assert all("Transcript part:" in prompt for prompt in prompts[:-1])
+    assert "Notes:" in prompts[-1]
+    assert summary.startswith("## Meeting Overview")
+
+
+def test_stream_summary_deltas_match_cached_summary(monkeypatch, tmp_path):
+    pytest.importorskip("groq")
+    from src.cache import result_cache
+    from tests.fake_llm_server import start_fake_llm_server
+
+    server, base_url = start_fake_llm_server()
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setenv("GROQ_BASE_URL", base_url)
+    monkeypatch.setattr(groq_summarizer, "_CLIENT", None)
+    monkeypatch.setattr(result_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(result_cache, "CACHE_ENABLED", True)
+    try:
+        deltas = list(groq_summarizer.stream_summary(TRANSCRIPT, mode="single"))
+    finally:
+        server.shutdown()
+
+    # the server is gone: both are cache hits, the stream yields it at once
+    cached = list(groq_summarizer.stream_summary(TRANSCRIPT, mode="single"))
+    returned = groq_summarizer.summarize_text(TRANSCRIPT, mode="single")
+
+    summary = "".join(deltas).strip()
+    assert len(deltas) > 1
+    assert summary.startswith("## Meeting Overview")
+    assert cached == [summary]
+    assert returned == summary
@@ -0,0 +1,61 @@
+"""
+Import-time benchmark for the web entry point.
+
+    python -m tests.import_time_benchmark [module ...] [--runs N]
+
+Each module is imported in a fresh interpreter. Reports the median
+wall time, the peak RSS and which heavy dependencies were pulled in.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "torch", "whisper", "faster_whisper", "pyannote.audio",
+    "groq", "sounddevice", "soundfile", "reportlab", "numpy"
+]
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            return {"module": module, "error": completed.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    return {
+        "module": module,
+        "seconds": round(statistics.median(s["seconds"] for s in samples), 3),
+        "max_rss_mb": round(max(s["max_rss_mb"] for s in samples), 1),
+        "heavy_imported": samples[-1]["heavy"]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=["appF", "src.pipeline.pipeline"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        print(json.dumps(measure(module, args.runs)))
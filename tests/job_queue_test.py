@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from services import job_queue
+
+
+def _wait_until_finished(job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = job_queue.get_job(job_id)
+        if job["state"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job still {job['state']}")
+
+
+def test_job_moves_through_stages_to_completed():
+    release = threading.Event()
+
+    def work(on_stage, on_output, value):
+        on_stage("transcribing")
+        on_output("partial ")
+        release.wait(5)
+        on_output("text")
+        return value * 2
+
+    job_id = job_queue.submit_job("alice", work, 21)
+    deadline = time.time() + 5
+    while job_queue.get_job(job_id)["stage"] != "transcribing" and time.time() < deadline:
+        time.sleep(0.01)
+
+    job = job_queue.get_job(job_id)
+    assert job["state"] == "processing"
+    assert job_queue.read_output(job_id) == (["partial "], 1, "processing")
+
+    release.set()
+    job = _wait_until_finished(job_id)
+
+    assert job["state"] == "completed" and job["result"] == 42
+    assert [s["stage"] for s in job["stages"]] == ["queued", "transcribing", "completed"]
+    assert job_queue.read_output(job_id, since=1) == (["text"], 2, "completed")
+
+
+def test_failing_job_records_error():
+    def work(on_stage, on_output):
+        raise RuntimeError("WAV conversion failed")
+
+    job = _wait_until_finished(job_queue.submit_job("alice", work))
+
+    assert job["state"] == "failed"
+    assert job["error"] == "WAV conversion failed"
+    assert job["stages"][-1]["stage"] == "failed"
+
+
+def test_queue_rejects_jobs_beyond_the_pending_limit(monkeypatch):
+    monkeypatch.setattr(job_queue, "MAX_PENDING_JOBS", 1)
+    release = threading.Event()
+
+    job_id = job_queue.submit_job("alice", lambda on_stage, on_output: release.wait(5))
+    try:
+        with pytest.raises(job_queue.QueueFullError):
+            job_queue.submit_job("bob", lambda on_stage, on_output: None)
+    finally:
+        release.set()
+    _wait_until_finished(job_id)
+
+    assert job_queue.get_job("unknown") is None
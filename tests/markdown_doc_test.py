@@ -0,0 +1,44 @@
+from utils.markdown_doc import parse_markdown, ensure_title, to_email_text, to_json, to_markup
+
+SUMMARY = """## **Meeting Summary**
+
+**Meeting Overview:**
+The team reviewed *Q3* plans
+and the budget.
+
+1. Key discussion points:
+* **Hiring**: two roles open
+  - backend first
+
+## Action Items
+* **Alice**: send the deck
+"""
+
+
+def test_structure():
+    blocks = parse_markdown(SUMMARY)["blocks"]
+
+    assert [b["type"] for b in blocks] == [
+        "heading", "heading", "paragraph", "heading", "bullet", "bullet", "heading", "action_item"
+    ]
+    assert [b["section"] for b in blocks if b["type"] == "heading"] == [
+        "title", "overview", "discussion", "action_items"
+    ]
+    assert blocks[5]["level"] == 1
+    assert {"text": "Q3", "italic": True} in blocks[2]["spans"]
+
+
+def test_renderers():
+    doc = parse_markdown(SUMMARY)
+
+    assert to_email_text(doc).splitlines()[:4] == [
+        "Meeting Summary", "", "Meeting Overview", "The team reviewed Q3 plans and the budget."
+    ]
+    assert "  - backend first" in to_email_text(doc)
+    assert to_json(doc)["action_items"] == ["Alice: send the deck"]
+    assert to_markup([{"text": "a < b", "bold": True}]) == "<b>a &lt; b</b>"
+
+
+def test_ensure_title():
+    assert ensure_title(SUMMARY) == SUMMARY
+    assert ensure_title("Plain summary").startswith("## **Meeting Summary**")
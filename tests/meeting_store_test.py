@@ -0,0 +1,51 @@
+from services import meeting_store
+
+
+def _segments(*texts):
+    return [
+        {"start": i * 5.0, "end": i * 5.0 + 5, "speaker": f"SPEAKER_0{i % 2}", "text": text}
+        for i, text in enumerate(texts)
+    ]
+
+
+def test_search_is_per_user_and_ranked(monkeypatch, tmp_path):
+    monkeypatch.setattr(meeting_store, "MEETING_DB", tmp_path / "meetings.sqlite3")
+
+    first = meeting_store.save_meeting(
+        "a@example.com", "t", "## Summary\nQuarterly budget review",
+        _segments("hello everyone", "the hiring plan slipped", "budget is fine")
+    )
+    meeting_store.save_meeting(
+        "b@example.com", "t", "Other team", _segments("hiring plan for b")
+    )
+
+    hits = meeting_store.search_meetings("a@example.com", "hiring plan")["results"]
+    assert len(hits) == 1
+    assert hits[0]["meeting_id"] == first
+    assert hits[0]["kind"] == "segment"
+    assert hits[0]["start"] == 5.0
+    assert "[hiring]" in hits[0]["snippet"]
+
+    kinds = {hit["kind"] for hit in meeting_store.search_meetings("a@example.com", "budget")["results"]}
+    assert kinds == {"segment", "summary"}
+
+    # FTS operators in user input are treated as words
+    assert meeting_store.search_meetings("a@example.com", 'budget" OR (')["results"] == []
+
+
+def test_list_and_get(monkeypatch, tmp_path):
+    monkeypatch.setattr(meeting_store, "MEETING_DB", tmp_path / "meetings.sqlite3")
+
+    ids = [
+        meeting_store.save_meeting("a@example.com", f"t{i}", f"s{i}", _segments(f"text {i}"))
+        for i in range(5)
+    ]
+
+    page = meeting_store.list_meetings("a@example.com", page=2, per_page=2)
+    assert page["total"] == 5
+    assert [m["id"] for m in page["meetings"]] == [ids[2], ids[1]]
+
+    meeting = meeting_store.get_meeting("a@example.com", ids[0])
+    assert meeting["transcript"] == "t0"
+    assert meeting["segments"][0]["text"] == "text 0"
+    assert meeting_store.get_meeting("b@example.com", ids[0]) is None
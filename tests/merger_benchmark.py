@@ -0,0 +1,74 @@
+"""
+Speaker attribution benchmark on synthetic multi-hour meetings.
+
+    python -m tests.merger_benchmark [hours ...]
+"""
+
+import random
+import sys
+import time
+
+from src.stt.merger import _assign_speakers, merge_transcript_and_speakers
+
+
+def synthetic_meeting(hours: float, speakers: int = 4, seed: int = 0):
+    rng = random.Random(seed)
+    total = hours * 3600
+
+    whisper_segments = []
+    t = 0.0
+    while t < total:
+        end = t + rng.uniform(2.0, 8.0)
+        whisper_segments.append({"start": round(t, 2), "end": round(end, 2), "text": " words"})
+        t = end + rng.uniform(0.0, 0.5)
+
+    diarization_segments = []
+    t = 0.0
+    while t < total:
+        end = t + rng.uniform(0.5, 20.0)
+        diarization_segments.append({
+            "start": round(t, 2),
+            "end": round(end, 2),
+            "speaker": f"SPEAKER_{rng.randrange(speakers):02d}"
+        })
+        t = end + rng.uniform(0.0, 1.0)
+
+    return whisper_segments, diarization_segments
+
+
+def _linear_assign(whisper_segments, diarization_segments):
+    # Previous approach: first overlapping turn, full scan per segment
+    out = []
+    for w in whisper_segments:
+        speaker = "UNKNOWN"
+        for seg in diarization_segments:
+            if max(w["start"], seg["start"]) < min(w["end"], seg["end"]):
+                speaker = seg["speaker"]
+                break
+        out.append(speaker)
+    return out
+
+
+def _time(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main(hours_list):
+    print(f"{'hours':>6} {'segments':>9} {'turns':>7} {'linear (s)':>11} {'sweep (s)':>10} {'merge (s)':>10}")
+    for hours in hours_list:
+        whisper_segments, diarization_segments = synthetic_meeting(hours)
+
+        linear = _time(_linear_assign, whisper_segments, diarization_segments)
+        sweep = _time(_assign_speakers, whisper_segments, diarization_segments)
+        merge = _time(merge_transcript_and_speakers, whisper_segments, diarization_segments)
+
+        print(
+            f"{hours:>6} {len(whisper_segments):>9} {len(diarization_segments):>7} "
+            f"{linear:>11.3f} {sweep:>10.3f} {merge:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main([float(h) for h in sys.argv[1:]] or [1, 4])
@@ -0,0 +1,44 @@
+from src.stt.merger import _assign_speakers, merge_transcript_and_speakers
+
+
+def test_picks_speaker_with_most_overlap():
+    whisper = [{"start": 0.0, "end": 10.0, "text": " hello"}]
+    turns = [
+        {"start": 0.0, "end": 2.0, "speaker": "A"},
+        {"start": 2.0, "end": 10.0, "speaker": "B"},
+    ]
+    assert _assign_speakers(whisper, turns)[0]["speaker"] == "B"
+
+
+def test_splits_on_words_at_speaker_change():
+    whisper = [{
+        "start": 0.0, "end": 4.0, "text": " hi there yes",
+        "words": [
+            {"word": " hi", "start": 0.0, "end": 0.8},
+            {"word": " there", "start": 0.9, "end": 1.8},
+            {"word": " yes", "start": 2.5, "end": 3.5},
+        ],
+    }]
+    turns = [
+        {"start": 0.0, "end": 2.0, "speaker": "A"},
+        {"start": 2.2, "end": 4.0, "speaker": "B"},
+    ]
+    pieces = _assign_speakers(whisper, turns)
+    assert [(p["speaker"], p["text"]) for p in pieces] == [("A", "hi there"), ("B", "yes")]
+
+
+def test_unsorted_turns_and_unknown_fill():
+    whisper = [
+        {"start": 0.0, "end": 1.0, "text": "first"},
+        {"start": 5.0, "end": 6.0, "text": "second"},
+        {"start": 8.0, "end": 9.0, "text": "gap"},
+    ]
+    turns = [
+        {"start": 4.5, "end": 7.0, "speaker": "B"},
+        {"start": 0.0, "end": 1.5, "speaker": "A"},
+    ]
+    text = merge_transcript_and_speakers(whisper, turns)
+    assert text.splitlines() == [
+        "[00:00–00:01] A: first",
+        "[00:05–00:09] B: second gap",
+    ]
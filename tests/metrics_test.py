@@ -0,0 +1,68 @@
+import pytest
+
+from src.pipeline import metrics
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry(monkeypatch):
+    monkeypatch.setattr(metrics, "_HISTOGRAMS", {})
+    monkeypatch.setattr(metrics, "_COUNTERS", {})
+    monkeypatch.setattr(metrics, "_GAUGES", {})
+
+
+def test_render_histogram_counter_and_gauge():
+    buckets = (1, 5, metrics.math.inf)
+    for value in (0.5, 2, 7):
+        metrics.observe("pipeline_stage_seconds", value, buckets=buckets, stage="stt")
+    metrics.inc("jobs_total", outcome="done")
+    metrics.inc("jobs_total", 2, outcome="done")
+    metrics.register_gauge("job_queue_depth", lambda: 4)
+
+    lines = metrics.render_prometheus().splitlines()
+
+    assert lines == [
+        "# HELP pipeline_stage_seconds Wall-clock time per pipeline stage",
+        "# TYPE pipeline_stage_seconds histogram",
+        'pipeline_stage_seconds_bucket{stage="stt",le="1.0"} 1',
+        'pipeline_stage_seconds_bucket{stage="stt",le="5.0"} 2',
+        'pipeline_stage_seconds_bucket{stage="stt",le="+Inf"} 3',
+        'pipeline_stage_seconds_sum{stage="stt"} 9.5',
+        'pipeline_stage_seconds_count{stage="stt"} 3',
+        "# HELP jobs_total Finished jobs by outcome",
+        "# TYPE jobs_total counter",
+        'jobs_total{outcome="done"} 3',
+        "# HELP job_queue_depth Jobs queued or running",
+        "# TYPE job_queue_depth gauge",
+        "job_queue_depth 4",
+    ]
+
+
+def test_label_values_are_escaped():
+    metrics.inc("stage_errors_total", stage='say "hi"\\n\nnext')
+
+    line = metrics.render_prometheus().splitlines()[-1]
+
+    assert line == 'stage_errors_total{stage="say \\"hi\\"\\\\n\\nnext"} 1'
+
+
+def test_span_and_record_stage_fill_timings():
+    timings = {}
+
+    with metrics.span("merge", timings):
+        pass
+    metrics.record_stage("stt", 1.23456, timings)
+
+    assert set(timings) == {"merge", "stt"}
+    assert timings["stt"] == 1.235
+    assert metrics._HISTOGRAMS[("pipeline_stage_seconds", (("stage", "stt"),))]["count"] == 1
+
+
+def test_failed_span_counts_an_error():
+    timings = {}
+
+    with pytest.raises(ValueError):
+        with metrics.span("pdf", timings):
+            raise ValueError("boom")
+
+    assert timings == {}
+    assert metrics._COUNTERS[("stage_errors_total", (("stage", "pdf"),))] == 1
@@ -0,0 +1,44 @@
+import threading
+from multiprocessing import Pipe
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.pipeline import model_server
+
+
+def test_server_and_client_require_authkey(monkeypatch):
+    monkeypatch.setattr(model_server, "MODEL_SERVER_AUTHKEY", None)
+
+    with pytest.raises(RuntimeError, match="MODEL_SERVER_AUTHKEY"):
+        model_server.serve("127.0.0.1:0")
+    with pytest.raises(RuntimeError, match="MODEL_SERVER_AUTHKEY"):
+        model_server.ModelServerClient("127.0.0.1:0").ping()
+
+
+def test_handlers_take_audio_only():
+    calls = []
+    handlers = {"transcribe": lambda audio: calls.append(audio) or {"text": "hi"}}
+    locks = {"transcribe": threading.Lock()}
+
+    server_end, client_end = Pipe()
+    thread = threading.Thread(
+        target=model_server._handle_connection, args=(server_end, handlers, locks)
+    )
+    thread.start()
+
+    client_end.send(("transcribe", {"audio": [0.0]}))
+    assert client_end.recv() == ("ok", {"text": "hi"})
+
+    # client-chosen output paths are rejected, not written
+    client_end.send(("transcribe", {"audio": [0.0], "save_text_path": "/etc/passwd"}))
+    status, error = client_end.recv()
+    assert status == "error" and "save_text_path" in error
+
+    client_end.send(("shell", {}))
+    assert client_end.recv()[0] == "error"
+
+    client_end.close()
+    thread.join()
+    assert calls == [[0.0]]
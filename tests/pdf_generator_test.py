@@ -0,0 +1,87 @@
+import re
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from utils import pdf_generator
+
+
+SUMMARY = "# Title\n\n## Decisions\n- Ship **v2** on Friday\n  - after QA\n\nPlain paragraph."
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(pdf_generator, "_PDF_CACHE", OrderedDict())
+    monkeypatch.setattr(pdf_generator, "_PDF_CACHE_BYTES", 0)
+
+
+def _page_count(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+
+
+def test_summary_is_served_from_cache(monkeypatch):
+    first = pdf_generator.generate_summary_pdf(SUMMARY).getvalue()
+    assert first.startswith(b"%PDF")
+
+    def no_render(*args):
+        raise AssertionError("rendered again")
+
+    monkeypatch.setattr(pdf_generator, "_summary_flowables", no_render)
+    second = pdf_generator.generate_summary_pdf(SUMMARY).getvalue()
+
+    assert second == first
+    assert len(pdf_generator._PDF_CACHE) == 1
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    size = len(pdf_generator.generate_summary_pdf("a").getvalue())
+    pdf_generator._PDF_CACHE.clear()
+    pdf_generator._PDF_CACHE_BYTES = 0
+    monkeypatch.setattr(pdf_generator, "PDF_CACHE_MAX_BYTES", int(size * 2.5))
+
+    keys = {text: pdf_generator._cache_key("summary", text) for text in "abc"}
+    pdf_generator.generate_summary_pdf("a")
+    pdf_generator.generate_summary_pdf("b")
+    pdf_generator.generate_summary_pdf("a")     # a is now the most recent
+    pdf_generator.generate_summary_pdf("c")
+
+    assert list(pdf_generator._PDF_CACHE) == [keys["a"], keys["c"]]
+    assert pdf_generator._PDF_CACHE_BYTES <= pdf_generator.PDF_CACHE_MAX_BYTES
+
+    # larger than the whole cache: rendered, not stored
+    monkeypatch.setattr(pdf_generator, "PDF_CACHE_MAX_BYTES", 10)
+    pdf_generator.generate_summary_pdf("d")
+    assert keys["a"] in pdf_generator._PDF_CACHE and len(pdf_generator._PDF_CACHE) == 2
+
+
+def test_report_spans_pages_and_splits_tall_blocks(capsys):
+    long_turn = " ".join(["word"] * 3000)      # taller than one A4 page
+    segments = iter(
+        [{"start": 0.0, "speaker": "SPEAKER_00", "text": long_turn}]
+        + [
+            {"start": i * 7.5, "speaker": f"SPEAKER_0{i % 3}", "text": f"turn {i} <&> done"}
+            for i in range(1, 400)
+        ]
+    )
+
+    pdf = pdf_generator.generate_report_pdf(SUMMARY, segments).getvalue()
+
+    assert pdf.startswith(b"%PDF")
+    assert _page_count(pdf) >= 4
+    assert "dropping" not in capsys.readouterr().out
+    # no report_id: not cached
+    assert not pdf_generator._PDF_CACHE
+
+
+def test_report_cache_is_keyed_by_report_id():
+    segments = [{"start": 0.0, "speaker": "SPEAKER_00", "text": "hello"}]
+
+    first = pdf_generator.generate_report_pdf(SUMMARY, segments, report_id="m1").getvalue()
+    again = pdf_generator.generate_report_pdf(SUMMARY, iter(()), report_id="m1").getvalue()
+    other = pdf_generator.generate_report_pdf(SUMMARY, segments, report_id="m2").getvalue()
+
+    assert again == first
+    assert len(pdf_generator._PDF_CACHE) == 2
+    assert _page_count(other) == 1
@@ -0,0 +1,294 @@
+"""
+Offline end-to-end pipeline benchmark on synthetic meetings.
+
+    python -m tests.pipeline_benchmark [minutes ...] [--models stub|real]
+        [--concurrency thread|process|none] [--no-vad] [--stub-rtf 0.05]
+        [--llm-latency 0.2] [--output results.jsonl]
+
+Each length gets a generated multi-speaker WAV (speech-like voiced
+turns separated by pauses and occasional long silences) and one run of
+run_pipeline_from_audio in a fresh interpreter, with summaries served by
+tests.fake_llm_server. "stub" models return deterministic transcripts
+and speaker turns (optionally sleeping stub-rtf seconds per second of
+audio); "real" uses Whisper / pyannote (needs HF_TOKEN).
+
+Prints one JSON object per run: per-stage wall time, real-time factor
+and peak RSS of the run and of its child processes.
+"""
+
+import argparse
+import functools
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE, audio_duration
+
+
+# =========================
+# SYNTHETIC AUDIO
+# =========================
+
+def _pcm16(signal: np.ndarray) -> bytes:
+    return (np.clip(signal, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def _noise(rng, samples: int) -> np.ndarray:
+    return rng.normal(0.0, 0.002, samples)
+
+
+def _voice(rng, samples: int, pitch: float, sample_rate: int) -> np.ndarray:
+    t = np.arange(samples) / sample_rate
+    # slow intonation around the speaker's pitch, a few harmonics
+    f0 = pitch * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 5))
+    # syllable-rate envelope, so VAD frames see gaps inside a turn too
+    syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t), 0, None)
+    return 0.2 * voiced * syllables + _noise(rng, samples)
+
+
+def synthetic_meeting_wav(
+    path: str,
+    seconds: float,
+    speakers: int = 3,
+    seed: int = 0,
+    sample_rate: int = TARGET_SAMPLE_RATE
+) -> list[dict]:
+    """
+    Writes a 16-bit mono WAV of alternating speaker turns. Written turn by
+    turn, so 3-hour files never sit in memory.
+
+    Returns:
+        ground-truth turns [{"start", "end", "speaker"}]
+    """
+    rng = np.random.default_rng(seed)
+    pitches = [100 + 45 * i for i in range(speakers)]
+    total = int(seconds * sample_rate)
+    written = 0
+    turns = []
+
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+
+        while written < total:
+            # mostly short pauses, sometimes a long silence
+            gap = rng.uniform(5.0, 30.0) if rng.random() < 0.1 else rng.uniform(0.2, 1.5)
+            samples = min(int(gap * sample_rate), total - written)
+            wav.writeframes(_pcm16(_noise(rng, samples)))
+            written += samples
+
+            samples = min(int(rng.uniform(2.0, 20.0) * sample_rate), total - written)
+            if samples <= 0:
+                break
+            speaker = int(rng.integers(speakers))
+            wav.writeframes(_pcm16(_voice(rng, samples, pitches[speaker], sample_rate)))
+            turns.append({
+                "start": round(written / sample_rate, 2),
+                "end": round((written + samples) / sample_rate, 2),
+                "speaker": f"SPEAKER_{speaker:02d}"
+            })
+            written += samples
+
+    return turns
+
+
+# =========================
+# STUB MODELS
+# =========================
+
+_STUB_WORDS = "budget roadmap release hiring design review customer latency deadline".split()
+
+
+def _duration(audio_path: str, audio) -> float:
+    if audio is not None:
+        return len(audio) / TARGET_SAMPLE_RATE
+    return audio_duration(audio_path) or 0.0
+
+
+def stub_transcribe(
+    audio_path: str,
+    save_text_path: str | None = None,
+    save_json_path: str | None = None,
+    audio=None,
+    rtf: float = 0.0,
+    **_
+) -> dict:
+    from src.stt.whisper_engine import _save_result
+
+    duration = _duration(audio_path, audio)
+    time.sleep(duration * rtf)
+
+    segments = []
+    for i, start in enumerate(np.arange(0.0, duration, 4.0)):
+        words = [_STUB_WORDS[(i + k) % len(_STUB_WORDS)] for k in range(10)]
+        segments.append({
+            "id": i,
+            "start": round(float(start), 2),
+            "end": round(min(float(start) + 4.0, duration), 2),
+            "text": " " + " ".join(words) + "."
+        })
+
+    result = {
+        "text": "".join(seg["text"] for seg in segments),
+        "segments": segments,
+        "language": "en"
+    }
+    _save_result(result, save_text_path, save_json_path)
+    return result
+
+
+def stub_diarize(
+    audio_path: str,
+    save_txt_path: str | None = None,
+    audio=None,
+    rtf: float = 0.0,
+    **_
+) -> list[dict]:
+    from src.diarization.pyannote_diarizer import save_diarization
+
+    duration = _duration(audio_path, audio)
+    time.sleep(duration * rtf)
+
+    segments = [
+        {
+            "start": round(float(start), 2),
+            "end": round(min(float(start) + 15.0, duration), 2),
+            "speaker": f"SPEAKER_{i % 3:02d}"
+        }
+        for i, start in enumerate(np.arange(0.0, duration, 15.0))
+    ]
+    if save_txt_path:
+        save_diarization(segments, save_txt_path)
+    return segments
+
+
+# =========================
+# RUNS
+# =========================
+
+def _max_rss_mb(who) -> float:
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def run_once(audio_path: str, models: str, concurrency: str, vad: bool,
+             stub_rtf: float, llm_latency: float) -> dict:
+    """
+    One pipeline run in this process; meant to be the only work a fresh
+    interpreter does, so its peak RSS belongs to the run.
+    """
+    from tests.fake_llm_server import start_fake_llm_server
+
+    server, base_url = start_fake_llm_server(latency=llm_latency)
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+    from src.pipeline import pipeline
+
+    if models == "stub":
+        pipeline.transcribe_audio = functools.partial(stub_transcribe, rtf=stub_rtf)
+        pipeline.diarize_audio = functools.partial(stub_diarize, rtf=stub_rtf)
+
+    timings = {}
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            pipeline.run_pipeline_from_audio(
+                audio_path,
+                concurrency=concurrency,
+                timings=timings,
+                output_dir=output_dir,
+                vad=vad
+            )
+    finally:
+        server.shutdown()
+        # RUSAGE_CHILDREN only counts children that have been reaped:
+        # stop the cached stage workers (process mode) first
+        for executor in pipeline._EXECUTOR_CACHE.values():
+            executor.shutdown(wait=True)
+        pipeline._EXECUTOR_CACHE.clear()
+
+    return {
+        "audio_seconds": timings.get("audio_duration"),
+        "models": models,
+        "concurrency": concurrency,
+        "vad": vad,
+        "real_time_factor": timings.get("real_time_factor"),
+        "timings": timings,
+        "max_rss_mb": _max_rss_mb(resource.RUSAGE_SELF),
+        "children_max_rss_mb": _max_rss_mb(resource.RUSAGE_CHILDREN)
+    }
+
+
+def benchmark(minutes: float, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_path = Path(tmp) / f"meeting_{minutes:g}min.wav"
+
+        start = time.perf_counter()
+        synthetic_meeting_wav(audio_path, minutes * 60, speakers=args.speakers, seed=args.seed)
+        generate_seconds = round(time.perf_counter() - start, 3)
+
+        command = [
+            sys.executable, "-m", "tests.pipeline_benchmark",
+            "--run-one", str(audio_path),
+            "--models", args.models,
+            "--concurrency", args.concurrency,
+            "--stub-rtf", str(args.stub_rtf),
+            "--llm-latency", str(args.llm_latency)
+        ]
+        if args.no_vad:
+            command.append("--no-vad")
+
+        completed = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            # cached results would turn the rerun into a cache benchmark
+            env=dict(os.environ, RESULT_CACHE="0")
+        )
+
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines() or [f"exit code {completed.returncode}"]
+        return {"minutes": minutes, "error": lines[-1]}
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {"minutes": minutes, "generate_seconds": generate_seconds, **result}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("minutes", nargs="*", type=float, default=[1, 10, 60])
+    parser.add_argument("--models", choices=["stub", "real"], default="stub")
+    parser.add_argument("--concurrency", choices=["thread", "process", "none"], default="thread")
+    parser.add_argument("--no-vad", action="store_true")
+    parser.add_argument("--stub-rtf", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--speakers", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="append results as JSON lines")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_once(
+            args.run_one, args.models, args.concurrency,
+            not args.no_vad, args.stub_rtf, args.llm_latency
+        )))
+        sys.exit(0)
+
+    for minutes in args.minutes:
+        line = json.dumps(benchmark(minutes, args))
+        print(line)
+        if args.output:
+            with open(args.output, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
@@ -1,3 +1,23 @@
+import os
+import tempfile
+
+from src.audio.audio_sources import FileReplaySource
 from src.pipeline.pipeline import run_pipeline
 
-run_pipeline(10)
+# PIPELINE_TEST_REPLAY=<audio file> | synthetic replays audio instead of
+# capturing system audio (headless hosts); CAPTURE_REPLAY_SPEED sets the pace
+RECORD_SECONDS = 10
+
+replay = os.getenv("PIPELINE_TEST_REPLAY")
+source = None
+
+if replay == "synthetic":
+    from tests.pipeline_benchmark import synthetic_meeting_wav
+
+    replay = os.path.join(tempfile.mkdtemp(), "synthetic_meeting.wav")
+    synthetic_meeting_wav(replay, RECORD_SECONDS)
+
+if replay:
+    source = FileReplaySource(replay)
+
+run_pipeline(RECORD_SECONDS, source=source, streaming=os.getenv("PIPELINE_TEST_STREAMING") == "1")
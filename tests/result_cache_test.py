@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from src.cache import result_cache
+
+
+@pytest.fixture(autouse=True)
+def _tmp_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(result_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(result_cache, "CACHE_ENABLED", True)
+    monkeypatch.setattr(result_cache, "_cache_bytes", None)
+    monkeypatch.setattr(result_cache, "_puts_since_scan", 0)
+
+
+def _entries():
+    return sorted(p.stem for p in result_cache.CACHE_DIR.rglob("*.json"))
+
+
+def test_key_covers_content_and_params():
+    key = result_cache.make_key("abc", model="small", language="en")
+
+    assert key == result_cache.make_key("abc", language="en", model="small")
+    assert key != result_cache.make_key("abd", model="small", language="en")
+    assert key != result_cache.make_key("abc", model="medium", language="en")
+    assert result_cache.text_hash("x") != result_cache.text_hash("y")
+
+
+def test_put_get_round_trip():
+    assert result_cache.cache_get("stt", "k") is None
+
+    value = {"segments": [{"start": 0.0, "end": 1.5, "text": "héllo"}]}
+    result_cache.cache_put("stt", "k", value)
+
+    assert result_cache.cache_get("stt", "k") == value
+    assert result_cache.cache_get("diarization", "k") is None
+
+
+def test_failed_put_is_dropped_without_temp_files():
+    result_cache.cache_put("stt", "k", {"not json": {1, 2}})
+
+    assert result_cache.cache_get("stt", "k") is None
+    assert not list(result_cache.CACHE_DIR.rglob("*.tmp"))
+
+
+def test_get_refreshes_recency(monkeypatch):
+    monkeypatch.setattr(result_cache, "CACHE_MAX_BYTES", 10 ** 6)
+    for i, key in enumerate(("old", "new")):
+        result_cache.cache_put("stt", key, "x" * 100)
+        os.utime(result_cache._entry_path("stt", key), (1000 + i, 1000 + i))
+
+    result_cache.cache_get("stt", "old")
+
+    # room for one entry: the least recently *used* one goes
+    monkeypatch.setattr(result_cache, "CACHE_MAX_BYTES", 150)
+    result_cache._evict()
+    assert _entries() == ["old"]
+
+
+def test_eviction_keeps_cache_under_limit(monkeypatch):
+    monkeypatch.setattr(result_cache, "CACHE_MAX_BYTES", 1000)
+
+    for i in range(30):
+        result_cache.cache_put("stt", f"k{i:02d}", "x" * 98)     # 100 bytes as JSON
+        os.utime(result_cache._entry_path("stt", f"k{i:02d}"), (1000 + i, 1000 + i))
+
+    entries = _entries()
+    assert sum(p.stat().st_size for p in result_cache.CACHE_DIR.rglob("*.json")) <= 1000
+    # oldest evicted first
+    assert entries == [f"k{i:02d}" for i in range(30 - len(entries), 30)]
+
+
+def test_puts_do_not_scan_below_limit(monkeypatch):
+    monkeypatch.setattr(result_cache, "CACHE_MAX_BYTES", 10 ** 6)
+    scans = []
+    evict = result_cache._evict
+    monkeypatch.setattr(result_cache, "_evict", lambda: (scans.append(1), evict()))
+
+    for i in range(50):
+        result_cache.cache_put("stt", f"k{i}", "x")
+
+    assert len(scans) == 1      # the first put, to learn the size
+
+
+def test_audio_hash_cache_is_bounded(monkeypatch, tmp_path):
+    monkeypatch.setattr(result_cache, "_HASH_CACHE", type(result_cache._HASH_CACHE)())
+    monkeypatch.setattr(result_cache, "_HASH_CACHE_SIZE", 3)
+
+    digests = []
+    for i in range(5):
+        path = tmp_path / f"{i}.wav"
+        path.write_bytes(bytes([i]) * 10)
+        digests.append(result_cache.audio_hash(str(path)))
+
+    assert len(set(digests)) == 5
+    assert len(result_cache._HASH_CACHE) == 3
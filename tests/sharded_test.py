@@ -0,0 +1,64 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.audio.audio_io import TARGET_SAMPLE_RATE
+from src.stt import sharded
+
+
+def _noise(seconds, quiet_at=None):
+    audio = np.random.default_rng(0).standard_normal(int(seconds * TARGET_SAMPLE_RATE)).astype(np.float32)
+    if quiet_at is not None:
+        start = int(quiet_at * TARGET_SAMPLE_RATE)
+        audio[start:start + TARGET_SAMPLE_RATE // 2] = 0
+    return audio
+
+
+def test_cuts_strictly_increase_when_search_windows_overlap(monkeypatch):
+    monkeypatch.setattr(sharded, "MIN_SHARD_SECONDS", 1)
+    # one silence inside every search window: all cuts would pick it
+    audio = _noise(10, quiet_at=5)
+
+    cuts, shards = sharded.plan_shards(audio, 8)
+
+    assert len(cuts) == 9
+    assert all(b > a for a, b in zip(cuts, cuts[1:]))
+    assert all(end > start for start, end in shards)
+
+
+def test_explicit_shard_count_is_capped_by_min_shard_length():
+    audio = _noise(5)
+    cuts, shards = sharded.plan_shards(audio, 4)
+    assert cuts == [0, len(audio)] and shards == [(0, len(audio))]
+
+    audio = _noise(3 * sharded.MIN_SHARD_SECONDS + 10)
+    cuts, _ = sharded.plan_shards(audio, 50)
+    assert len(cuts) == 4
+
+
+def test_cut_lands_in_silence_near_ideal_point(monkeypatch):
+    monkeypatch.setattr(sharded, "MIN_SHARD_SECONDS", 10)
+    audio = _noise(60, quiet_at=33)
+    cuts, shards = sharded.plan_shards(audio, 2)
+
+    assert 33 * TARGET_SAMPLE_RATE <= cuts[1] <= 33.5 * TARGET_SAMPLE_RATE
+    assert shards[1][0] == cuts[1] - int(sharded.OVERLAP_SECONDS * TARGET_SAMPLE_RATE)
+
+
+def test_stitch_drops_overlap_duplicates():
+    cut = 10 * TARGET_SAMPLE_RATE
+    first = {"segments": [
+        {"start": 0.0, "end": 4.0, "text": " Hello everyone."},
+        {"start": 4.0, "end": 9.8, "text": " Let's start."},
+    ]}
+    second = {"segments": [
+        # re-transcribed overlap before the cut, with different casing
+        {"start": 9.0, "end": 9.9, "text": " let's start"},
+        {"start": 9.6, "end": 10.6, "text": " Let's start!"},
+        {"start": 10.6, "end": 14.0, "text": " First item."},
+    ]}
+
+    segments = sharded._stitch([first, second], [0, cut, 20 * TARGET_SAMPLE_RATE])
+
+    assert [seg["text"].strip() for seg in segments] == ["Hello everyone.", "Let's start.", "First item."]
+    assert [seg["id"] for seg in segments] == [0, 1, 2]
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.audio.stream_decoder import StreamingDecoder
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake ffmpeg is a shell script")
+
+
+def _fake_ffmpeg(monkeypatch, tmp_path, body):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_pcm_is_written_as_it_arrives(monkeypatch, tmp_path):
+    # "decodes" by passing stdin through unchanged
+    _fake_ffmpeg(monkeypatch, tmp_path, "exec cat")
+    decoder = StreamingDecoder(tmp_path / "job" / "stream.wav")
+
+    decoder.feed(b"\x01\x00" * 8000)
+    decoder.feed(b"\x02\x00" * 8000)
+    wav_path = decoder.finish(timeout=10)
+
+    assert decoder.frames == 16000
+    assert wav_path.stat().st_size == 44 + 32000
+
+
+def test_failed_decode_raises_and_removes_partial_wav(monkeypatch, tmp_path):
+    _fake_ffmpeg(monkeypatch, tmp_path, "cat > /dev/null; echo 'Invalid data found' >&2; exit 1")
+    decoder = StreamingDecoder(tmp_path / "job" / "stream.wav")
+    decoder.feed(b"not webm")
+
+    with pytest.raises(RuntimeError, match="Invalid data found"):
+        decoder.finish(timeout=10)
+    assert not (tmp_path / "job" / "stream.wav").exists()
+
+
+def test_timeout_kills_ffmpeg(monkeypatch, tmp_path):
+    _fake_ffmpeg(monkeypatch, tmp_path, "exec sleep 60")
+    decoder = StreamingDecoder(tmp_path / "job" / "stream.wav")
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="timed out"):
+        decoder.finish(timeout=0.5)
+
+    assert time.monotonic() - started < 10
+    assert decoder._process.returncode is not None
+    assert not (tmp_path / "job" / "stream.wav").exists()
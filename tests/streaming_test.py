@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.stt import streaming
+
+
+def test_live_queue_is_bounded_and_loses_nothing(monkeypatch):
+    monkeypatch.setattr(streaming, "LIVE_BACKLOG_SECONDS", 2 * streaming.CAPTURE_FLUSH_SECONDS)
+    waits = []
+    monkeypatch.setattr(streaming, "inc", lambda name, amount=1, **labels: waits.append(amount))
+
+    def fake_record_audio(output_path, duration, on_block=None, **kwargs):
+        for i in range(20):
+            on_block(np.full(160, i, dtype=np.float32), 16000)
+
+    def slow_transcribe(blocks, sample_rate, model_size, on_segment=None):
+        for block in blocks:
+            time.sleep(0.01)
+            yield {"start": 0.0, "end": 0.01, "text": str(int(block[0]))}
+
+    monkeypatch.setattr(streaming, "record_audio", fake_record_audio)
+    monkeypatch.setattr(streaming, "stream_transcribe", slow_transcribe)
+
+    result = streaming.transcribe_live("unused.wav")
+
+    assert [seg["text"] for seg in result["segments"]] == [str(i) for i in range(20)]
+    assert waits            # the producer had to wait for the slow consumer
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.audio.audio_io import resample
+from src.audio.system_audio_capture import CaptureSession, _StreamResampler
+
+
+def _feed(session, audio, blocksize=1024):
+    for i in range(0, len(audio), blocksize):
+        block = audio[i:i + blocksize]
+        session.callback(block, len(block), None, None)
+
+
+def test_capture_writes_every_frame_in_order():
+    rate = 8000
+    audio = np.arange(rate * 3, dtype=np.float32)[:, None] / (rate * 3)
+    written = []
+
+    session = CaptureSession(
+        rate, lambda block: written.append(block.copy()),
+        duration=2.5, buffer_seconds=4, flush_seconds=0.1
+    )
+    _feed(session, audio)
+    assert session.wait(timeout=5)
+    session.close()
+
+    out = np.concatenate(written)
+    assert len(out) == int(2.5 * rate)
+    np.testing.assert_array_equal(out, audio[:len(out)])
+
+
+def test_full_ring_drops_blocks_instead_of_growing():
+    rate = 8000
+    release = threading.Event()
+    written = []
+
+    def slow_write(block):
+        release.wait()
+        written.append(block.copy())
+
+    session = CaptureSession(rate, slow_write, buffer_seconds=0.5, flush_seconds=0.1)
+    _feed(session, np.zeros((rate * 2, 1), dtype=np.float32))
+    release.set()
+    session.close()
+
+    stats = session.stats()
+    assert stats["overruns"] > 0
+    assert stats["frames"] + stats["dropped_frames"] == rate * 2
+    assert sum(len(block) for block in written) == stats["frames"]
+
+
+def test_stream_resampler_matches_whole_signal():
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(48000).astype(np.float32)
+
+    resampler = _StreamResampler(48000, 16000)
+    pieces = [resampler(audio[i:i + 1000]) for i in range(0, len(audio), 1000)]
+
+    np.testing.assert_allclose(np.concatenate(pieces), resample(audio, 48000)[:16000], atol=1e-5)
+
+
+def test_file_replay_is_paced_and_deterministic(tmp_path):
+    from src.audio.audio_sources import FileReplaySource
+    from tests.pipeline_benchmark import synthetic_meeting_wav
+
+    path = tmp_path / "meeting.wav"
+    synthetic_meeting_wav(path, 2)
+
+    runs = []
+    for _ in range(2):
+        source = FileReplaySource(path, speed=10)
+        rate = source.prepare()
+        written = []
+        session = CaptureSession(rate, lambda block: written.append(block.copy()), duration=5)
+
+        started = time.monotonic()
+        with source.stream(session.callback, 1024, on_end=session.finished.set):
+            assert session.wait(timeout=5)
+        elapsed = time.monotonic() - started
+        session.close()
+
+        # 2 s of audio at 10x: the last block is not due before 0.2 s.
+        # No upper bound, a loaded CI host may be arbitrarily slow
+        assert elapsed >= 0.19
+        runs.append(np.concatenate(written))
+
+    assert len(runs[0]) == 2 * rate
+    np.testing.assert_array_equal(runs[0], runs[1])
@@ -0,0 +1,79 @@
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from services import upload_sessions
+from services.upload_sessions import UploadSessionError
+from tests.stream_decoder_test import _fake_ffmpeg
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake ffmpeg is a shell script")
+
+
+@pytest.fixture(autouse=True)
+def _sessions(monkeypatch, tmp_path):
+    _fake_ffmpeg(monkeypatch, tmp_path, "exec cat")
+    monkeypatch.setattr(upload_sessions, "_SESSIONS", {})
+    yield
+    for upload in upload_sessions._SESSIONS.values():
+        upload["decoder"].abort()
+
+
+def _start(tmp_path, name="job"):
+    job_dir = tmp_path / name
+    job_dir.mkdir()
+    return upload_sessions.start_session("a@example.com", job_dir), job_dir
+
+
+def _make_idle(upload_id):
+    upload_sessions._SESSIONS[upload_id]["last_seen"] -= upload_sessions.SESSION_IDLE_SECONDS + 1
+
+
+def test_chunks_in_order_then_finish(tmp_path):
+    upload_id, job_dir = _start(tmp_path)
+
+    upload_sessions.append_chunk(upload_id, "a@example.com", 0, b"\x01\x00" * 1600)
+    with pytest.raises(UploadSessionError):
+        upload_sessions.append_chunk(upload_id, "a@example.com", 2, b"\x01\x00")
+    with pytest.raises(KeyError):
+        upload_sessions.append_chunk(upload_id, "b@example.com", 1, b"\x01\x00")
+
+    wav_path, finished_dir = upload_sessions.finish_session(upload_id, "a@example.com")
+    assert finished_dir == job_dir and wav_path.exists()
+    with pytest.raises(KeyError):
+        upload_sessions.finish_session(upload_id, "a@example.com")
+
+
+def test_idle_session_expires_and_late_calls_fail(monkeypatch, tmp_path):
+    upload_id, job_dir = _start(tmp_path, "idle")
+    upload = upload_sessions._get_session(upload_id, "a@example.com")
+    _make_idle(upload_id)
+
+    _start(tmp_path, "next")    # starting a session expires idle ones
+
+    assert upload_id not in upload_sessions._SESSIONS
+    assert not job_dir.exists()
+    # a request that looked the session up before it expired
+    monkeypatch.setattr(upload_sessions, "_get_session", lambda *args: upload)
+    with pytest.raises(UploadSessionError):
+        upload_sessions.append_chunk(upload_id, "a@example.com", 0, b"\x01\x00")
+    with pytest.raises(UploadSessionError):
+        upload_sessions.finish_session(upload_id, "a@example.com")
+
+
+def test_busy_session_is_not_expired(tmp_path):
+    upload_id, job_dir = _start(tmp_path, "busy")
+    upload_sessions.append_chunk(upload_id, "a@example.com", 0, b"\x01\x00" * 1600)
+    _make_idle(upload_id)
+    upload = upload_sessions._SESSIONS[upload_id]
+
+    # a feed / finish in progress holds the session lock
+    with upload["lock"]:
+        done = threading.Event()
+        threading.Thread(target=lambda: (_start(tmp_path, "next"), done.set())).start()
+        assert done.wait(5)
+
+    assert upload_id in upload_sessions._SESSIONS and job_dir.exists()
+    upload_sessions.finish_session(upload_id, "a@example.com")
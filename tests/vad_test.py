@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.audio.vad import remap_segments, remap_turns
+
+# kept speech: 2-5 s, 10-12 s, 20-30 s -> compacted 0-3, 3-5, 5-15
+REGIONS = [(2.0, 5.0), (10.0, 12.0), (20.0, 30.0)]
+
+
+def test_segment_spanning_a_removed_gap():
+    [seg] = remap_segments([{
+        "start": 1.0, "end": 4.0, "text": "across",
+        "words": [
+            {"word": "a", "start": 1.0, "end": 2.5},
+            {"word": "b", "start": 3.5, "end": 4.0},
+        ],
+    }], REGIONS)
+
+    assert (seg["start"], seg["end"]) == (3.0, 11.0)
+    assert [(w["start"], w["end"]) for w in seg["words"]] == [(3.0, 4.5), (10.5, 11.0)]
+    assert seg["text"] == "across"
+
+
+def test_turn_spanning_a_removed_gap_is_split():
+    turns = remap_turns([{"start": 1.0, "end": 4.0, "speaker": "A"}], REGIONS)
+    assert [(t["start"], t["end"], t["speaker"]) for t in turns] == [
+        (3.0, 5.0, "A"), (10.0, 11.0, "A")
+    ]
+
+
+def test_boundaries_exactly_at_region_edges():
+    # a start on a junction opens the next region, an end closes the previous
+    [before, after, last] = remap_segments([
+        {"start": 0.0, "end": 3.0, "text": "first"},
+        {"start": 3.0, "end": 5.0, "text": "second"},
+        {"start": 5.0, "end": 15.0, "text": "third"},
+    ], REGIONS)
+
+    assert (before["start"], before["end"]) == (2.0, 5.0)
+    assert (after["start"], after["end"]) == (10.0, 12.0)
+    assert (last["start"], last["end"]) == (20.0, 30.0)
+
+    turns = remap_turns([{"start": 3.0, "end": 5.0, "speaker": "B"}], REGIONS)
+    assert [(t["start"], t["end"]) for t in turns] == [(10.0, 12.0)]
+
+
+def test_empty_region_list_keeps_timestamps():
+    segments = [{"start": 1.0, "end": 2.0, "text": "x"}]
+    turns = [{"start": 1.0, "end": 2.0, "speaker": "A"}]
+
+    assert remap_segments(segments, []) == segments
+    assert remap_turns(turns, []) == turns
+    assert remap_segments([], REGIONS) == [] and remap_turns([], REGIONS) == []
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+from src.stt import whisper_engine
+from src.stt.merger import merge_transcript_and_speakers
+
+
+class FakeFasterModel:
+    """
+    faster-whisper's transcribe(): lazy Segment objects with .words.
+    """
+
+    def __init__(self):
+        self.options = None
+
+    def transcribe(self, audio, **options):
+        self.options = options
+        words = []
+        if options.get("word_timestamps"):
+            words = [
+                SimpleNamespace(word=" hi", start=0.0, end=0.8, probability=0.9),
+                SimpleNamespace(word=" there", start=0.9, end=1.8, probability=0.9),
+                SimpleNamespace(word=" yes", start=2.5, end=3.5, probability=0.9),
+            ]
+        segments = iter([SimpleNamespace(start=0.0, end=4.0, text=" hi there yes", words=words or None)])
+        return segments, SimpleNamespace(language="en")
+
+
+class FakeOpenaiModel:
+    device = SimpleNamespace(type="cpu")
+
+    def __init__(self):
+        self.options = None
+
+    def transcribe(self, audio, **options):
+        self.options = options
+        return {"text": "", "segments": [], "language": "en"}
+
+
+TURNS = [
+    {"start": 0.0, "end": 2.0, "speaker": "A"},
+    {"start": 2.2, "end": 4.0, "speaker": "B"},
+]
+
+
+def test_word_timestamps_reach_the_merger(monkeypatch):
+    monkeypatch.setattr(whisper_engine, "BATCH_SIZE", 1)
+    model = FakeFasterModel()
+
+    result = whisper_engine._transcribe_with(model, "faster", [0.0])
+    assert model.options["word_timestamps"] is True
+
+    text = merge_transcript_and_speakers(result["segments"], TURNS)
+    assert text.splitlines() == ["[00:00–00:01] A: hi there", "[00:02–00:03] B: yes"]
+
+
+def test_openai_backend_requests_word_timestamps():
+    model = FakeOpenaiModel()
+    whisper_engine._transcribe_with(model, "openai", [0.0])
+    assert model.options["word_timestamps"] is True
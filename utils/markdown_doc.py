@@ -0,0 +1,183 @@
+"""
+Parser for the markdown subset the summarizer LLM writes.
+
+The summary is parsed once into a small document
+
+    {"blocks": [
+        {"type": "heading", "level": 2, "section": "action_items", "spans": [...]},
+        {"type": "bullet" | "action_item", "level": 0, "spans": [...]},
+        {"type": "paragraph", "spans": [...]}
+    ]}
+
+with spans = [{"text": str, "bold": True?, "italic": True?}], and every
+output format (email text, PDF flowables, API JSON) is rendered from it.
+"""
+
+import re
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+
+# One pass per line, first match wins
+_LINE = re.compile(
+    r"\s*(?P<heading>\#{1,6})\s+(?P<heading_text>.*)"
+    r"|\s*(?P<bold_line>\*\*[^*]+\*\*):?$"
+    r"|(?P<indent>\s*)(?:(?P<bullet>[-*+•])|(?P<number>\d+)[.)])\s+(?P<item_text>.*)"
+)
+
+_INLINE = re.compile(r"\*\*(?P<bold>.+?)\*\*|__(?P<bold_alt>.+?)__|\*(?P<italic>[^*\s][^*]*?)\*")
+
+# normalized heading text -> section key
+_SECTIONS = {
+    "meeting summary": "title",
+    "meeting overview": "overview",
+    "overview": "overview",
+    "key discussion points": "discussion",
+    "discussion points": "discussion",
+    "decisions or instructions": "decisions",
+    "decisions": "decisions",
+    "instructions": "decisions",
+    "action items": "action_items",
+}
+
+_NON_WORD = re.compile(r"[^a-z ]+")
+
+DEFAULT_TITLE = "Meeting Summary"
+
+
+def _spans(text: str) -> list[dict]:
+    spans = []
+    pos = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > pos:
+            spans.append({"text": text[pos:match.start()]})
+        if match.group("italic") is not None:
+            spans.append({"text": match.group("italic"), "italic": True})
+        else:
+            spans.append({"text": match.group("bold") or match.group("bold_alt"), "bold": True})
+        pos = match.end()
+    if pos < len(text):
+        spans.append({"text": text[pos:]})
+    return spans
+
+
+def _section(text: str) -> str | None:
+    key = _NON_WORD.sub("", text.lower()).strip()
+    return _SECTIONS.get(key)
+
+
+def plain_text(spans: list[dict]) -> str:
+    return "".join(span["text"] for span in spans)
+
+
+def parse_markdown(text: str) -> dict:
+    blocks = []
+    section = None
+    paragraph = None
+
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line.strip():
+            paragraph = None
+            continue
+
+        match = _LINE.match(line)
+
+        if match and (match.group("heading") or match.group("bold_line")):
+            if match.group("heading"):
+                heading, level = match.group("heading_text"), len(match.group("heading"))
+            else:
+                heading, level = match.group("bold_line")[2:-2], 3
+            spans = _spans(heading.strip().rstrip(":"))
+            section = _section(plain_text(spans))
+            blocks.append({"type": "heading", "level": level, "section": section, "spans": spans})
+            paragraph = None
+            continue
+
+        if match:
+            item = match.group("item_text")
+            # "1. Action items:" style headings
+            if match.group("number") and _section(plain_text(_spans(item))):
+                spans = _spans(item.rstrip(":"))
+                section = _section(plain_text(spans))
+                blocks.append({"type": "heading", "level": 3, "section": section, "spans": spans})
+                paragraph = None
+                continue
+
+            blocks.append({
+                "type": "action_item" if section == "action_items" else "bullet",
+                "level": len(match.group("indent").expandtabs(4)) // 2,
+                "spans": _spans(item)
+            })
+            paragraph = None
+            continue
+
+        if paragraph is None:
+            paragraph = {"type": "paragraph", "spans": []}
+            blocks.append(paragraph)
+        else:
+            paragraph["spans"].append({"text": " "})
+        paragraph["spans"].extend(_spans(line.strip()))
+
+    return {"blocks": blocks}
+
+
+# Same summary is rendered for the page, the PDF and the email
+parse_summary = lru_cache(maxsize=256)(parse_markdown)
+
+
+def has_title(doc: dict) -> bool:
+    return bool(doc["blocks"]) and doc["blocks"][0]["type"] == "heading"
+
+
+def ensure_title(summary: str, title: str = DEFAULT_TITLE) -> str:
+    """
+    Prefixes a title heading unless the summary already opens with one.
+    """
+    if has_title(parse_summary(summary)):
+        return summary
+    return f"## **{title}**\n\n{summary}"
+
+
+# =========================
+# RENDERERS
+# =========================
+
+def to_email_text(doc: dict) -> str:
+    lines = []
+    for block in doc["blocks"]:
+        text = plain_text(block["spans"]).strip()
+        if block["type"] == "heading":
+            if lines:
+                lines.append("")
+            lines.append(text)
+        elif block["type"] in ("bullet", "action_item"):
+            lines.append("  " * block["level"] + "- " + text)
+        else:
+            lines.append(text)
+    return "\n".join(lines).strip()
+
+
+def to_markup(spans: list[dict]) -> str:
+    """
+    reportlab Paragraph markup.
+    """
+    parts = []
+    for span in spans:
+        text = escape(span["text"])
+        if span.get("bold"):
+            text = f"<b>{text}</b>"
+        if span.get("italic"):
+            text = f"<i>{text}</i>"
+        parts.append(text)
+    return "".join(parts)
+
+
+def to_json(doc: dict) -> dict:
+    return {
+        "blocks": doc["blocks"],
+        "action_items": [
+            plain_text(block["spans"]).strip()
+            for block in doc["blocks"] if block["type"] == "action_item"
+        ]
+    }
@@ -1,100 +1,258 @@
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer
+    SimpleDocTemplate, Paragraph, Spacer, Frame
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from xml.sax.saxutils import escape
+from collections import OrderedDict
+from itertools import chain, islice
 from io import BytesIO
-from datetime import datetime
-import re
+import hashlib
+import os
+import threading
 
-def clean_markdown(text: str) -> list[str]:
-    """
-    Converts markdown summary into clean paragraph blocks.
-    """
-    lines = text.split("\n")
-    cleaned = []
+from utils.markdown_doc import parse_summary, to_markup
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            cleaned.append("")
-            continue
+# =========================
+# STYLES (built once)
+# =========================
 
-        # Remove markdown bold/headers
-        line = re.sub(r"\*\*(.*?)\*\*", r"\1", line)
-        line = re.sub(r"^#+\s*", "", line)
+_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    "Title",
+    parent=_STYLES["Heading1"],
+    fontSize=18,
+    spaceAfter=14
+)
 
-        cleaned.append(line)
+HEADER_STYLE = ParagraphStyle(
+    "Header",
+    parent=_STYLES["Heading2"],
+    fontSize=14,
+    spaceBefore=12,
+    spaceAfter=6
+)
 
-    return cleaned
+BODY_STYLE = ParagraphStyle(
+    "Body",
+    parent=_STYLES["Normal"],
+    fontSize=11,
+    leading=15,
+    spaceAfter=6
+)
 
+SEGMENT_STYLE = ParagraphStyle(
+    "Segment",
+    parent=_STYLES["Normal"],
+    fontSize=10,
+    leading=13,
+    spaceAfter=4
+)
 
-def generate_summary_pdf(summary_text: str):
-    buffer = BytesIO()
-
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=40,
-        leftMargin=40,
-        topMargin=40,
-        bottomMargin=40
+# one per nesting level
+BULLET_STYLES = [
+    ParagraphStyle(
+        f"Bullet{level}",
+        parent=BODY_STYLE,
+        leftIndent=14 + 14 * level,
+        bulletIndent=4 + 14 * level
     )
+    for level in range(4)
+]
+
+_MARGIN = 40
+
+# Flowables pulled from the transcript per refill in full-report mode
+_PAGE_BATCH = 64
+
+# =========================
+# RENDER CACHE
+# =========================
+
+# Rendered PDFs by content hash, least recently used evicted first
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 ** 2)))
+
+_PDF_CACHE = OrderedDict()
+_PDF_CACHE_BYTES = 0
+_PDF_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: str) -> bytes | None:
+    with _PDF_CACHE_LOCK:
+        pdf = _PDF_CACHE.get(key)
+        if pdf is not None:
+            _PDF_CACHE.move_to_end(key)
+        return pdf
 
-    styles = getSampleStyleSheet()
+
+def _cache_put(key: str, pdf: bytes):
+    global _PDF_CACHE_BYTES
+    if len(pdf) > PDF_CACHE_MAX_BYTES:
+        return
+
+    with _PDF_CACHE_LOCK:
+        if key in _PDF_CACHE:
+            return
+        _PDF_CACHE[key] = pdf
+        _PDF_CACHE_BYTES += len(pdf)
+        while _PDF_CACHE_BYTES > PDF_CACHE_MAX_BYTES:
+            _, evicted = _PDF_CACHE.popitem(last=False)
+            _PDF_CACHE_BYTES -= len(evicted)
+
+
+def _cache_key(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _title_flowables(title: str) -> list:
+    # No render timestamp: cached bytes are served again on later downloads
+    return [
+        Paragraph(title, TITLE_STYLE),
+        Spacer(1, 0.3 * inch)
+    ]
+
+
+def _summary_flowables(summary_text: str) -> list:
     story = []
+    for block in parse_summary(summary_text)["blocks"]:
+        markup = to_markup(block["spans"])
+        if block["type"] == "heading":
+            # the PDF has its own title
+            if block["section"] != "title":
+                story.append(Spacer(1, 0.15 * inch))
+                story.append(Paragraph(markup, HEADER_STYLE))
+        elif block["type"] in ("bullet", "action_item"):
+            style = BULLET_STYLES[min(block["level"], len(BULLET_STYLES) - 1)]
+            story.append(Paragraph(markup, style, bulletText="•"))
+        else:
+            story.append(Paragraph(markup, BODY_STYLE))
+    return story
 
-    title_style = ParagraphStyle(
-        "Title",
-        parent=styles["Heading1"],
-        fontSize=18,
-        spaceAfter=14
-    )
 
-    header_style = ParagraphStyle(
-        "Header",
-        parent=styles["Heading2"],
-        fontSize=14,
-        spaceBefore=12,
-        spaceAfter=6
-    )
+def generate_summary_pdf(summary_text: str):
+    key = _cache_key("summary", summary_text)
+    pdf = _cache_get(key)
 
-    body_style = ParagraphStyle(
-        "Body",
-        parent=styles["Normal"],
-        fontSize=11,
-        leading=15,
-        spaceAfter=6
-    )
+    if pdf is None:
+        buffer = BytesIO()
 
-    # ---- Title ----
-    story.append(Paragraph("Meeting Summary", title_style))
-    story.append(
-        Paragraph(
-            f"Generated on: {datetime.now().strftime('%d %b %Y %H:%M')}",
-            styles["Italic"]
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=_MARGIN,
+            leftMargin=_MARGIN,
+            topMargin=_MARGIN,
+            bottomMargin=_MARGIN
         )
-    )
-    story.append(Spacer(1, 0.3 * inch))
-
-    # ---- Content ----
-    blocks = clean_markdown(summary_text)
-
-    for line in blocks:
-        if line.lower() in [
-            "meeting overview",
-            "key discussion points",
-            "decisions or instructions",
-            "action items"
-        ]:
-            story.append(Spacer(1, 0.15 * inch))
-            story.append(Paragraph(line, header_style))
-        elif line:
-            story.append(Paragraph(line, body_style))
-        else:
-            story.append(Spacer(1, 0.1 * inch))
 
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
+        doc.build(_title_flowables("Meeting Summary") + _summary_flowables(summary_text))
+        pdf = buffer.getvalue()
+        _cache_put(key, pdf)
+
+    return BytesIO(pdf)
+
+
+# =========================
+# FULL REPORT
+# =========================
+
+def _format_time(seconds: float) -> str:
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+def _segment_flowables(segments):
+    for seg in segments:
+        yield Paragraph(
+            f"<b>[{_format_time(seg['start'])}] {escape(seg['speaker'])}:</b> "
+            f"{escape(seg['text'])}",
+            SEGMENT_STYLE
+        )
+
+
+def _draw_pages(pdf: canvas.Canvas, flowables):
+    """
+    Lays flowables out one page at a time: only the flowables waiting for
+    the current page are held in memory, never the whole story.
+    """
+    width, height = A4
+    frame_width, frame_height = width - 2 * _MARGIN, height - 2 * _MARGIN
+    flowables = iter(flowables)
+    pending = []
+    exhausted = False
+    page = 0
+
+    while pending or not exhausted:
+        page += 1
+        frame = Frame(
+            _MARGIN, _MARGIN, frame_width, frame_height,
+            leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0
+        )
+        drawn = 0
+
+        while True:
+            if not pending and not exhausted:
+                pending.extend(islice(flowables, _PAGE_BATCH))
+                exhausted = not pending
+            if not pending:
+                break
+
+            before = len(pending)
+            frame.addFromList(pending, pdf)
+            drawn += before - len(pending)
+            if not pending:
+                continue
+
+            if drawn:
+                break       # page full
+
+            # taller than a whole page: split it and retry on this page
+            parts = pending[0].split(frame_width, frame_height)
+            if len(parts) > 1:
+                pending[0:1] = parts
+            else:
+                print("PDF: dropping a block that does not fit on a page")
+                pending.pop(0)
+
+        if drawn:
+            pdf.setFont("Helvetica", 8)
+            pdf.drawRightString(width - _MARGIN, _MARGIN / 2, f"Page {page}")
+            pdf.showPage()
+
+
+def generate_report_pdf(summary_text: str, segments, report_id: str | None = None):
+    """
+    Summary followed by the full speaker transcript.
+
+    segments:  iterable of {"start", "speaker", "text"}; may be a lazy
+               iterator (e.g. rows streamed from the meeting store)
+    report_id: identifies the transcript for the render cache
+               (e.g. the meeting id); None skips the cache
+    """
+    key = _cache_key("report", report_id, summary_text) if report_id else None
+    pdf_bytes = _cache_get(key) if key else None
+
+    if pdf_bytes is None:
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+        pdf.setTitle("Meeting Report")
+
+        _draw_pages(pdf, chain(
+            _title_flowables("Meeting Report"),
+            _summary_flowables(summary_text),
+            [Spacer(1, 0.2 * inch), Paragraph("Transcript", HEADER_STYLE)],
+            _segment_flowables(segments)
+        ))
+        pdf.save()
+
+        pdf_bytes = buffer.getvalue()
+        if key:
+            _cache_put(key, pdf_bytes)
+
+    return BytesIO(pdf_bytes)